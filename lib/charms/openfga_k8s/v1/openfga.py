@@ -35,6 +35,8 @@ class SomeCharm(CharmBase):
   def __init__(self, *args):
     # ...
     self.openfga = OpenFGARequires(self, "test-openfga-store")
+    # Or, to request several stores (e.g. one per tenant) over a single relation:
+    # self.openfga = OpenFGARequires(self, store_names=["tenant-a", "tenant-b"])
     self.framework.observe(
         self.openfga.on.openfga_store_created,
         self._on_openfga_store_created,
@@ -49,6 +51,7 @@ class SomeCharm(CharmBase):
             return
 
         logger.info("store id {}".format(info.store_id))
+        logger.info("store ids by name {}".format(info.store_ids))
         logger.info("token {}".format(info.token))
         logger.info("grpc_api_url {}".format(info.grpc_api_url))
         logger.info("http_api_url {}".format(info.http_api_url))
@@ -56,8 +59,9 @@ class SomeCharm(CharmBase):
 ```
 """
 
+import json
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 import pydantic
 from ops import (
@@ -72,7 +76,7 @@ from ops import (
 )
 from ops.charm import CharmEvents, RelationChangedEvent, RelationEvent
 from ops.framework import EventSource, Object
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 # The unique Charmhub library identifier, never change it
 LIBID = "216f28cfeea4447b8a576f01bfbecdf5"
@@ -82,7 +86,7 @@ LIBAPI = 1
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 5
+LIBPATCH = 6
 
 PYDEPS = ["pydantic ~= 2.0"]
 
@@ -95,14 +99,54 @@ def _update_relation_app_databag(app: Application, relation: Relation, data: dic
     if relation is None:
         return
 
-    data = {k: str(v) if v else "" for k, v in data.items()}
+    data = {k: _serialize_databag_value(v) for k, v in data.items()}
     relation.data[app].update(data)
 
 
+def _serialize_databag_value(value: Any) -> str:
+    if not value:
+        return ""
+
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+
+    return str(value)
+
+
+def _deserialize_databag_value(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+
+    return json.loads(value) if value else None
+
+
 class OpenfgaRequirerAppData(BaseModel):
     """Openfga requirer application databag model."""
 
-    store_name: str = Field(description="The store name the application requires")
+    store_name: Optional[str] = Field(
+        description="The store name the application requires", default=None
+    )
+    store_names: list[str] = Field(
+        description="The store names the application requires, one store per name",
+        default_factory=list,
+    )
+
+    @field_validator("store_names", mode="before")
+    @classmethod
+    def _load_store_names(cls, value: Any) -> Any:
+        return _deserialize_databag_value(value) or []
+
+    @model_validator(mode="after")
+    def _check_store_requested(self) -> "OpenfgaRequirerAppData":
+        if not self.store_name and not self.store_names:
+            raise ValueError("At least one of store_name or store_names is required")
+        return self
+
+    @property
+    def requested_store_names(self) -> list[str]:
+        """All the requested store names, without duplicates."""
+        names = [self.store_name] if self.store_name else []
+        return list(dict.fromkeys(names + self.store_names))
 
 
 class OpenfgaProviderBaseData(BaseModel):
@@ -121,24 +165,36 @@ class OpenfgaProviderAppData(OpenfgaProviderBaseData):
         description="The juju secret_id which can be used to retrieve the API token",
         default=None,
     )
+    store_ids: dict[str, str] = Field(
+        description="The store ids, keyed by the requested store names",
+        default_factory=dict,
+    )
+
+    @field_validator("store_ids", mode="before")
+    @classmethod
+    def _load_store_ids(cls, value: Any) -> Any:
+        return _deserialize_databag_value(value) or {}
 
 
 class OpenFGAStoreCreateEvent(HookEvent):
     """Event emitted when a new OpenFGA store is created."""
 
-    def __init__(self, handle: Handle, store_id: str):
+    def __init__(self, handle: Handle, store_id: str, store_ids: Optional[dict[str, str]] = None):
         super().__init__(handle)
         self.store_id = store_id
+        self.store_ids = store_ids or {}
 
     def snapshot(self) -> dict:
         """Save event."""
         return {
             "store_id": self.store_id,
+            "store_ids": self.store_ids,
         }
 
     def restore(self, snapshot: dict) -> None:
         """Restore event."""
         self.store_id = snapshot["store_id"]
+        self.store_ids = snapshot.get("store_ids", {})
 
 
 class OpenFGAStoreRemovedEvent(HookEvent):
@@ -166,14 +222,20 @@ class OpenFGARequires(Object):
     def __init__(
         self,
         charm: CharmBase,
-        store_name: str,
+        store_name: Optional[str] = None,
         relation_name: str = DEFAULT_INTEGRATION_NAME,
+        store_names: Optional[list[str]] = None,
     ) -> None:
         super().__init__(charm, relation_name)
         self.charm = charm
         self.app = charm.app
         self.relation_name = relation_name
-        self.store_name = store_name
+        self.store_names = store_names or []
+        # Keep `store_name` populated so that providers unaware of `store_names`
+        # still create the first store
+        self.store_name = store_name or next(iter(self.store_names), None)
+        if not self.store_name:
+            raise ValueError("At least one of store_name or store_names is required")
 
         self.framework.observe(charm.on[relation_name].relation_created, self._on_relation_created)
         self.framework.observe(
@@ -190,7 +252,10 @@ class OpenFGARequires(Object):
         if not self.model.unit.is_leader():
             return
 
-        requirer_data = OpenfgaRequirerAppData(store_name=self.store_name)
+        requirer_data = OpenfgaRequirerAppData(
+            store_name=self.store_name,
+            store_names=self.store_names,
+        )
         _update_relation_app_databag(self.app, event.relation, requirer_data.model_dump())
 
     def _on_relation_changed(self, event: RelationChangedEvent) -> None:
@@ -204,7 +269,7 @@ class OpenFGARequires(Object):
         except pydantic.ValidationError:
             return
 
-        self.on.openfga_store_created.emit(store_id=data.store_id)
+        self.on.openfga_store_created.emit(store_id=data.store_id, store_ids=data.store_ids)
 
     def _on_relation_departed(self, event: RelationDepartedEvent) -> None:
         """Handle the relation-departed event."""
@@ -242,22 +307,36 @@ class OpenFGARequires(Object):
 
 
 class OpenFGAStoreRequestEvent(RelationEvent):
-    """Event emitted when a new OpenFGA store is requested."""
+    """Event emitted when new OpenFGA stores are requested.
+
+    `store_names` holds every store requested over the relation, including `store_name`.
+    """
 
-    def __init__(self, handle: Handle, relation: Relation, store_name: str) -> None:
+    def __init__(
+        self,
+        handle: Handle,
+        relation: Relation,
+        store_name: Optional[str],
+        store_names: Optional[list[str]] = None,
+    ) -> None:
         super().__init__(handle, relation)
         self.store_name = store_name
+        self.store_names = store_names or ([store_name] if store_name else [])
 
     def snapshot(self) -> dict:
         """Save event."""
         dct = super().snapshot()
         dct["store_name"] = self.store_name
+        dct["store_names"] = self.store_names
         return dct
 
     def restore(self, snapshot: dict) -> None:
         """Restore event."""
         super().restore(snapshot)
         self.store_name = snapshot["store_name"]
+        self.store_names = snapshot.get("store_names") or (
+            [self.store_name] if self.store_name else []
+        )
 
 
 class OpenFGAProviderEvents(CharmEvents):
@@ -304,7 +383,11 @@ class OpenFGAProvider(Object):
         except pydantic.ValidationError:
             return
 
-        self.on.openfga_store_requested.emit(event.relation, store_name=data.store_name)
+        self.on.openfga_store_requested.emit(
+            event.relation,
+            store_name=data.store_name,
+            store_names=data.requested_store_names,
+        )
 
     def update_relation_app_data(self, data: OpenfgaProviderAppData, relation_id: int) -> None:
         if not self.model.unit.is_leader():
@@ -340,6 +423,7 @@ class OpenFGAProvider(Object):
             relation_data = relation.data[self.app]
             provider_data = OpenfgaProviderAppData(
                 store_id=relation_data.get("store_id"),
+                store_ids=_deserialize_databag_value(relation_data.get("store_ids")) or {},
                 token_secret_id=relation_data.get("token_secret_id"),
                 grpc_api_url=data.grpc_api_url,
                 http_api_url=data.http_api_url,
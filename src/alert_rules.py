@@ -0,0 +1,175 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from pathlib import Path
+from typing import Any, Iterable
+
+import yaml
+
+from configs import SLOConfig
+
+ALERT_RULES_DIR = Path(__file__).parent / "prometheus_alert_rules"
+RENDERED_ALERT_RULES_DIR = "rendered_alert_rules"
+SLO_ALERT_RULES_FILE = "openfga_slo.rule"
+
+GRPC_SERVICE = "openfga.v1.OpenFGAService"
+# The buckets of the gRPC server handling time histograms, in seconds
+RPC_HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# The long and short windows, burn rates and severities of the multi-window, multi-burn-rate
+# alerts, paging on fast consumption of the error budget and ticketing on slow consumption
+BURN_RATE_WINDOWS = (
+    ("1h", "5m", 14.4, "error"),
+    ("6h", "30m", 6.0, "error"),
+    ("1d", "2h", 3.0, "warning"),
+    ("3d", "6h", 1.0, "warning"),
+)
+
+# The recording rules of `prometheus_alert_rules/openfga_recording.rule`
+HANDLING_SECONDS_BUCKET_RATE = "unit_method_code_le:grpc_server_handling_seconds_bucket:rate5m"
+HANDLING_SECONDS_COUNT_RATE = "unit_method:grpc_server_handling_seconds_count:rate5m"
+DATASTORE_QUERY_DURATION_BUCKET_RATE = (
+    "unit_operation_le:openfga_datastore_query_duration_ms_bucket:rate5m"
+)
+CHECK_CACHE_HIT_RATIO = "app:openfga_check_cache_hits:ratio_rate5m"
+SLOW_REQUESTS_RATIO = "app_method:grpc_server_slow_requests:ratio"
+
+_APPLICATION = "{{ $labels.juju_application }} in model {{ $labels.juju_model }}"
+
+Rule = dict[str, Any]
+
+
+def le_matcher(latency: int, buckets: Iterable[float] = RPC_HISTOGRAM_BUCKETS) -> str:
+    """Match the `le` label of the smallest bucket covering a latency in milliseconds.
+
+    Prometheus 3 normalizes the `le` label of classic histograms to floats, e.g. `1.0` for `1`,
+    so both spellings are matched.
+    """
+    buckets = sorted(buckets)
+    bound = next((bound for bound in buckets if bound * 1000 >= latency), buckets[-1])
+    return "|".join(dict.fromkeys([f"{bound:g}", repr(float(bound))]))
+
+
+def slo_recording_rules(slo: SLOConfig) -> list[Rule]:
+    """Record the ratio of the requests slower than their latency threshold, per method.
+
+    The ratios over the long windows are averaged from the 5m ratio, rather than computed from
+    the raw histograms over days.
+    """
+    by = "juju_model, juju_model_uuid, juju_application, juju_charm, grpc_service, grpc_method"
+    rules = []
+    for method, latency in slo.rpc_latencies.items():
+        selector = f'grpc_service="{GRPC_SERVICE}", grpc_method="{method}"'
+        rules.append({
+            "record": f"{SLOW_REQUESTS_RATIO}_rate5m",
+            "expr": (
+                f"1 - sum by({by}) ({HANDLING_SECONDS_BUCKET_RATE}"
+                f'{{{selector}, le=~"{le_matcher(latency)}"}})'
+                f" / sum by({by}) ({HANDLING_SECONDS_COUNT_RATE}{{{selector}}})"
+            ),
+        })
+
+    windows = dict.fromkeys(window for windows in BURN_RATE_WINDOWS for window in windows[:2])
+    rules += [
+        {
+            "record": f"{SLOW_REQUESTS_RATIO}_rate{window}",
+            "expr": f"avg_over_time({SLOW_REQUESTS_RATIO}_rate5m[{window}])",
+        }
+        for window in windows
+        if window != "5m"
+    ]
+    return rules
+
+
+def latency_burn_rate_rules(slo: SLOConfig) -> list[Rule]:
+    rules = []
+    for method, latency in slo.rpc_latencies.items():
+        for long_window, short_window, burn_rate, severity in BURN_RATE_WINDOWS:
+            threshold = f"{burn_rate * slo.error_budget:g}"
+            selector = f'{{grpc_method="{method}"}}'
+            rules.append({
+                "alert": f"OpenFGA{method}LatencyBudgetBurn",
+                "expr": (
+                    f"{SLOW_REQUESTS_RATIO}_rate{long_window}{selector} > {threshold}"
+                    f" and {SLOW_REQUESTS_RATIO}_rate{short_window}{selector} > {threshold}"
+                ),
+                "labels": {"severity": severity, "window": long_window},
+                "annotations": {
+                    "summary": (
+                        f"{method} requests of {_APPLICATION} burn their latency error budget "
+                        f"{burn_rate:g} times too fast"
+                    ),
+                    "description": (
+                        f"More than {threshold} of the {method} requests over the last "
+                        f"{long_window} and {short_window} took longer than {latency}ms, "
+                        f"against an objective of {slo.objective:g}."
+                    ),
+                },
+            })
+
+    return rules
+
+
+def datastore_rules(slo: SLOConfig) -> list[Rule]:
+    return [
+        {
+            "alert": "OpenFGADatastoreQueryLatencyHigh",
+            "expr": (
+                f"histogram_quantile({slo.objective:g}, sum by(le, operation) "
+                f"({DATASTORE_QUERY_DURATION_BUCKET_RATE})) "
+                f"> {slo.datastore_query_latency}"
+            ),
+            "for": "10m",
+            "labels": {"severity": "warning"},
+            "annotations": {
+                "summary": (
+                    f"{{{{ $labels.operation }}}} datastore queries of {_APPLICATION} are slower "
+                    f"than {slo.datastore_query_latency}ms"
+                ),
+            },
+        },
+        {
+            "alert": "OpenFGACheckCacheHitRatioCollapse",
+            "expr": (
+                f"avg_over_time({CHECK_CACHE_HIT_RATIO}[15m]) < {slo.check_cache_hit_ratio:g}"
+            ),
+            "for": "15m",
+            "labels": {"severity": "warning"},
+            "annotations": {
+                "summary": (
+                    f"The check cache hit ratio of {_APPLICATION} is below "
+                    f"{slo.check_cache_hit_ratio:g}"
+                ),
+            },
+        },
+    ]
+
+
+def slo_alert_rules(slo: SLOConfig, rpc_histograms: bool = True) -> dict[str, Any]:
+    groups = [{"name": "OpenFGADatastore", "rules": datastore_rules(slo)}]
+    if rpc_histograms:
+        groups[:0] = [
+            {"name": "OpenFGALatencySLORecording", "rules": slo_recording_rules(slo)},
+            {"name": "OpenFGALatencySLO", "rules": latency_burn_rate_rules(slo)},
+        ]
+
+    return {"groups": groups}
+
+
+def render_alert_rules(directory: Path, slo: SLOConfig, rpc_histograms: bool = True) -> Path:
+    """Render the static alert rules of the charm and its SLO alert rules into a directory.
+
+    The latency SLO rules are measured on the per-RPC histograms, and left out without them.
+    Files are only rewritten when their content changes.
+    """
+    files = {path.name: path.read_text() for path in ALERT_RULES_DIR.glob("*.rule")}
+    files[SLO_ALERT_RULES_FILE] = yaml.safe_dump(
+        slo_alert_rules(slo, rpc_histograms), sort_keys=False
+    )
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        path = directory / name
+        if not path.exists() or path.read_text() != content:
+            path.write_text(content)
+
+    return directory
@@ -0,0 +1,440 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+from exceptions import AuthorizationModelError
+
+Model = dict[str, Any]
+Userset = dict[str, Any]
+
+CONDITION_PARAM_TYPES = {
+    "any": "TYPE_NAME_ANY",
+    "bool": "TYPE_NAME_BOOL",
+    "double": "TYPE_NAME_DOUBLE",
+    "duration": "TYPE_NAME_DURATION",
+    "int": "TYPE_NAME_INT",
+    "ipaddress": "TYPE_NAME_IPADDRESS",
+    "list": "TYPE_NAME_LIST",
+    "map": "TYPE_NAME_MAP",
+    "string": "TYPE_NAME_STRING",
+    "timestamp": "TYPE_NAME_TIMESTAMP",
+    "uint": "TYPE_NAME_UINT",
+}
+
+# The DSL parser supports a subset of the DSL only, the other models are to be written as JSON
+_DSL_UNSUPPORTED_HINT = "transform the model to JSON with `fga model transform` first"
+
+# Recursive relations are resolved until the server resolution limit, weight them accordingly
+CYCLE_COST_FACTOR = 10
+
+_TOKEN_REGEX = re.compile(r"\s*(?:(?P<punct>[\[\](),])|(?P<word>[^\s\[\](),]+))")
+_COMMENT_REGEX = re.compile(r"(^|\s)#.*$")
+_CONDITION_REGEX = re.compile(
+    r"condition\s+(?P<name>\w+)\s*\((?P<params>[^)]*)\)\s*\{(?P<expression>.*?)\}\s*$",
+    re.DOTALL,
+)
+_PARAM_TYPE_REGEX = re.compile(r"(?P<type>\w+)(?:<(?P<generic>\w+)>)?")
+
+
+class _RelationParser:
+    """A recursive descent parser of a relation definition of the OpenFGA DSL."""
+
+    def __init__(self, definition: str) -> None:
+        self._tokens = [
+            match.group("punct") or match.group("word")
+            for match in _TOKEN_REGEX.finditer(definition)
+        ]
+        self._pos = 0
+        self.directly_related_user_types: list[dict[str, Any]] = []
+
+    def parse(self) -> Userset:
+        userset = self._expression()
+        if self._peek() is not None:
+            raise AuthorizationModelError(f"Unexpected token '{self._peek()}'")
+        return userset
+
+    def _peek(self) -> Optional[str]:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _next(self) -> str:
+        if (token := self._peek()) is None:
+            raise AuthorizationModelError("Unexpected end of relation definition")
+        self._pos += 1
+        return token
+
+    def _expect(self, expected: str) -> None:
+        if (token := self._next()) != expected:
+            raise AuthorizationModelError(f"Expected '{expected}' but got '{token}'")
+
+    def _expression(self) -> Userset:
+        children, operator = [self._term()], None
+        while (token := self._peek()) in ("or", "and"):
+            if operator and token != operator:
+                raise AuthorizationModelError("Mixed operators must be grouped in parentheses")
+            operator = self._next()
+            children.append(self._term())
+
+        base = {"union" if operator == "or" else "intersection": {"child": children}}
+        userset = base if operator else children[0]
+
+        if self._peek() == "but":
+            self._next()
+            self._expect("not")
+            userset = {"difference": {"base": userset, "subtract": self._term()}}
+
+        return userset
+
+    def _term(self) -> Userset:
+        token = self._next()
+        if token == "(":
+            userset = self._expression()
+            self._expect(")")
+            return userset
+
+        if token == "[":
+            self._direct_types()
+            return {"this": {}}
+
+        if self._peek() == "from":
+            self._next()
+            return {
+                "tupleToUserset": {
+                    "tupleset": {"object": "", "relation": self._next()},
+                    "computedUserset": {"object": "", "relation": token},
+                }
+            }
+
+        return {"computedUserset": {"object": "", "relation": token}}
+
+    def _direct_types(self) -> None:
+        while True:
+            reference: dict[str, Any] = {}
+            user_type = self._next()
+            if user_type.endswith(":*"):
+                reference.update(type=user_type[:-2], wildcard={})
+            elif "#" in user_type:
+                type_name, relation = user_type.split("#", 1)
+                reference.update(type=type_name, relation=relation)
+            else:
+                reference.update(type=user_type)
+
+            if self._peek() == "with":
+                self._next()
+                reference["condition"] = self._next()
+
+            self.directly_related_user_types.append(reference)
+            if self._next() == "]":
+                return
+
+
+def _parse_condition(block: str) -> dict[str, Any]:
+    if not (matched := _CONDITION_REGEX.match(block.strip())):
+        raise AuthorizationModelError(f"Invalid condition: {block.strip().splitlines()[0]}")
+
+    parameters: dict[str, dict[str, Any]] = {}
+    for param in filter(None, (p.strip() for p in matched.group("params").split(","))):
+        name, _, type_ref = (part.strip() for part in param.partition(":"))
+        if not (type_matched := _PARAM_TYPE_REGEX.fullmatch(type_ref)) or (
+            type_matched.group("type") not in CONDITION_PARAM_TYPES
+        ):
+            raise AuthorizationModelError(f"Invalid type '{type_ref}' of parameter '{name}'")
+
+        parameters[name] = {"type_name": CONDITION_PARAM_TYPES[type_matched.group("type")]}
+        if generic := type_matched.group("generic"):
+            parameters[name]["generic_types"] = [{"type_name": CONDITION_PARAM_TYPES[generic]}]
+
+    return {
+        "name": matched.group("name"),
+        "expression": matched.group("expression").strip(),
+        "parameters": parameters,
+    }
+
+
+def _blocks(dsl: str) -> Iterator[str]:
+    """Split the DSL into its top-level statements, each starting at an unindented line."""
+    block: list[str] = []
+    for line in dsl.splitlines():
+        line = _COMMENT_REGEX.sub("", line).rstrip()
+        if not line.strip():
+            continue
+
+        # The closing brace of a condition expression may be unindented
+        if not line[0].isspace() and not line.startswith("}") and block:
+            yield "\n".join(block)
+            block = []
+
+        block.append(line)
+
+    if block:
+        yield "\n".join(block)
+
+
+def _parse_type(block: str) -> dict[str, Any]:
+    header, *lines = block.splitlines()
+    type_definition: dict[str, Any] = {"type": header.split()[1], "relations": {}}
+    relations_metadata: dict[str, Any] = {}
+
+    for line in (line.strip() for line in lines):
+        if line == "relations":
+            continue
+
+        if not line.startswith("define "):
+            raise AuthorizationModelError(
+                f"Unexpected line in type {header}: {line}, {_DSL_UNSUPPORTED_HINT}"
+            )
+
+        name, _, definition = line.removeprefix("define ").partition(":")
+        parser = _RelationParser(definition)
+        try:
+            type_definition["relations"][name.strip()] = parser.parse()
+        except AuthorizationModelError as e:
+            raise AuthorizationModelError(f"Invalid relation {name.strip()}: {e}") from e
+
+        relations_metadata[name.strip()] = {
+            "directly_related_user_types": parser.directly_related_user_types
+        }
+
+    if relations_metadata:
+        type_definition["metadata"] = {"relations": relations_metadata}
+
+    return type_definition
+
+
+def parse_dsl(dsl: str) -> Model:
+    """Transform an authorization model in the OpenFGA DSL into its JSON representation.
+
+    Only a subset of the DSL is supported: single-file models of the schema 1.1, made of types
+    with one `define` statement per line and of conditions. Modular models, and the statements
+    of later schemas, are refused rather than guessed at.
+    """
+    model: Model = {"schema_version": "", "type_definitions": [], "conditions": {}}
+
+    for block in _blocks(dsl):
+        keyword = block.split()[0]
+        if keyword == "model":
+            matched = re.search(r"schema\s+(\S+)", block)
+            model["schema_version"] = matched.group(1) if matched else ""
+        elif keyword == "type":
+            model["type_definitions"].append(_parse_type(block))
+        elif keyword == "condition":
+            condition = _parse_condition(block)
+            model["conditions"][condition["name"]] = condition
+        else:
+            raise AuthorizationModelError(
+                f"Unsupported statement: {block.splitlines()[0]}, {_DSL_UNSUPPORTED_HINT}"
+            )
+
+    if model["schema_version"] != "1.1":
+        raise AuthorizationModelError(
+            f"Only the schema version 1.1 is supported, {_DSL_UNSUPPORTED_HINT}"
+        )
+
+    return model
+
+
+def load_model(content: str) -> Model:
+    """Load an authorization model in either the JSON or the DSL format."""
+    if not content.lstrip().startswith("{"):
+        return parse_dsl(content)
+
+    try:
+        model = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise AuthorizationModelError(f"Invalid JSON: {e}") from e
+
+    if not isinstance(model.get("type_definitions"), list):
+        raise AuthorizationModelError("Missing type_definitions")
+
+    return model
+
+
+@dataclass(frozen=True, slots=True)
+class ModelThresholds:
+    max_depth: int
+    max_fanout: int
+    max_conditions: int
+    allow_cycles: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class ModelAnalysis:
+    max_depth: int = 0
+    deepest_relation: str = ""
+    cycles: list[list[str]] = field(default_factory=list)
+    fanout: dict[str, int] = field(default_factory=dict)
+    conditions: int = 0
+    conditional_references: int = 0
+    estimated_cost: int = 0
+
+    def hotspots(self, max_fanout: int) -> dict[str, int]:
+        return {relation: n for relation, n in self.fanout.items() if n > max_fanout}
+
+    def violations(self, thresholds: ModelThresholds) -> list[str]:
+        violations = []
+        if self.max_depth > thresholds.max_depth:
+            violations.append(
+                f"resolution depth {self.max_depth} of {self.deepest_relation} exceeds "
+                f"{thresholds.max_depth}"
+            )
+
+        if self.cycles and not thresholds.allow_cycles:
+            violations.append(f"{len(self.cycles)} recursive relation cycles found")
+
+        if hotspots := self.hotspots(thresholds.max_fanout):
+            violations.append(
+                f"fan-out exceeds {thresholds.max_fanout} for {', '.join(sorted(hotspots))}"
+            )
+
+        if self.conditions + self.conditional_references > thresholds.max_conditions:
+            violations.append(
+                f"{self.conditions} conditions used by {self.conditional_references} type "
+                f"restrictions exceed {thresholds.max_conditions}"
+            )
+
+        return violations
+
+    def to_report(self, max_fanout: int) -> dict[str, Any]:
+        return {
+            "max-depth": self.max_depth,
+            "deepest-relation": self.deepest_relation,
+            "cycles": "; ".join(" -> ".join(cycle) for cycle in self.cycles) or "none",
+            "fanout-hotspots": ", ".join(
+                f"{relation}={n}" for relation, n in sorted(self.hotspots(max_fanout).items())
+            )
+            or "none",
+            "conditions": self.conditions,
+            "conditional-references": self.conditional_references,
+            "estimated-cost": self.estimated_cost,
+        }
+
+
+class ModelAnalyzer:
+    """Statically estimate how expensive resolving the relations of a model is.
+
+    Each `type#relation` is a node of the resolution graph, with an edge for every dispatch its
+    rewrite may trigger: computed usersets, usersets of directly related types (`group#member`)
+    and tuple-to-usersets through every type of their tupleset relation.
+    """
+
+    def __init__(self, model: Model) -> None:
+        self._types = {
+            type_definition["type"]: type_definition
+            for type_definition in model.get("type_definitions", [])
+        }
+        self._conditions = model.get("conditions") or {}
+        self._edges: dict[str, list[str]] = defaultdict(list)
+
+    def _direct_types(self, type_name: str, relation: str) -> list[dict[str, Any]]:
+        metadata = self._types[type_name].get("metadata") or {}
+        relation_metadata = (metadata.get("relations") or {}).get(relation) or {}
+        return relation_metadata.get("directly_related_user_types") or []
+
+    def _has_relation(self, type_name: str, relation: str) -> bool:
+        return relation in (self._types.get(type_name, {}).get("relations") or {})
+
+    def _walk_tupleset(self, type_name: str, ttu: dict[str, Any]) -> Iterator[str]:
+        target = ttu["computedUserset"]["relation"]
+        for reference in self._direct_types(type_name, ttu["tupleset"]["relation"]):
+            if self._has_relation(reference["type"], target):
+                yield f"{reference['type']}#{target}"
+
+    def _walk(self, type_name: str, relation: str, userset: Userset) -> Iterator[str]:
+        if "this" in userset:
+            references = self._direct_types(type_name, relation)
+            yield from (
+                f"{ref['type']}#{ref['relation']}" for ref in references if ref.get("relation")
+            )
+        elif computed := userset.get("computedUserset"):
+            yield f"{type_name}#{computed['relation']}"
+        elif ttu := userset.get("tupleToUserset"):
+            yield from self._walk_tupleset(type_name, ttu)
+        elif operation := userset.get("union") or userset.get("intersection"):
+            for child in operation.get("child", []):
+                yield from self._walk(type_name, relation, child)
+        elif difference := userset.get("difference"):
+            yield from self._walk(type_name, relation, difference["base"])
+            yield from self._walk(type_name, relation, difference["subtract"])
+
+    def _strongly_connected_components(self, nodes: list[str]) -> list[list[str]]:
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[list[str]] = []
+
+        def visit(node: str) -> None:
+            index[node] = low[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+            for child in self._edges[node]:
+                if child not in index:
+                    visit(child)
+                    low[node] = min(low[node], low[child])
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+
+        for node in nodes:
+            if node not in index:
+                visit(node)
+
+        return components
+
+    def analyze(self) -> ModelAnalysis:
+        nodes = []
+        conditional_references = 0
+        for type_name, type_definition in self._types.items():
+            for relation, userset in (type_definition.get("relations") or {}).items():
+                node = f"{type_name}#{relation}"
+                nodes.append(node)
+                self._edges[node] = list(self._walk(type_name, relation, userset))
+                conditional_references += sum(
+                    1 for ref in self._direct_types(type_name, relation) if ref.get("condition")
+                )
+
+        # Components are found in reverse topological order, dependencies first
+        components = self._strongly_connected_components(nodes)
+        component_of = {node: i for i, component in enumerate(components) for node in component}
+        cycles = [
+            component
+            for component in components
+            if len(component) > 1 or component[0] in self._edges[component[0]]
+        ]
+
+        depth: dict[int, int] = {}
+        cost: dict[int, int] = {}
+        for i, component in enumerate(components):
+            children = {
+                component_of[child]
+                for node in component
+                for child in self._edges[node]
+                if component_of[child] != i
+            }
+            factor = CYCLE_COST_FACTOR if component in cycles else 1
+            depth[i] = 1 + max((depth[child] for child in children), default=0)
+            cost[i] = len(component) * factor + sum(cost[child] for child in children)
+
+        deepest = max(depth, key=depth.__getitem__, default=None)
+        return ModelAnalysis(
+            max_depth=depth[deepest] if deepest is not None else 0,
+            deepest_relation=components[deepest][0] if deepest is not None else "",
+            cycles=cycles,
+            fanout={node: len(set(edges)) for node, edges in self._edges.items() if edges},
+            conditions=len(self._conditions),
+            conditional_references=conditional_references,
+            estimated_cost=max(cost.values(), default=0),
+        )
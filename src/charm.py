@@ -4,59 +4,55 @@
 
 """A Juju charm for OpenFGA."""
 
+import io
 import logging
+import os
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from itertools import islice
 from secrets import token_urlsafe
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Optional, TextIO
 
-from charms.data_platform_libs.v0.data_interfaces import (
-    DatabaseCreatedEvent,
-    DatabaseEndpointsChangedEvent,
-    DatabaseReadOnlyEndpointsChangedEvent,
-    DatabaseRequires,
-)
-from charms.grafana_k8s.v0.grafana_dashboard import GrafanaDashboardProvider
-from charms.loki_k8s.v1.loki_push_api import LogForwarder
-from charms.observability_libs.v0.kubernetes_compute_resources_patch import (
-    K8sResourcePatchFailedEvent,
-    KubernetesComputeResourcesPatch,
-    ResourceRequirements,
-    adjust_resource_requirements,
-)
-from charms.openfga_k8s.v1.openfga import (
-    OpenFGAProvider,
-    OpenfgaProviderAppData,
-    OpenfgaProviderBaseData,
-    OpenFGAStoreRequestEvent,
-)
-from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
-from charms.tempo_coordinator_k8s.v0.tracing import TracingEndpointRequirer
-from charms.tls_certificates_interface.v4.tls_certificates import CertificateAvailableEvent
-from charms.traefik_k8s.v2.ingress import (
-    IngressPerAppReadyEvent,
-    IngressPerAppRevokedEvent,
-)
+from opentelemetry import trace
 from ops import (
     ActionEvent,
     ConfigChangedEvent,
+    EventBase,
     HookEvent,
     LeaderElectedEvent,
+    PebbleCheckFailedEvent,
+    PebbleCheckRecoveredEvent,
     PebbleReadyEvent,
     RelationBrokenEvent,
     StartEvent,
+    StoredState,
     UpdateStatusEvent,
 )
 from ops.charm import CharmBase, RelationChangedEvent, RelationJoinedEvent
 from ops.main import main
-from ops.model import ActiveStatus, BlockedStatus, WaitingStatus
-from ops.pebble import Error, Layer
+from ops.model import (
+    ActiveStatus,
+    BlockedStatus,
+    MaintenanceStatus,
+    ModelError,
+    StatusBase,
+    WaitingStatus,
+)
+from ops.pebble import Error, Layer, PathError
 
+from alert_rules import RENDERED_ALERT_RULES_DIR, render_alert_rules
+from authorization_models import ModelAnalyzer, load_model
 from cli import CommandLine
-from clients import HTTPClient, OpenFGAStore
+from clients import HTTPClient, MetricsClient, OpenFGAStore, RemoteWriteClient
 from configs import CharmConfig
 from constants import (
+    BACKUP_DIR,
     CERTIFICATES_TRANSFER_INTEGRATION_NAME,
+    CHANGELOG_PRUNE_CURSOR_KEY,
     DATABASE_INTEGRATION_NAME,
     DATABASE_NAME,
+    DATABASE_POOLER_INTEGRATION_NAME,
     GRAFANA_INTEGRATION_NAME,
     LOGGING_INTEGRATION_NAME,
     METRIC_INTEGRATION_NAME,
@@ -66,10 +62,31 @@ from constants import (
     PEER_INTEGRATION_NAME,
     PRESHARED_TOKEN_SECRET_KEY,
     PRESHARED_TOKEN_SECRET_LABEL,
+    PROVIDER_DATA_KEY,
+    REMOTE_WRITE_INTEGRATION_NAME,
+    SECONDARY_DATASTORE_KEY,
     SECRET_ID_KEY,
+    TRACING_INTEGRATION_NAME,
+    TUPLES_RESOURCE,
     WORKLOAD_CONTAINER,
 )
-from exceptions import MigrationError, PebbleServiceError
+from dashboards import RENDERED_DASHBOARDS_DIR, render_dashboards
+from datastore import (
+    OPENFGA_TABLES,
+    ChangelogPruner,
+    DatastoreClient,
+    StoreStats,
+    StoreStatsCollector,
+)
+from exceptions import (
+    AuthorizationModelError,
+    DatastoreError,
+    LoadTestError,
+    MigrationError,
+    PebbleServiceError,
+    TupleExportError,
+    TupleFormatError,
+)
 from integrations import (
     CertificatesIntegration,
     CertificatesTransferIntegration,
@@ -77,22 +94,92 @@ from integrations import (
     GRPCIngressIntegration,
     HttpIngressIntegration,
     PeerData,
+    ReceiveCACertIntegration,
+    RestartLock,
     TracingData,
 )
+from loadgen import LoadGenerator, parse_mix
+from metrics import (
+    CHANGELOG_PRUNE_DURATION_METRIC,
+    CHANGELOG_PRUNED_METRIC,
+    DEFERRALS_METRIC,
+    DRAIN_DURATION_METRIC,
+    DRAIN_TIMEOUTS_METRIC,
+    HOOK_DURATION_BUCKETS,
+    HOOK_DURATION_METRIC,
+    MIGRATION_DURATION_METRIC,
+    REPLICA_LAG_METRIC,
+    RESTARTS_METRIC,
+    STORE_AUTHORIZATION_MODELS_METRIC,
+    STORE_CHANGELOG_GROWTH_METRIC,
+    STORE_PROVISIONING_DURATION_METRIC,
+    STORE_TUPLES_METRIC,
+    CharmMetrics,
+)
 from secret import Secrets
 from services import PebbleService, WorkloadService
-from utils import container_connectivity, leader_unit, peer_integration_exists
+from tuples import (
+    TUPLE_KEY_FIELDS,
+    ChangesCursor,
+    GzipNDJSONStream,
+    ImportCheckpoint,
+    TupleExporter,
+    TupleImporter,
+    read_tuples,
+)
+from utils import container_connectivity, integration_active, leader_unit, peer_integration_exists
+from warmup import CheckCacheWarmer, WarmupResult, WarmupSample, dump_sample, read_sample
+
+if TYPE_CHECKING:
+    from charms.data_platform_libs.v0.data_interfaces import (
+        DatabaseCreatedEvent,
+        DatabaseEndpointsChangedEvent,
+        DatabaseReadOnlyEndpointsChangedEvent,
+        DatabaseRequires,
+    )
+    from charms.grafana_k8s.v0.grafana_dashboard import GrafanaDashboardProvider
+    from charms.loki_k8s.v1.loki_push_api import LogForwarder
+    from charms.observability_libs.v0.kubernetes_compute_resources_patch import (
+        K8sResourcePatchFailedEvent,
+        KubernetesComputeResourcesPatch,
+        ResourceRequirements,
+    )
+    from charms.openfga_k8s.v1.openfga import OpenFGAProvider, OpenFGAStoreRequestEvent
+    from charms.prometheus_k8s.v0.prometheus_remote_write import PrometheusRemoteWriteConsumer
+    from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
+    from charms.tempo_coordinator_k8s.v0.tracing import TracingEndpointRequirer
+    from charms.tls_certificates_interface.v4.tls_certificates import CertificateAvailableEvent
+    from charms.traefik_k8s.v2.ingress import IngressPerAppReadyEvent, IngressPerAppRevokedEvent
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+# The gauges exporting the store statistics, by field of `StoreStats`
+STORE_STATS_GAUGES = {
+    STORE_TUPLES_METRIC: "tuples",
+    STORE_CHANGELOG_GROWTH_METRIC: "changelog_growth",
+    STORE_AUTHORIZATION_MODELS_METRIC: "authorization_models",
+}
+# How long a restarted workload service is waited for before the restart lock release is
+# deferred to a later hook
+RESTART_READY_TIMEOUT = 30
 
 
 class OpenFGAOperatorCharm(CharmBase):
+    _stored: Any = StoredState()
+
     def __init__(self, *args: Any) -> None:
         super().__init__(*args)
+        self._hook_started = time.monotonic()
+        self._stored.set_default(store_stats={})
 
         self.peer_data = PeerData(self.model)
         self.secrets = Secrets(self.model)
         self.charm_config = CharmConfig(self.config)
+        self._charm_metrics = CharmMetrics(self)
+        self._restart_lock = RestartLock(
+            self.model, self.peer_data, self.charm_config.restart.max_concurrent
+        )
 
         self._container = self.unit.get_container(WORKLOAD_CONTAINER)
         self._workload_service = WorkloadService(self.unit)
@@ -101,13 +188,87 @@ class OpenFGAOperatorCharm(CharmBase):
 
         # Lifecycle event handlers
         self.framework.observe(self.on.openfga_pebble_ready, self._on_openfga_pebble_ready)
+        self.framework.observe(
+            self.on.openfga_pebble_check_failed, self._on_openfga_pebble_check_failed
+        )
+        self.framework.observe(
+            self.on.openfga_pebble_check_recovered, self._on_openfga_pebble_check_recovered
+        )
         self.framework.observe(self.on.leader_elected, self._on_leader_elected)
         self.framework.observe(self.on.config_changed, self._on_config_changed)
         self.framework.observe(self.on.update_status, self._on_update_status)
         self.framework.observe(self.on.start, self._on_start)
         self.framework.observe(self.on.peer_relation_changed, self._on_peer_relation_changed)
+        self.framework.observe(self.framework.on.pre_commit, self._on_pre_commit)
+
+        # The libraries of the integrations are imported only when the integrations are active
+        self.database_requirer: Optional["DatabaseRequires"] = None
+        self.database_pooler_requirer: Optional["DatabaseRequires"] = None
+        self.openfga_provider: Optional["OpenFGAProvider"] = None
+        self.tracing_requirer: Optional["TracingEndpointRequirer"] = None
+        self.metrics_endpoint: Optional["MetricsEndpointProvider"] = None
+        self._grafana_dashboards: Optional["GrafanaDashboardProvider"] = None
+        self._log_forwarder: Optional["LogForwarder"] = None
+        self._remote_write: Optional["PrometheusRemoteWriteConsumer"] = None
+        self.resources_patch: Optional["KubernetesComputeResourcesPatch"] = None
+
+        self._setup_database_integration()
+        self.framework.observe(
+            self.on[DATABASE_INTEGRATION_NAME].relation_broken,
+            self._on_database_relation_broken,
+        )
+        self._setup_database_pooler_integration()
+        self.framework.observe(
+            self.on[DATABASE_POOLER_INTEGRATION_NAME].relation_broken,
+            self._on_database_pooler_changed,
+        )
+        self._setup_openfga_integration()
+
+        # Certificates integration
+        self._certs_integration = CertificatesIntegration(self)
+        if cert_requirer := self._certs_integration.cert_requirer:
+            self.framework.observe(cert_requirer.on.certificate_available, self._on_cert_changed)
+
+        # HTTP and GRPC ingress integrations
+        self.http_ingress_integration = HttpIngressIntegration(self)
+        self.grpc_ingress_integration = GRPCIngressIntegration(self)
+        for ingress_integration in (self.http_ingress_integration, self.grpc_ingress_integration):
+            if ingress_requirer := ingress_integration.ingress_requirer:
+                self.framework.observe(ingress_requirer.on.ready, self._on_ingress_ready)
+                self.framework.observe(ingress_requirer.on.revoked, self._on_ingress_revoked)
+
+        # Certificate transfer integration
+        self._certs_transfer_integration = CertificatesTransferIntegration(self)
+        self.framework.observe(
+            self.on[CERTIFICATES_TRANSFER_INTEGRATION_NAME].relation_joined,
+            self._on_certificates_transfer_relation_joined,
+        )
+
+        self._setup_observability_integrations()
+        self._setup_resources_patch()
+
+        # Actions
+        self.framework.observe(self.on.schema_upgrade_action, self._on_schema_upgrade_action)
+        self.framework.observe(self.on.import_tuples_action, self._on_import_tuples_action)
+        self.framework.observe(self.on.export_tuples_action, self._on_export_tuples_action)
+        self.framework.observe(
+            self.on.write_authorization_model_action, self._on_write_authorization_model_action
+        )
+        self.framework.observe(self.on.load_test_action, self._on_load_test_action)
+        self.framework.observe(
+            self.on.capture_warmup_sample_action, self._on_capture_warmup_sample_action
+        )
+        self.framework.observe(self.on.store_stats_action, self._on_store_stats_action)
+        self.framework.observe(
+            self.on.database_maintenance_action, self._on_database_maintenance_action
+        )
+
+    def _setup_database_integration(self) -> None:
+        if not integration_active(self, DATABASE_INTEGRATION_NAME):
+            return
+
+        from charms.data_platform_libs.v0.data_interfaces import DatabaseRequires
 
-        # Database integration
         self.database_requirer = DatabaseRequires(
             self,
             relation_name=DATABASE_INTEGRATION_NAME,
@@ -125,85 +286,133 @@ class OpenFGAOperatorCharm(CharmBase):
             self.database_requirer.on.read_only_endpoints_changed,
             self._on_database_changed,
         )
-        self.framework.observe(
-            self.on[DATABASE_INTEGRATION_NAME].relation_broken,
-            self._on_database_relation_broken,
+
+    def _setup_database_pooler_integration(self) -> None:
+        if not integration_active(self, DATABASE_POOLER_INTEGRATION_NAME):
+            return
+
+        from charms.data_platform_libs.v0.data_interfaces import DatabaseRequires
+
+        self.database_pooler_requirer = DatabaseRequires(
+            self,
+            relation_name=DATABASE_POOLER_INTEGRATION_NAME,
+            database_name=DATABASE_NAME,
         )
+        for event in (
+            self.database_pooler_requirer.on.database_created,
+            self.database_pooler_requirer.on.endpoints_changed,
+            self.database_pooler_requirer.on.read_only_endpoints_changed,
+        ):
+            self.framework.observe(event, self._on_database_pooler_changed)
+
+    def _setup_openfga_integration(self) -> None:
+        if not integration_active(self, OPENFGA_INTEGRATION_NAME):
+            return
+
+        from charms.openfga_k8s.v1.openfga import OpenFGAProvider
 
-        # OpenFGA integration
         self.openfga_provider = OpenFGAProvider(self, relation_name=OPENFGA_INTEGRATION_NAME)
         self.framework.observe(
             self.openfga_provider.on.openfga_store_requested,
             self._on_openfga_store_requested,
         )
 
-        # Certificates integration
-        self._certs_integration = CertificatesIntegration(self)
-        self.framework.observe(
-            self._certs_integration.cert_requirer.on.certificate_available,
-            self._on_cert_changed,
-        )
+    def _setup_observability_integrations(self) -> None:
+        if integration_active(self, GRAFANA_INTEGRATION_NAME):
+            from charms.grafana_k8s.v0.grafana_dashboard import GrafanaDashboardProvider
+
+            self._grafana_dashboards = GrafanaDashboardProvider(
+                self,
+                relation_name=GRAFANA_INTEGRATION_NAME,
+                dashboards_path=str(
+                    render_dashboards(
+                        self.charm_dir / RENDERED_DASHBOARDS_DIR, self.charm_config.metrics
+                    )
+                ),
+            )
 
-        # HTTP ingress integration
-        self.http_ingress_integration = HttpIngressIntegration(self)
-        self.framework.observe(
-            self.http_ingress_integration.ingress_requirer.on.ready,
-            self._on_ingress_ready,
-        )
-        self.framework.observe(
-            self.http_ingress_integration.ingress_requirer.on.revoked,
-            self._on_ingress_revoked,
-        )
+        if integration_active(self, LOGGING_INTEGRATION_NAME):
+            from charms.loki_k8s.v1.loki_push_api import LogForwarder
+
+            self._log_forwarder = LogForwarder(self, relation_name=LOGGING_INTEGRATION_NAME)
+
+        if integration_active(self, METRIC_INTEGRATION_NAME):
+            from charms.prometheus_k8s.v0.prometheus_scrape import MetricsEndpointProvider
+
+            self.metrics_endpoint = MetricsEndpointProvider(
+                self,
+                jobs=[
+                    {
+                        "metrics_path": "/metrics",
+                        "static_configs": [{"targets": [f"*:{OPENFGA_METRICS_HTTP_PORT}"]}],
+                    }
+                ],
+                refresh_event=self.on.config_changed,
+                relation_name=METRIC_INTEGRATION_NAME,
+                alert_rules_path=str(
+                    render_alert_rules(
+                        self.charm_dir / RENDERED_ALERT_RULES_DIR,
+                        self.charm_config.slo,
+                        rpc_histograms=self.charm_config.metrics.rpc_histograms,
+                    )
+                ),
+            )
 
-        # GRPC ingress integration
-        self.grpc_ingress_integration = GRPCIngressIntegration(self)
-        self.framework.observe(
-            self.grpc_ingress_integration.ingress_requirer.on.ready,
-            self._on_ingress_ready,
-        )
-        self.framework.observe(
-            self.grpc_ingress_integration.ingress_requirer.on.revoked,
-            self._on_ingress_revoked,
-        )
+        if integration_active(self, REMOTE_WRITE_INTEGRATION_NAME):
+            from charms.prometheus_k8s.v0.prometheus_remote_write import (
+                PrometheusRemoteWriteConsumer,
+            )
 
-        # Certificate transfer integration
-        self._certs_transfer_integration = CertificatesTransferIntegration(self)
-        self.framework.observe(
-            self.on[CERTIFICATES_TRANSFER_INTEGRATION_NAME].relation_joined,
-            self._on_certificates_transfer_relation_joined,
-        )
+            self._remote_write = PrometheusRemoteWriteConsumer(
+                self,
+                relation_name=REMOTE_WRITE_INTEGRATION_NAME,
+                alert_rules_path="./src/charm_alert_rules",
+            )
 
-        # Grafana dashboard integration
-        self._grafana_dashboards = GrafanaDashboardProvider(
-            self, relation_name=GRAFANA_INTEGRATION_NAME
-        )
+        if integration_active(self, TRACING_INTEGRATION_NAME):
+            from charms.tempo_coordinator_k8s.v0.tracing import TracingEndpointRequirer
 
-        # Loki logging integration
-        self._log_forwarder = LogForwarder(self, relation_name=LOGGING_INTEGRATION_NAME)
+            self.tracing_requirer = TracingEndpointRequirer(
+                self, relation_name=TRACING_INTEGRATION_NAME, protocols=["otlp_grpc", "otlp_http"]
+            )
+            self.framework.observe(
+                self.tracing_requirer.on.endpoint_changed, self._on_tracing_endpoint_changed
+            )
+            self.framework.observe(
+                self.tracing_requirer.on.endpoint_removed, self._on_tracing_endpoint_changed
+            )
+            self._setup_charm_tracing()
 
-        # Prometheus metrics integration
-        self.metrics_endpoint = MetricsEndpointProvider(
-            self,
-            jobs=[
-                {
-                    "metrics_path": "/metrics",
-                    "static_configs": [{"targets": [f"*:{OPENFGA_METRICS_HTTP_PORT}"]}],
-                }
-            ],
-            refresh_event=self.on.config_changed,
-            relation_name=METRIC_INTEGRATION_NAME,
-        )
-
-        # Tracing integration
-        self.tracing_requirer = TracingEndpointRequirer(self, protocols=["otlp_grpc"])
-        self.framework.observe(
-            self.tracing_requirer.on.endpoint_changed, self._on_tracing_endpoint_changed
+    def _setup_charm_tracing(self) -> None:
+        # The charm traces are sent to the same Tempo as the workload traces, over OTLP HTTP
+        if not (url := TracingData.load(self.tracing_requirer).charm_traces_url):
+            return
+
+        from charm_tracing import setup_charm_tracing
+
+        hook = os.path.basename(os.environ.get("JUJU_DISPATCH_PATH", ""))
+        ca = ReceiveCACertIntegration(self).ca_certs if url.startswith("https") else None
+        setup_charm_tracing(
+            resource={
+                "service.name": self.app.name,
+                "juju_unit": self.unit.name,
+                "juju_model": self.model.name,
+                "charm_type": type(self).__name__,
+            },
+            hook=f"{hook}: {type(self).__name__}",
+            url=url,
+            ca=ca,
         )
-        self.framework.observe(
-            self.tracing_requirer.on.endpoint_removed, self._on_tracing_endpoint_changed
+
+    def _setup_resources_patch(self) -> None:
+        # The resource limits are only patched on config-changed
+        if os.environ.get("JUJU_HOOK_NAME") != "config-changed":
+            return
+
+        from charms.observability_libs.v0.kubernetes_compute_resources_patch import (
+            KubernetesComputeResourcesPatch,
         )
 
-        # Resources patching
         self.resources_patch = KubernetesComputeResourcesPatch(
             self,
             WORKLOAD_CONTAINER,
@@ -213,19 +422,52 @@ class OpenFGAOperatorCharm(CharmBase):
             self.resources_patch.on.patch_failed, self._on_resource_patch_failed
         )
 
-        # Actions
-        self.framework.observe(self.on.schema_upgrade_action, self._on_schema_upgrade_action)
-
     @property
     def _pebble_layer(self) -> Layer:
-        database_config = DatabaseConfig.load(self.database_requirer)
-        tracing_data = TracingData.load(self.tracing_requirer)
+        # The workload service goes through the connection pooler once it is ready, while the
+        # migrations and the queries of the charm keep connecting to the database directly
+        pooled = self._database_pooler_ready
+        connection = replace(self.charm_config.datastore_connection, pooled=pooled)
+        database_config = DatabaseConfig.load(
+            self.database_pooler_requirer if pooled else self.database_requirer,
+            secondary_in_use=self._secondary_datastore_in_use,
+            params=connection.query_params(self.unit.name),
+        )
+        tracing_data = TracingData.load(self.tracing_requirer, self.charm_config.trace_sampling)
         return self._pebble_service.render_pebble_layer(
             self.charm_config,
             self._certs_integration,
             self.secrets,
             database_config,
+            connection,
             tracing_data,
+            health_checks=self.charm_config.health_checks,
+        )
+
+    @property
+    def _database_config(self) -> DatabaseConfig:
+        return DatabaseConfig.load(
+            self.database_requirer,
+            secondary_in_use=self._secondary_datastore_in_use,
+            params=self.charm_config.datastore_connection.query_params(self.unit.name),
+        )
+
+    @property
+    def _secondary_datastore_in_use(self) -> bool:
+        secondary_datastore = self.peer_data[SECONDARY_DATASTORE_KEY]
+        if not isinstance(secondary_datastore, dict):
+            return True
+
+        return bool(secondary_datastore.get("in-use", True))
+
+    @property
+    def _database_created(self) -> bool:
+        return bool(self.database_requirer and self.database_requirer.is_resource_created())
+
+    @property
+    def _database_pooler_ready(self) -> bool:
+        return bool(
+            self.database_pooler_requirer and self.database_pooler_requirer.is_resource_created()
         )
 
     @property
@@ -248,7 +490,10 @@ class OpenFGAOperatorCharm(CharmBase):
         self._holistic_handler(event)
 
     def _on_update_status(self, event: UpdateStatusEvent) -> None:
+        self._check_replica_lag()
         self._holistic_handler(event)
+        self._prune_changelog()
+        self._collect_store_stats()
 
     def _on_start(self, event: StartEvent) -> None:
         self._holistic_handler(event)
@@ -256,7 +501,7 @@ class OpenFGAOperatorCharm(CharmBase):
     def _on_openfga_pebble_ready(self, event: PebbleReadyEvent) -> None:
         if not container_connectivity(self):
             self.unit.status = WaitingStatus("Container is not connected yet")
-            event.defer()
+            self._defer(event)
             return
 
         self._workload_service.open_ports()
@@ -266,18 +511,26 @@ class OpenFGAOperatorCharm(CharmBase):
 
         self._holistic_handler(event)
 
+    def _on_openfga_pebble_check_failed(self, event: PebbleCheckFailedEvent) -> None:
+        logger.warning("The %s health check of the workload service failed", event.info.name)
+        self._holistic_handler(event)
+
+    def _on_openfga_pebble_check_recovered(self, event: PebbleCheckRecoveredEvent) -> None:
+        logger.info("The %s health check of the workload service recovered", event.info.name)
+        self._holistic_handler(event)
+
     def _on_peer_relation_changed(self, event: RelationChangedEvent) -> None:
         self._holistic_handler(event)
 
-    def _on_database_created(self, event: DatabaseCreatedEvent) -> None:
+    def _on_database_created(self, event: "DatabaseCreatedEvent") -> None:
         if not container_connectivity(self):
             self.unit.status = WaitingStatus("Container is not connected yet")
-            event.defer()
+            self._defer(event)
             return
 
         if not peer_integration_exists(self):
             self.unit.status = WaitingStatus(f"Missing integration {PEER_INTEGRATION_NAME}")
-            event.defer()
+            self._defer(event)
             return
 
         if not self.migration_needed:
@@ -289,11 +542,11 @@ class OpenFGAOperatorCharm(CharmBase):
                 "Unit does not have leadership. Wait for leader unit to run the migration."
             )
             self.unit.status = WaitingStatus("Waiting for leader unit to run the migration")
-            event.defer()
+            self._defer(event)
             return
 
         try:
-            self._cli.migrate(DatabaseConfig.load(self.database_requirer).dsn)
+            self._migrate(self._database_config.migration_dsn)
         except MigrationError:
             self.unit.status = BlockedStatus("Database migration failed")
             logger.error("Auto migration job failed. Please use the schema-upgrade action")
@@ -305,45 +558,51 @@ class OpenFGAOperatorCharm(CharmBase):
         self._holistic_handler(event)
 
     def _on_database_changed(
-        self, event: DatabaseEndpointsChangedEvent | DatabaseReadOnlyEndpointsChangedEvent
+        self, event: "DatabaseEndpointsChangedEvent | DatabaseReadOnlyEndpointsChangedEvent"
     ) -> None:
         self._holistic_handler(event)
 
     def _on_database_relation_broken(self, event: RelationBrokenEvent) -> None:
         self._holistic_handler(event)
 
+    def _on_database_pooler_changed(self, event: HookEvent) -> None:
+        self._holistic_handler(event)
+
     @leader_unit
-    def _on_openfga_store_requested(self, event: OpenFGAStoreRequestEvent) -> None:
-        if not (store_name := event.store_name):
+    def _on_openfga_store_requested(self, event: "OpenFGAStoreRequestEvent") -> None:
+        from charms.openfga_k8s.v1.openfga import OpenfgaProviderAppData
+
+        if not self.openfga_provider or not (store_names := event.store_names):
             return
 
         if not self.secrets.is_ready:
             logger.error("Missing required OpenFGA API token")
-            event.defer()
+            self._defer(event)
             return
 
-        if not self.database_requirer.is_resource_created():
-            event.defer()
+        if not self._database_created:
+            self._defer(event)
             return
 
         if not self._workload_service.is_running:
             logger.error("OpenFGA server is not running")
-            event.defer()
+            self._defer(event)
             return
 
-        token = self.secrets[PRESHARED_TOKEN_SECRET_LABEL][PRESHARED_TOKEN_SECRET_KEY]
-        with HTTPClient(
-            base_url=f"{self._certs_integration.uri_scheme}://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}",
-            auth_token=token,
-        ) as client:
-            if not (store_id := OpenFGAStore(client).create(store_name)):
-                logger.error("Failed to create OpenFGA store %s", store_name)
-                return
+        start = time.monotonic()
+        with self._http_client() as client:
+            store_ids = OpenFGAStore(client).create_many(store_names)
+        self._charm_metrics.observe(STORE_PROVISIONING_DURATION_METRIC, time.monotonic() - start)
+
+        if missing := [name for name in store_names if name not in store_ids]:
+            logger.error("Failed to create OpenFGA stores %s", ", ".join(missing))
+            return
 
         token_secret_id = self.secrets[PRESHARED_TOKEN_SECRET_LABEL][SECRET_ID_KEY]
         self.openfga_provider.update_relation_app_data(
             data=OpenfgaProviderAppData(
-                store_id=store_id,
+                store_id=store_ids[event.store_name or store_names[0]],
+                store_ids=store_ids,
                 token_secret_id=token_secret_id,
                 http_api_url=self.http_ingress_integration.url,
                 grpc_api_url=self.grpc_ingress_integration.url,
@@ -351,15 +610,24 @@ class OpenFGAOperatorCharm(CharmBase):
             relation_id=event.relation.id,
         )
 
-    def _on_ingress_ready(self, event: IngressPerAppReadyEvent) -> None:
+    def _http_client(self, pool_size: int = 10) -> HTTPClient:
+        secret = self.secrets[PRESHARED_TOKEN_SECRET_LABEL] or {}
+        token = secret.get(PRESHARED_TOKEN_SECRET_KEY, "")
+        return HTTPClient(
+            base_url=f"{self._certs_integration.uri_scheme}://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}",
+            auth_token=token,
+            pool_size=pool_size,
+        )
+
+    def _on_ingress_ready(self, event: "IngressPerAppReadyEvent") -> None:
         self._holistic_handler(event)
 
-    def _on_ingress_revoked(self, event: IngressPerAppRevokedEvent) -> None:
+    def _on_ingress_revoked(self, event: "IngressPerAppRevokedEvent") -> None:
         self._holistic_handler(event)
 
-    def _on_cert_changed(self, event: CertificateAvailableEvent) -> None:
+    def _on_cert_changed(self, event: "CertificateAvailableEvent") -> None:
         if not self._workload_service.is_running:
-            event.defer()
+            self._defer(event)
             return
 
         self._holistic_handler(event)
@@ -369,7 +637,7 @@ class OpenFGAOperatorCharm(CharmBase):
 
     def _on_certificates_transfer_relation_joined(self, event: RelationJoinedEvent) -> None:
         if not self._certs_integration.tls_enabled:
-            event.defer()
+            self._defer(event)
             return
 
         self._certs_transfer_integration.transfer_certificates(
@@ -379,31 +647,57 @@ class OpenFGAOperatorCharm(CharmBase):
     def _on_tracing_endpoint_changed(self, event: HookEvent) -> None:
         self._holistic_handler(event)
 
-    def _on_resource_patch_failed(self, event: K8sResourcePatchFailedEvent) -> None:
+    def _on_pre_commit(self, _: EventBase) -> None:
+        hook = os.path.basename(os.environ.get("JUJU_DISPATCH_PATH", ""))
+        self._charm_metrics.observe(
+            HOOK_DURATION_METRIC,
+            time.monotonic() - self._hook_started,
+            buckets=HOOK_DURATION_BUCKETS,
+            labels={"hook": hook},
+        )
+        self._remote_write_charm_metrics()
+
+    def _defer(self, event: EventBase) -> None:
+        self._charm_metrics.inc(DEFERRALS_METRIC, labels={"event": event.handle.kind})
+        event.defer()
+
+    def _migrate(self, dsn: str, timeout: float = 60) -> None:
+        start = time.monotonic()
+        try:
+            self._cli.migrate(dsn, timeout=timeout)
+        finally:
+            self._charm_metrics.observe(MIGRATION_DURATION_METRIC, time.monotonic() - start)
+
+    def _on_resource_patch_failed(self, event: "K8sResourcePatchFailedEvent") -> None:
         logger.error("Failed to patch resource constraints: %s", event.message)
         self.unit.status = BlockedStatus(event.message)
 
-    def _resource_reqs_from_config(self) -> ResourceRequirements:
+    def _resource_reqs_from_config(self) -> "ResourceRequirements":
+        from charms.observability_libs.v0.kubernetes_compute_resources_patch import (
+            adjust_resource_requirements,
+        )
+
         requests = {"cpu": "100m", "memory": "200Mi"}
         limits = {"cpu": self.model.config.get("cpu"), "memory": self.model.config.get("memory")}
         return adjust_resource_requirements(limits, requests, adhere_to_requests=True)
 
+    @tracer.start_as_current_span("holistic_handler")
     def _holistic_handler(self, event: HookEvent) -> None:
         if not container_connectivity(self):
             self.unit.status = WaitingStatus("Container is not connected yet")
-            event.defer()
+            self._defer(event)
             return
 
         if not peer_integration_exists(self):
             self.unit.status = WaitingStatus(f"Missing peer integration {PEER_INTEGRATION_NAME}")
-            event.defer()
+            self._defer(event)
             return
 
         if not self.model.relations[DATABASE_INTEGRATION_NAME]:
             self.unit.status = BlockedStatus(f"Missing integration {DATABASE_INTEGRATION_NAME}")
             return
 
-        if not self.database_requirer.is_resource_created():
+        if not self._database_created:
             self.unit.status = WaitingStatus("Waiting for database creation")
             return
 
@@ -421,23 +715,288 @@ class OpenFGAOperatorCharm(CharmBase):
             )
             return
 
+        layer = self._pebble_layer
+        if not self._prepare_restart(layer):
+            self.unit.status = WaitingStatus("Waiting for other units to restart")
+            return
+
         try:
-            self._pebble_service.plan(self._pebble_layer)
+            restarted = self._pebble_service.plan(layer)
         except PebbleServiceError:
             logger.error("Failed to start the service, please check the container logs")
+            self._restart_lock.release()
             self.unit.status = BlockedStatus(
                 f"Failed to restart the service, please check the {WORKLOAD_CONTAINER} logs"
             )
             return
 
-        self.unit.status = ActiveStatus()
+        warmup = self._on_workload_restarted() if restarted else None
+
+        if self._restart_lock.is_requested and not self._release_restart_lock(event):
+            self.unit.status = WaitingStatus("Waiting for the workload service to be ready")
+            return
+
+        self.unit.status = self._workload_status(warmup)
+
+        self._update_openfga_provider_data()
+
+    def _update_openfga_provider_data(self) -> None:
+        if not self.openfga_provider:
+            return
+
+        if not self.unit.is_leader():
+            return
+
+        # Rewriting the databag of every relation costs a few hook tool calls per relation, so
+        # the URLs are only published again once they have changed. New relations get them
+        # along with their store
+        grpc_api_url = self.grpc_ingress_integration.url
+        http_api_url = self.http_ingress_integration.url
+        published = {"grpc_api_url": grpc_api_url, "http_api_url": http_api_url}
+        if self.peer_data[PROVIDER_DATA_KEY] == published:
+            return
+
+        from charms.openfga_k8s.v1.openfga import OpenfgaProviderBaseData
 
         self.openfga_provider.update_relations_app_data(
-            OpenfgaProviderBaseData(
-                grpc_api_url=self.grpc_ingress_integration.url,
-                http_api_url=self.http_ingress_integration.url,
+            OpenfgaProviderBaseData(grpc_api_url=grpc_api_url, http_api_url=http_api_url)
+        )
+        self.peer_data[PROVIDER_DATA_KEY] = published
+
+    def _workload_status(self, warmup: Optional[WarmupResult] = None) -> StatusBase:
+        if failing_checks := self._workload_service.failing_checks:
+            return WaitingStatus(
+                f"Workload service is not ready, failing checks: {', '.join(failing_checks)}"
+            )
+
+        return ActiveStatus(f"Warmed up with {warmup}" if warmup else "")
+
+    def _prepare_restart(self, layer: Layer) -> bool:
+        """Acquire the restart lock and drain the workload service if the layer restarts it."""
+        self._restart_lock.grant()
+        if not self._pebble_service.restart_required(layer):
+            return True
+
+        self._restart_lock.request()
+        self._restart_lock.grant()
+        if not self._restart_lock.is_granted:
+            return False
+
+        self._drain_workload_service()
+        return True
+
+    def _release_restart_lock(self, event: HookEvent) -> bool:
+        """Release the restart lock once the workload service passes the ready check.
+
+        A service slower to start than `RESTART_READY_TIMEOUT` keeps the lock, and the event is
+        deferred to check again in a later hook rather than holding this one any longer.
+        """
+        with self._http_client() as client:
+            if not client.wait_until_healthy(RESTART_READY_TIMEOUT):
+                logger.info("OpenFGA server is not ready yet, holding the restart lock")
+                if not isinstance(event, ActionEvent):
+                    self._defer(event)
+                return False
+
+        self._restart_lock.release()
+        self._restart_lock.grant()
+        return True
+
+    def _drain_workload_service(self) -> None:
+        if not (grace_period := self.charm_config.restart.drain_grace_period):
+            return
+
+        self.unit.status = MaintenanceStatus("Draining the workload service")
+        metrics_client = MetricsClient(f"http://127.0.0.1:{OPENFGA_METRICS_HTTP_PORT}")
+        try:
+            duration, completed = self._pebble_service.drain(
+                grace_period, metrics_client.in_flight_requests
+            )
+        except Error as e:
+            logger.error("Failed to drain the workload service: %s", e)
+            return
+
+        logger.info("Drained the workload service in %.1fs", duration)
+        self._charm_metrics.observe(DRAIN_DURATION_METRIC, duration)
+        if not completed:
+            logger.warning(
+                "Restarting with requests in flight after the %ss drain grace period",
+                grace_period,
             )
+            self._charm_metrics.inc(DRAIN_TIMEOUTS_METRIC)
+
+    def _remote_write_charm_metrics(self) -> None:
+        if not self._remote_write or not (endpoints := self._remote_write.endpoints):
+            return
+
+        if not self._charm_metrics.push_due():
+            return
+
+        from charms.observability_libs.v0.juju_topology import JujuTopology
+
+        topology = JujuTopology.from_charm(self).as_dict(remapped_keys={"charm_name": "charm"})
+        samples = self._charm_metrics.samples({
+            f"juju_{key}": value for key, value in topology.items()
+        })
+        pushed = [RemoteWriteClient(endpoint["url"]).push(samples) for endpoint in endpoints]
+        if all(pushed):
+            self._charm_metrics.mark_pushed()
+
+    @leader_unit
+    def _check_replica_lag(self) -> None:
+        replica_lag = self.charm_config.replica_lag
+        if not replica_lag.enabled or not self.database_requirer:
+            return
+
+        # Only the first of the read-only endpoints is given to the workload service, so that is
+        # the replica whose lag is measured
+        if not (read_only_dsn := self._database_config.read_only_dsn):
+            return
+
+        try:
+            with DatastoreClient(read_only_dsn, statement_timeout=5, connect_timeout=5) as client:
+                lag: Optional[float] = client.replication_lag()
+        except DatastoreError as e:
+            logger.warning("Failed to measure the replication lag of the replica: %s", e)
+            lag = None
+
+        self._charm_metrics.set_gauges(REPLICA_LAG_METRIC, [({}, lag)] if lag is not None else [])
+
+        in_use = self._secondary_datastore_in_use
+        if (secondary_in_use := replica_lag.secondary_in_use(lag, in_use)) == in_use:
+            return
+
+        # The peer data change replans the workload service of every unit
+        logger.warning(
+            "%s the read-only replica, replication lag %s",
+            "Restoring reads on" if secondary_in_use else "Moving reads off",
+            f"{lag:.1f}s" if lag is not None else "unknown",
         )
+        self.peer_data[SECONDARY_DATASTORE_KEY] = {"in-use": secondary_in_use, "lag": lag}
+
+    @leader_unit
+    def _prune_changelog(self) -> None:
+        retention = self.charm_config.changelog_retention
+        if not retention.enabled or not self._database_created or self.migration_needed:
+            return
+
+        cursor = self.peer_data[CHANGELOG_PRUNE_CURSOR_KEY]
+        if not isinstance(cursor, str):
+            cursor = ""
+
+        try:
+            with DatastoreClient(
+                self._database_config.dsn,
+                statement_timeout=retention.timeout,
+            ) as client:
+                pruner = ChangelogPruner(client, retention.days, retention.batch_limit)
+                result = pruner.run(cursor, timeout=retention.timeout)
+        except DatastoreError as e:
+            logger.error("Failed to prune the changelog: %s", e)
+            return
+
+        self.peer_data[CHANGELOG_PRUNE_CURSOR_KEY] = result.cursor
+        self._charm_metrics.inc(CHANGELOG_PRUNED_METRIC, result.deleted)
+        self._charm_metrics.observe(CHANGELOG_PRUNE_DURATION_METRIC, result.duration)
+        logger.info("Pruned the changelog: %s", result)
+
+    def _collect_store_stats(self) -> None:
+        if not self.unit.is_leader():
+            # A former leader stops exporting the statistics, now collected by the new leader
+            for name in STORE_STATS_GAUGES:
+                self._charm_metrics.set_gauges(name, [])
+            return
+
+        stats_config = self.charm_config.store_stats
+        if not stats_config.enabled:
+            return
+
+        cached = self._cached_store_stats
+        if cached and not stats_config.due(cached["collected-at"], time.time()):
+            return
+
+        if not self._database_created or self.migration_needed:
+            return
+
+        try:
+            self._refresh_store_stats()
+        except DatastoreError as e:
+            logger.error("Failed to collect the store statistics: %s", e)
+
+    @property
+    def _cached_store_stats(self) -> dict[str, Any]:
+        # The statistics are kept in the leader unit state rather than the peer databag, whose
+        # changes would trigger a peer relation changed event on every unit
+        cached = dict(self._stored.store_stats)
+        if not {"collected-at", "stores"} <= cached.keys():
+            return {}
+
+        return cached
+
+    def _refresh_store_stats(self) -> dict[str, Any]:
+        # Collect from the replica when there is one, away from the serving traffic
+        database_config = self._database_config
+        with DatastoreClient(
+            database_config.read_only_dsn or database_config.dsn,
+            statement_timeout=self.charm_config.store_stats.query_timeout,
+        ) as client:
+            stats = StoreStatsCollector(client).collect()
+
+        for name, field in STORE_STATS_GAUGES.items():
+            self._charm_metrics.set_gauges(
+                name,
+                [
+                    (
+                        {"store_id": store.store_id, "store_name": store.name.replace('"', "'")},
+                        count,
+                    )
+                    for store in stats
+                    if (count := getattr(store, field)) is not None
+                ],
+            )
+
+        cached = {"collected-at": time.time(), "stores": [asdict(store) for store in stats]}
+        self._stored.store_stats = cached
+        return cached
+
+    def _on_workload_restarted(self) -> Optional[WarmupResult]:
+        self._charm_metrics.inc(RESTARTS_METRIC)
+        return self._warm_up_check_cache()
+
+    def _warm_up_check_cache(self) -> Optional[WarmupResult]:
+        restart = self.charm_config.restart
+        if not (path := restart.warmup_sample_path) or not self.secrets.is_ready:
+            return None
+
+        try:
+            with self._container.pull(path) as f:
+                samples = list(read_sample(f))
+        except PathError:
+            logger.warning("Warm-up sample %s not found, skipping the warm-up", path)
+            return None
+
+        self.unit.status = MaintenanceStatus("Warming up the check cache")
+        timeout = restart.warmup_timeout
+        start = time.monotonic()
+        with self._http_client() as client:
+            warmer = CheckCacheWarmer(
+                client, MetricsClient(f"http://127.0.0.1:{OPENFGA_METRICS_HTTP_PORT}")
+            )
+            if not client.wait_until_healthy(timeout):
+                logger.warning(
+                    "OpenFGA server is not ready after %ss, skipping the warm-up", timeout
+                )
+                return None
+
+            result = warmer.run(samples, timeout - (time.monotonic() - start))
+
+        logger.info(
+            "Warmed up with %s, %d failed and %d skipped checks",
+            result,
+            result.errors,
+            result.skipped,
+        )
+        return result
 
     def _on_schema_upgrade_action(self, event: ActionEvent) -> None:
         if not self.unit.is_leader():
@@ -454,7 +1013,7 @@ class OpenFGAOperatorCharm(CharmBase):
 
         event.log("Start migrating the database")
         try:
-            self._cli.migrate(DatabaseConfig.load(self.database_requirer).dsn, timeout=120)
+            self._migrate(self._database_config.migration_dsn, timeout=120)
         except MigrationError as err:
             event.fail(f"Database migration failed: {err}")
             self.unit.status = BlockedStatus("Database migration failed")
@@ -468,6 +1027,364 @@ class OpenFGAOperatorCharm(CharmBase):
 
         self._holistic_handler(event)
 
+    def _check_store_action_preconditions(self, event: ActionEvent) -> bool:
+        if not container_connectivity(self):
+            event.fail("Cannot connect to the workload container")
+            return False
+
+        if not self.secrets.is_ready:
+            event.fail("Missing required OpenFGA API token")
+            return False
+
+        if not self._workload_service.is_running:
+            event.fail("OpenFGA server is not running")
+            return False
+
+        return True
+
+    def _resolve_store_id(self, client: HTTPClient, event: ActionEvent) -> str:
+        store_id: str = event.params.get("store-id") or ""
+        if store_id:
+            return store_id
+
+        if not (store_name := event.params.get("store-name")):
+            event.fail("Either store-id or store-name is required")
+            return ""
+
+        if not (store_id := OpenFGAStore(client).get_id(store_name)):
+            event.fail(f"Store {store_name} not found")
+
+        return store_id
+
+    def _on_import_tuples_action(self, event: ActionEvent) -> None:
+        if not self._check_store_action_preconditions(event):
+            return
+
+        if not (source := self._tuples_source(event)):
+            return
+
+        path, open_source, checkpoint = source
+        fmt = event.params.get("format") or ("csv" if path.endswith(".csv") else "ndjson")
+        concurrency = event.params["concurrency"]
+        with self._http_client(pool_size=concurrency) as client:
+            if not (store_id := self._resolve_store_id(client, event)):
+                return
+
+            offset = checkpoint.load(store_id) if event.params["resume"] else 0
+            if offset:
+                event.log(f"Resuming the import after {offset} tuples")
+
+            importer = TupleImporter(
+                client,
+                store_id,
+                batch_size=event.params["batch-size"],
+                concurrency=concurrency,
+            )
+            try:
+                with open_source() as f:
+                    result = importer.run(
+                        read_tuples(f, fmt),
+                        offset=offset,
+                        checkpoint=lambda n: checkpoint.save(store_id, n),
+                    )
+            except PathError:
+                event.fail(f"File {path} not found in the workload container")
+                return
+            except TupleFormatError as e:
+                event.fail(f"Invalid tuple in {path}: {e}")
+                return
+
+        if result.failed:
+            event.fail(
+                f"Failed to write tuples after {result.offset} tuples, "
+                "please check the logs and run the action again to resume"
+            )
+            return
+
+        checkpoint.clear()
+        event.set_results({
+            "store-id": store_id,
+            "imported": result.written,
+            "skipped": offset,
+            "duration": f"{result.duration:.2f}s",
+            "throughput": f"{result.throughput:.1f} tuples/s",
+        })
+
+    def _tuples_source(
+        self, event: ActionEvent
+    ) -> Optional[tuple[str, Callable[[], TextIO], ImportCheckpoint]]:
+        """Return the path of the tuples file to import, its opener and its checkpoint."""
+        if not event.params["from-resource"]:
+            if not (path := event.params.get("path")):
+                event.fail("Either path or from-resource=true is required")
+                return None
+
+            return (
+                path,
+                lambda: self._container.pull(path),
+                ImportCheckpoint(self._container, path),
+            )
+
+        try:
+            resource = self.model.resources.fetch(TUPLES_RESOURCE)
+        except (ModelError, NameError):
+            event.fail(f"No {TUPLES_RESOURCE} resource attached")
+            return None
+
+        # The resource is read from the charm container, and checkpointed in the workload one
+        stat = resource.stat()
+        checkpoint = ImportCheckpoint(
+            self._container,
+            str(BACKUP_DIR / TUPLES_RESOURCE),
+            version=f"{stat.st_size}:{stat.st_mtime}",
+        )
+        return str(resource), resource.open, checkpoint
+
+    def _on_export_tuples_action(self, event: ActionEvent) -> None:
+        if not self._check_store_action_preconditions(event):
+            return
+
+        mode = event.params["mode"]
+        with self._http_client() as client:
+            if not (store_id := self._resolve_store_id(client, event)):
+                return
+
+            timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            path = event.params.get("path") or str(
+                BACKUP_DIR / f"{store_id}-{mode}-{timestamp}.ndjson.gz"
+            )
+            exporter = TupleExporter(client, store_id, page_size=event.params["page-size"])
+            cursor = ChangesCursor(self._container, store_id)
+
+            if mode == "changes":
+                continuation_token = (
+                    event.params["continuation-token"]
+                    if "continuation-token" in event.params
+                    else cursor.load()
+                )
+                records = exporter.changes(continuation_token)
+            else:
+                records = exporter.tuples()
+
+            start = time.monotonic()
+            try:
+                self._container.push(
+                    path, io.BufferedReader(GzipNDJSONStream(records)), make_dirs=True
+                )
+            except TupleExportError as e:
+                event.fail(f"{e}, please check the logs")
+                return
+            duration = time.monotonic() - start
+
+        results = {
+            "store-id": store_id,
+            "path": path,
+            "exported": exporter.count,
+            "duration": f"{duration:.2f}s",
+            "rate": f"{exporter.count / duration if duration else 0:.1f} tuples/s",
+        }
+        if mode == "changes" and exporter.continuation_token:
+            cursor.save(exporter.continuation_token)
+            results["continuation-token"] = exporter.continuation_token
+
+        event.set_results(results)
+
+    def _on_write_authorization_model_action(self, event: ActionEvent) -> None:
+        if not container_connectivity(self):
+            event.fail("Cannot connect to the workload container")
+            return
+
+        path = event.params["path"]
+        try:
+            with self._container.pull(path) as f:
+                model = load_model(f.read())
+        except PathError:
+            event.fail(f"File {path} not found in the workload container")
+            return
+        except AuthorizationModelError as e:
+            event.fail(f"Invalid authorization model in {path}: {e}")
+            return
+
+        thresholds = self.charm_config.model_thresholds
+        analysis = ModelAnalyzer(model).analyze()
+        results = analysis.to_report(thresholds.max_fanout)
+
+        if violations := analysis.violations(thresholds):
+            results["violations"] = "; ".join(violations)
+            if not event.params["force"] and not event.params["dry-run"]:
+                event.set_results(results)
+                event.fail("The authorization model exceeds the configured thresholds")
+                return
+
+        if event.params["dry-run"]:
+            event.set_results(results)
+            return
+
+        if not self._check_store_action_preconditions(event):
+            return
+
+        with self._http_client() as client:
+            if not (store_id := self._resolve_store_id(client, event)):
+                return
+
+            if not (model_id := client.write_authorization_model(store_id, model)):
+                event.fail("Failed to write the authorization model, please check the logs")
+                return
+
+        event.set_results({**results, "store-id": store_id, "authorization-model-id": model_id})
+
+    def _load_test_tuple_keys(self, event: ActionEvent) -> list[dict[str, Any]]:
+        if not (path := event.params.get("path")):
+            tuple_key = {key: event.params.get(key) for key in ("user", "relation", "object")}
+            if not all(tuple_key.values()):
+                event.fail("Either path or user, relation and object are required")
+                return []
+            return [tuple_key]
+
+        fmt = "csv" if path.endswith(".csv") else "ndjson"
+        try:
+            with self._container.pull(path) as f:
+                tuple_keys = list(read_tuples(f, fmt))
+        except PathError:
+            event.fail(f"File {path} not found in the workload container")
+            return []
+        except TupleFormatError as e:
+            event.fail(f"Invalid tuple in {path}: {e}")
+            return []
+
+        if not tuple_keys:
+            event.fail(f"No tuple found in {path}")
+        return tuple_keys
+
+    def _on_load_test_action(self, event: ActionEvent) -> None:
+        if not self._check_store_action_preconditions(event):
+            return
+
+        try:
+            mix = parse_mix(event.params["mix"])
+        except LoadTestError as e:
+            event.fail(str(e))
+            return
+
+        if not (tuple_keys := self._load_test_tuple_keys(event)):
+            return
+
+        concurrency = event.params["concurrency"]
+        with self._http_client(pool_size=concurrency) as client:
+            if not (store_id := self._resolve_store_id(client, event)):
+                return
+
+            event.log(f"Running the load test for {event.params['duration']}s")
+            generator = LoadGenerator(
+                client,
+                store_id,
+                tuple_keys,
+                mix,
+                concurrency=concurrency,
+                batch_size=event.params["batch-size"],
+            )
+            result = generator.run(event.params["duration"])
+
+        event.set_results({"store-id": store_id, **result.to_report()})
+
+    def _on_capture_warmup_sample_action(self, event: ActionEvent) -> None:
+        if not self._check_store_action_preconditions(event):
+            return
+
+        size = event.params["size"]
+        with self._http_client() as client:
+            if event.params.get("store-id") or event.params.get("store-name"):
+                if not (store_id := self._resolve_store_id(client, event)):
+                    return
+                store_ids = [store_id]
+            else:
+                store_ids = [store["id"] for store in client.list_stores()]
+
+            samples: list[WarmupSample] = []
+            try:
+                for store_id in store_ids:
+                    exporter = TupleExporter(client, store_id, page_size=min(size, 100))
+                    samples.extend(
+                        (store_id, {field: record["key"][field] for field in TUPLE_KEY_FIELDS})
+                        for record in islice(exporter.tuples(), size)
+                    )
+            except TupleExportError as e:
+                event.fail(f"{e}, please check the logs")
+                return
+
+        path = event.params["path"]
+        self._container.push(path, dump_sample(samples), make_dirs=True)
+        event.set_results({"path": path, "stores": len(store_ids), "checks": len(samples)})
+
+    def _on_store_stats_action(self, event: ActionEvent) -> None:
+        if not self.unit.is_leader():
+            event.fail("Only the leader unit can run the store-stats action")
+            return
+
+        cached = self._cached_store_stats
+        if event.params["refresh"]:
+            if not self._database_created:
+                event.fail("Missing required database integration")
+                return
+
+            event.log("Collecting the store statistics")
+            try:
+                cached = self._refresh_store_stats()
+            except DatastoreError as e:
+                event.fail(f"Failed to collect the store statistics: {e}")
+                return
+
+        if not cached:
+            event.fail("No store statistics collected yet, run the action with refresh=true")
+            return
+
+        stores = [StoreStats(**store) for store in cached["stores"]]
+        event.set_results({
+            "collected-at": datetime.fromtimestamp(
+                cached["collected-at"], timezone.utc
+            ).isoformat(),
+            "stores": {store.store_id.lower(): store.to_report() for store in stores},
+        })
+
+    def _on_database_maintenance_action(self, event: ActionEvent) -> None:
+        if not self.unit.is_leader():
+            event.fail("Only the leader unit can run the database-maintenance action")
+            return
+
+        if not self._database_created:
+            event.fail("Missing required database integration")
+            return
+
+        tables = OPENFGA_TABLES
+        if event.params.get("tables"):
+            tables = tuple(table.strip() for table in event.params["tables"].split(","))
+            if unknown := set(tables) - set(OPENFGA_TABLES):
+                event.fail(f"Unknown tables: {', '.join(sorted(unknown))}")
+                return
+
+        operation = event.params["operation"]
+        database_config = self._database_config
+        results: dict[str, Any] = {}
+        try:
+            with DatastoreClient(
+                database_config.dsn, lock_timeout=event.params["lock-timeout"]
+            ) as client:
+                for stats in client.table_stats(tables):
+                    results[stats.table.replace("_", "-")] = stats.to_report()
+
+                if operation != "report":
+                    for table in tables:
+                        event.log(f"Running {operation} on {table}")
+                        duration = client.maintain(table, operation)
+                        results.setdefault(table.replace("_", "-"), {})[operation] = (
+                            f"{duration:.2f}s" if duration is not None else "skipped: lock timeout"
+                        )
+        except DatastoreError as e:
+            event.fail(f"Database maintenance failed: {e}")
+            return
+
+        event.set_results(results)
+
 
 if __name__ == "__main__":
     main(OpenFGAOperatorCharm)
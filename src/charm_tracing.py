@@ -0,0 +1,124 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+"""The export of the traces of the charm itself.
+
+This module pulls in the OpenTelemetry SDK, so it is only imported when the tracing
+integration is active.
+"""
+
+import atexit
+import json
+import logging
+import ssl
+import urllib.error
+import urllib.request
+from typing import Any, Optional, Sequence
+
+from opentelemetry import context, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+
+def _value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: Any) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _value(value)} for key, value in (attributes or {}).items()]
+
+
+def _span(span: ReadableSpan) -> dict[str, Any]:
+    encoded = {
+        "traceId": f"{span.context.trace_id:032x}",  # type: ignore[union-attr]
+        "spanId": f"{span.context.span_id:016x}",  # type: ignore[union-attr]
+        "name": span.name,
+        "kind": span.kind.value + 1,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": _attributes(span.attributes),
+        "status": {"code": span.status.status_code.value},
+    }
+    if span.parent:
+        encoded["parentSpanId"] = f"{span.parent.span_id:016x}"
+    return encoded
+
+
+def encode_spans(spans: Sequence[ReadableSpan]) -> bytes:
+    """Encode the spans as an OTLP/JSON export request, grouped by instrumentation scope.
+
+    All the spans of a hook share the resource of the charm unit.
+    """
+    scopes: dict[str, list[dict[str, Any]]] = {}
+    for span in spans:
+        scope = span.instrumentation_scope.name if span.instrumentation_scope else ""
+        scopes.setdefault(scope, []).append(_span(span))
+
+    resource = spans[0].resource.attributes if spans else {}
+    return json.dumps({
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _attributes(resource)},
+                "scopeSpans": [
+                    {"scope": {"name": scope}, "spans": encoded}
+                    for scope, encoded in scopes.items()
+                ],
+            }
+        ]
+    }).encode()
+
+
+class OTLPJSONSpanExporter(SpanExporter):
+    """Export the spans to an OTLP HTTP endpoint, encoded as JSON."""
+
+    def __init__(self, url: str, ca: Optional[str] = None, timeout: float = 2.0) -> None:
+        self._url = url
+        self._ssl_context = ssl.create_default_context(cadata=ca) if ca else None
+        self._timeout = timeout
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        request = urllib.request.Request(
+            self._url,
+            data=encode_spans(spans),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout, context=self._ssl_context):
+                pass
+        except (urllib.error.URLError, OSError) as e:
+            logger.error("Failed to export the charm traces to %s: %s", self._url, e)
+            return SpanExportResult.FAILURE
+
+        return SpanExportResult.SUCCESS
+
+
+def setup_charm_tracing(resource: dict[str, str], hook: str, url: str, ca: Optional[str]) -> None:
+    """Trace the rest of the hook and export the spans at exit.
+
+    The spans of ops and of the charm code started from now on are nested under a span of the
+    hook, ended and exported along with them when the charm exits.
+    """
+    provider = TracerProvider(resource=Resource.create(resource))
+    provider.add_span_processor(BatchSpanProcessor(OTLPJSONSpanExporter(url, ca)))
+    trace.set_tracer_provider(provider)
+
+    span = provider.get_tracer(__name__).start_span(hook)
+    context.attach(trace.set_span_in_context(span))
+
+    def shutdown() -> None:
+        span.end()
+        provider.shutdown()
+
+    atexit.register(shutdown)
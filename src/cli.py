@@ -5,12 +5,14 @@ import logging
 import re
 from typing import Optional
 
+from opentelemetry import trace
 from ops import Container
 from ops.pebble import Error, ExecError
 
 from exceptions import MigrationError
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 VERSION_REGEX = re.compile(r"(?P<version>v\d+\.\d+\.\d+)")
 
@@ -63,12 +65,14 @@ class CommandLine:
         environment: Optional[dict] = None,
     ) -> tuple[str, str]:
         logger.debug(f"Running command: {cmd}")
-        process = self.container.exec(cmd, environment=environment, timeout=timeout)
-        try:
-            stdout, stderr = process.wait_output()
-        except ExecError as err:
-            logger.error("Exited with code: %d. Error: %s", err.exit_code, err.stderr)
-            raise
+        # Only the subcommand is recorded, the arguments may hold credentials
+        with tracer.start_as_current_span(f"exec {' '.join(cmd[:2])}"):
+            process = self.container.exec(cmd, environment=environment, timeout=timeout)
+            try:
+                stdout, stderr = process.wait_output()
+            except ExecError as err:
+                logger.error("Exited with code: %d. Error: %s", err.exit_code, err.stderr)
+                raise
 
         return (
             stdout.decode() if isinstance(stdout, bytes) else stdout,
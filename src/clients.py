@@ -2,22 +2,33 @@
 # See LICENSE file for licensing details.
 
 import logging
+import struct
+import time
 from types import TracebackType
-from typing import Optional, Type
+from typing import Any, Optional, Type
 
 import requests
+from opentelemetry import trace
+from requests.adapters import HTTPAdapter
 from typing_extensions import Self
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 
 class HTTPClient:
-    def __init__(self, base_url: str, auth_token: str) -> None:
+    def __init__(
+        self, base_url: str, auth_token: str, pool_size: int = 10, timeout: float = 10.0
+    ) -> None:
         self._base_url = base_url.rstrip("/")
         self._auth_token = auth_token
+        # Every request is bounded, so that a server accepting without answering cannot hang
+        # the hook or the action
+        self._timeout = timeout
         self._session = requests.Session()
         self._session.headers.update({"Authorization": f"Bearer {auth_token}"})
         self._session.verify = False
+        self._session.mount(self._base_url, HTTPAdapter(pool_maxsize=pool_size))
 
     def __enter__(self) -> Self:
         return self
@@ -30,9 +41,32 @@ class HTTPClient:
     ) -> None:
         self._session.close()
 
+    def is_healthy(self, timeout: float = 5.0) -> bool:
+        try:
+            resp = self._session.get(f"{self._base_url}/healthz", timeout=timeout)
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.debug("OpenFGA server is not healthy: %s", e)
+            return False
+
+        return resp.json().get("status") == "SERVING"
+
+    def wait_until_healthy(self, timeout: float, interval: float = 1.0) -> bool:
+        deadline = time.monotonic() + timeout
+        # Bound every request by the deadline, as the server may accept without answering
+        while not self.is_healthy(timeout=max(deadline - time.monotonic(), 0.1)):
+            if time.monotonic() + interval > deadline:
+                return False
+            time.sleep(interval)
+
+        return True
+
+    @tracer.start_as_current_span("HTTPClient.create_store")
     def create_store(self, store_name: str) -> str:
         try:
-            resp = self._session.post(f"{self._base_url}/stores", json={"name": store_name})
+            resp = self._session.post(
+                f"{self._base_url}/stores", json={"name": store_name}, timeout=self._timeout
+            )
             resp.raise_for_status()
         except requests.exceptions.RequestException as e:
             logger.error("Failed to create OpenFGA store: %s", e)
@@ -40,11 +74,13 @@ class HTTPClient:
 
         return resp.json()["id"]
 
+    @tracer.start_as_current_span("HTTPClient.list_stores")
     def list_stores(self, continuation_token: Optional[str] = None) -> list[dict]:
         try:
             resp = self._session.get(
                 f"{self._base_url}/stores",
                 params={"continuation_token": continuation_token} if continuation_token else {},
+                timeout=self._timeout,
             )
             resp.raise_for_status()
         except requests.exceptions.RequestException as e:
@@ -57,16 +93,268 @@ class HTTPClient:
 
         return stores
 
+    def read_tuples(
+        self, store_id: str, continuation_token: str = "", page_size: int = 100
+    ) -> Optional[dict]:
+        body: dict[str, Any] = {"page_size": page_size}
+        if continuation_token:
+            body["continuation_token"] = continuation_token
+
+        try:
+            resp = self._session.post(
+                f"{self._base_url}/stores/{store_id}/read", json=body, timeout=self._timeout
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to read OpenFGA tuples: %s", e)
+            return None
+
+        return resp.json()
+
+    def read_changes(
+        self, store_id: str, continuation_token: str = "", page_size: int = 100
+    ) -> Optional[dict]:
+        params: dict[str, Any] = {"page_size": page_size}
+        if continuation_token:
+            params["continuation_token"] = continuation_token
+
+        try:
+            resp = self._session.get(
+                f"{self._base_url}/stores/{store_id}/changes", params=params, timeout=self._timeout
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to read OpenFGA changes: %s", e)
+            return None
+
+        return resp.json()
+
+    def write_tuples(self, store_id: str, tuple_keys: list[dict[str, Any]]) -> bool:
+        try:
+            resp = self._session.post(
+                f"{self._base_url}/stores/{store_id}/write",
+                json={"writes": {"tuple_keys": tuple_keys, "on_duplicate": "ignore"}},
+                timeout=self._timeout,
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to write OpenFGA tuples: %s", e)
+            return False
+
+        return True
+
+    @tracer.start_as_current_span("HTTPClient.write_authorization_model")
+    def write_authorization_model(self, store_id: str, model: dict[str, Any]) -> str:
+        try:
+            resp = self._session.post(
+                f"{self._base_url}/stores/{store_id}/authorization-models",
+                json=model,
+                timeout=self._timeout,
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to write OpenFGA authorization model: %s", e)
+            return ""
+
+        return resp.json()["authorization_model_id"]
+
+    # Query failures are counted by their callers, e.g. the load generator, and would flood the
+    # logs at error level
+    def check(self, store_id: str, tuple_key: dict[str, Any]) -> Optional[bool]:
+        try:
+            resp = self._session.post(
+                f"{self._base_url}/stores/{store_id}/check",
+                json={"tuple_key": tuple_key},
+                timeout=self._timeout,
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.debug("Failed to check OpenFGA tuple: %s", e)
+            return None
+
+        return resp.json().get("allowed", False)
+
+    def batch_check(self, store_id: str, tuple_keys: list[dict[str, Any]]) -> Optional[dict]:
+        checks = [
+            {"tuple_key": tuple_key, "correlation_id": str(i)}
+            for i, tuple_key in enumerate(tuple_keys)
+        ]
+        try:
+            resp = self._session.post(
+                f"{self._base_url}/stores/{store_id}/batch-check",
+                json={"checks": checks},
+                timeout=self._timeout,
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.debug("Failed to batch check OpenFGA tuples: %s", e)
+            return None
+
+        return resp.json().get("result", {})
+
+    def list_objects(
+        self, store_id: str, user: str, relation: str, object_type: str
+    ) -> Optional[list[str]]:
+        try:
+            resp = self._session.post(
+                f"{self._base_url}/stores/{store_id}/list-objects",
+                json={"user": user, "relation": relation, "type": object_type},
+                timeout=self._timeout,
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.debug("Failed to list OpenFGA objects: %s", e)
+            return None
+
+        return resp.json().get("objects", [])
+
+
+class MetricsClient:
+    """A client of the Prometheus metrics endpoint of the OpenFGA server."""
+
+    def __init__(self, base_url: str) -> None:
+        self._base_url = base_url.rstrip("/")
+
+    def get_metrics(self) -> dict[str, float]:
+        """Scrape the metrics, summing the samples of each metric over all their labels."""
+        try:
+            resp = requests.get(f"{self._base_url}/metrics", timeout=5)
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to scrape OpenFGA metrics: %s", e)
+            return {}
+
+        metrics: dict[str, float] = {}
+        for line in resp.text.splitlines():
+            if not line or line.startswith("#"):
+                continue
+
+            # Label values may contain spaces, the value follows the closing brace
+            name = line.split("{", 1)[0].split(" ", 1)[0]
+            fields = line.rsplit("}", 1)[-1].split() if "{" in line else line.split()[1:]
+            try:
+                metrics[name] = metrics.get(name, 0.0) + float(fields[0])
+            except (IndexError, ValueError):
+                continue
+
+        return metrics
+
+    def in_flight_requests(self) -> Optional[float]:
+        """The number of gRPC requests being served, HTTP requests included."""
+        if not (metrics := self.get_metrics()):
+            return None
+
+        return metrics.get("grpc_server_started_total", 0.0) - metrics.get(
+            "grpc_server_handled_total", 0.0
+        )
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte, value = value & 0x7F, value >> 7
+        if not value:
+            encoded.append(byte)
+            return bytes(encoded)
+        encoded.append(byte | 0x80)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    """Encode a length-delimited protobuf field."""
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def encode_write_request(samples: list[tuple[dict[str, str], float]], timestamp_ms: int) -> bytes:
+    """Encode the samples as a Prometheus remote write `WriteRequest` protobuf message.
+
+    Each sample makes a time series of one sample, with its labels sorted by name.
+    """
+    request = b""
+    for labels, value in samples:
+        series = b"".join(
+            _field(1, _field(1, name.encode()) + _field(2, label.encode()))
+            for name, label in sorted(labels.items())
+        )
+        # The sample value is a double (field 1) and its timestamp an int64 (field 2)
+        sample = b"\x09" + struct.pack("<d", value) + b"\x10" + _varint(timestamp_ms)
+        request += _field(1, series + _field(2, sample))
+
+    return request
+
+
+def snappy_block(data: bytes) -> bytes:
+    """Frame the data as a snappy block of uncompressed literals.
+
+    The payloads of the charm are a few kilobytes, and leaving them uncompressed spares a
+    compression library while remaining valid snappy.
+    """
+    block = _varint(len(data))
+    for offset in range(0, len(data), 1 << 16):
+        literal = data[offset : offset + (1 << 16)]
+        # A literal tag of 61 is followed by the literal length minus one on two bytes
+        block += bytes([61 << 2]) + struct.pack("<H", len(literal) - 1) + literal
+
+    return block
+
+
+class RemoteWriteClient:
+    """A client of a Prometheus remote write endpoint."""
+
+    def __init__(self, url: str, timeout: float = 2.0) -> None:
+        self._url = url
+        self._timeout = timeout
+
+    @tracer.start_as_current_span("RemoteWriteClient.push")
+    def push(self, samples: list[tuple[dict[str, str], float]]) -> bool:
+        payload = encode_write_request(samples, int(time.time() * 1000))
+        try:
+            resp = requests.post(
+                self._url,
+                data=snappy_block(payload),
+                headers={
+                    "Content-Encoding": "snappy",
+                    "Content-Type": "application/x-protobuf",
+                    "X-Prometheus-Remote-Write-Version": "0.1.0",
+                },
+                timeout=self._timeout,
+            )
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error("Failed to push the charm metrics to %s: %s", self._url, e)
+            return False
+
+        return True
+
 
 class OpenFGAStore:
     def __init__(self, client: HTTPClient) -> None:
         self._client = client
 
-    def create(self, name: str) -> str:
-        stores = self._client.list_stores()
-        for store in stores:
+    def get_id(self, name: str) -> str:
+        for store in self._client.list_stores():
             if store["name"] == name:
-                logger.info("Store %s already exists: returning store id %s", name, store["id"])
                 return store["id"]
 
-        return self._client.create_store(name)
+        return ""
+
+    def create(self, name: str) -> str:
+        return self.create_many([name]).get(name, "")
+
+    @tracer.start_as_current_span("OpenFGAStore.create_many")
+    def create_many(self, names: list[str]) -> dict[str, str]:
+        """Create the missing stores in one pass and return the store ids keyed by name.
+
+        Stores that fail to be created are left out of the returned mapping.
+        """
+        existing = {store["name"]: store["id"] for store in self._client.list_stores()}
+
+        store_ids = {}
+        for name in dict.fromkeys(names):
+            if store_id := existing.get(name):
+                logger.info("Store %s already exists: returning store id %s", name, store_id)
+            elif not (store_id := self._client.create_store(name)):
+                continue
+
+            store_ids[name] = store_id
+
+        return store_ids
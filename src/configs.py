@@ -1,19 +1,378 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import math
+from dataclasses import dataclass
+from typing import Optional
 
 from ops import ConfigData
 
+from authorization_models import ModelThresholds
 from env_vars import EnvVars
 
 
+@dataclass(frozen=True, slots=True)
+class HealthCheckConfig:
+    """The tunables of the Pebble health checks of the workload service."""
+
+    period: int = 5
+    timeout: int = 3
+    threshold: int = 3
+    startup_timeout: int = 60
+    grpc_mode: str = "http"
+
+    @property
+    def pebble_period(self) -> str:
+        return f"{max(self.period, 1)}s"
+
+    @property
+    def pebble_timeout(self) -> str:
+        # Pebble rejects checks timing out after their period
+        period = max(self.period, 1)
+        return f"{self.timeout}s" if 0 < self.timeout < period else f"{period * 0.9:g}s"
+
+    @property
+    def alive_threshold(self) -> int:
+        # Tolerate the liveness check failing while a slow server starts, so that it is not
+        # restarted in a loop. The ready check alone gates the traffic to the unit.
+        return max(self.threshold, math.ceil(self.startup_timeout / max(self.period, 1)))
+
+
+@dataclass(frozen=True, slots=True)
+class TraceSamplingConfig:
+    """The trace sampling policy of the workload service.
+
+    The `ratio` policy samples a ratio of the requests. The `tail` policy samples all the
+    requests, and leaves the decision to the tracing collector, hinted to keep the errors, the
+    requests slower than the threshold and a ratio of the others.
+    """
+
+    policy: str = "ratio"
+    ratio: float = 0.3
+    slow_request_threshold: int = 1000
+
+    @property
+    def head_ratio(self) -> float:
+        return 1.0 if self.policy == "tail" else min(max(self.ratio, 0.0), 1.0)
+
+    def to_env_vars(self) -> EnvVars:
+        env_vars = {"OPENFGA_TRACE_SAMPLE_RATIO": f"{self.head_ratio:g}"}
+        if self.policy == "tail":
+            env_vars["OPENFGA_TRACE_RESOURCE_ATTRIBUTES"] = ",".join([
+                "sampling.policy=tail",
+                f"sampling.ratio={min(max(self.ratio, 0.0), 1.0):g}",
+                f"sampling.latency_threshold_ms={self.slow_request_threshold}",
+            ])
+
+        return env_vars
+
+
+@dataclass(frozen=True, slots=True)
+class MetricsConfig:
+    """The cardinality and the bucket layout of the histograms of the workload service.
+
+    The datastore query count and dispatch count buckets split the requests of the
+    `openfga_request_duration_ms` histogram by their number of datastore queries and dispatches.
+    """
+
+    rpc_histograms: bool = True
+    datastore_query_count_buckets: str = "50,200"
+    dispatch_count_buckets: str = "50,200"
+
+    @staticmethod
+    def _buckets(buckets: str) -> str:
+        bounds = {int(bound) for bound in buckets.split(",") if bound.strip().isdigit()}
+        return ",".join(str(bound) for bound in sorted(bounds) if bound > 0) or "50,200"
+
+    def to_env_vars(self) -> EnvVars:
+        return {
+            "OPENFGA_METRICS_ENABLE_RPC_HISTOGRAMS": str(self.rpc_histograms).lower(),
+            "OPENFGA_REQUEST_DURATION_DATASTORE_QUERY_COUNT_BUCKETS": self._buckets(
+                self.datastore_query_count_buckets
+            ),
+            "OPENFGA_REQUEST_DURATION_DISPATCH_COUNT_BUCKETS": self._buckets(
+                self.dispatch_count_buckets
+            ),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SLOConfig:
+    """The service level objectives of the workload service, templated into its alert rules.
+
+    The latency thresholds are in milliseconds, and are met by `objective` of the requests.
+    """
+
+    objective: float = 0.99
+    check_latency: int = 250
+    batch_check_latency: int = 1000
+    list_objects_latency: int = 1000
+    write_latency: int = 500
+    datastore_query_latency: int = 100
+    check_cache_hit_ratio: float = 0.5
+
+    @property
+    def error_budget(self) -> float:
+        return 1.0 - min(max(self.objective, 0.0), 1.0)
+
+    @property
+    def rpc_latencies(self) -> dict[str, int]:
+        return {
+            "Check": self.check_latency,
+            "BatchCheck": self.batch_check_latency,
+            "ListObjects": self.list_objects_latency,
+            "Write": self.write_latency,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ChangelogRetentionConfig:
+    """The retention period of the changelog entries of the stores, in days.
+
+    The entries are pruned in batches of `batch_size` rows, for at most `timeout` seconds per
+    run. Pruning is disabled when the retention period is 0.
+    """
+
+    days: int = 0
+    batch_size: int = 1000
+    timeout: int = 30
+
+    @property
+    def enabled(self) -> bool:
+        return self.days > 0
+
+    @property
+    def batch_limit(self) -> int:
+        return min(max(self.batch_size, 1), 100000)
+
+
+SSL_MODES = ("disable", "allow", "prefer", "require", "verify-ca", "verify-full")
+
+
+@dataclass(frozen=True, slots=True)
+class DatastoreConnectionConfig:
+    """The query parameters of the datastore URIs and the connection pool of the workload service.
+
+    The statement timeout is in milliseconds, and the other timeouts in seconds. Timeouts of 0
+    are left to the defaults of the driver and the server. The parameters unknown to the driver,
+    `statement_timeout` and `tcp_keepalives_idle`, are set as run-time parameters of the server.
+
+    Behind a transaction pooler (`pooled`), those run-time parameters are left out, as the pooler
+    refuses unknown startup parameters, and the driver does not rely on named prepared statements,
+    as consecutive transactions may run on different server connections. Connections to the pooler
+    are cheap client connections, so all of them are kept idle rather than reopened.
+    """
+
+    statement_timeout: int = 0
+    connect_timeout: int = 10
+    sslmode: str = "prefer"
+    keepalives_idle: int = 0
+    max_open_conns: int = 30
+    max_idle_conns: int = 10
+    pooled: bool = False
+
+    def query_params(self, unit_name: str) -> dict[str, str]:
+        # Attribute the connections of every unit in `pg_stat_activity`
+        params = {
+            "application_name": unit_name.replace("/", "-"),
+            "sslmode": self.sslmode if self.sslmode in SSL_MODES else "prefer",
+        }
+        timeouts = {"connect_timeout": self.connect_timeout}
+        if self.pooled:
+            params["default_query_exec_mode"] = "exec"
+        else:
+            timeouts |= {
+                "statement_timeout": self.statement_timeout,
+                "tcp_keepalives_idle": self.keepalives_idle,
+            }
+        params |= {key: str(value) for key, value in timeouts.items() if value > 0}
+        return params
+
+    def to_env_vars(self) -> EnvVars:
+        max_open_conns = max(self.max_open_conns, 1)
+        max_idle_conns = (
+            max_open_conns if self.pooled else min(max(self.max_idle_conns, 0), max_open_conns)
+        )
+        return {
+            "OPENFGA_DATASTORE_MAX_OPEN_CONNS": str(max_open_conns),
+            "OPENFGA_DATASTORE_MAX_IDLE_CONNS": str(max_idle_conns),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ReplicaLagConfig:
+    """The replication lag of the read-only replica, in seconds, above which reads avoid it.
+
+    Reads move back to the replica once its lag is at most `restore_lag`, so that a lag hovering
+    around `max_lag` does not restart the workload service at every check. Reads always use the
+    replica when `max_lag` is 0.
+    """
+
+    max_lag: float = 30.0
+    restore_lag: float = 10.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_lag > 0
+
+    def secondary_in_use(self, lag: Optional[float], in_use: bool) -> bool:
+        if not self.enabled:
+            return True
+
+        # A replica whose lag cannot be measured is assumed to be lagging
+        if lag is None:
+            return False
+
+        return lag <= (self.max_lag if in_use else min(self.restore_lag, self.max_lag))
+
+
+@dataclass(frozen=True, slots=True)
+class StoreStatsConfig:
+    """The collection of the per-store statistics, every `interval` minutes.
+
+    Every query is cancelled after `query_timeout` seconds. Collection is disabled when the
+    interval is 0.
+    """
+
+    interval: int = 60
+    query_timeout: int = 5
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def due(self, collected_at: float, now: float) -> bool:
+        return now - collected_at >= self.interval * 60
+
+
+@dataclass(frozen=True, slots=True)
+class RestartConfig:
+    """The rollout of the restarts of the workload service.
+
+    At most `max_concurrent` units restart at once. Before a restart, the in-flight requests are
+    drained for up to `drain_grace_period` seconds, and after it, the check cache is warmed up
+    from the sample at `warmup_sample_path` for up to `warmup_timeout` seconds. Draining and
+    warm-up are disabled when the grace period is 0 and the sample path unset.
+    """
+
+    max_concurrent: int = 1
+    drain_grace_period: int = 0
+    warmup_sample_path: str = ""
+    warmup_timeout: int = 60
+
+
 class CharmConfig:
     """A class representing the data source of charm configurations."""
 
     def __init__(self, config: ConfigData) -> None:
         self._config = config
 
+    def _bool(self, key: str) -> bool:
+        return bool(self._config[key])
+
+    def _int(self, key: str) -> int:
+        return int(self._config[key])
+
+    def _float(self, key: str) -> float:
+        return float(self._config[key])
+
+    def _str(self, key: str) -> str:
+        return str(self._config[key])
+
+    @property
+    def model_thresholds(self) -> ModelThresholds:
+        return ModelThresholds(
+            max_depth=self._int("model-max-depth"),
+            max_fanout=self._int("model-max-fanout"),
+            max_conditions=self._int("model-max-conditions"),
+            allow_cycles=self._bool("model-allow-cycles"),
+        )
+
+    @property
+    def health_checks(self) -> HealthCheckConfig:
+        return HealthCheckConfig(
+            period=self._int("health-check-period"),
+            timeout=self._int("health-check-timeout"),
+            threshold=self._int("health-check-threshold"),
+            startup_timeout=self._int("startup-timeout"),
+            grpc_mode=self._str("grpc-health-check"),
+        )
+
+    @property
+    def trace_sampling(self) -> TraceSamplingConfig:
+        return TraceSamplingConfig(
+            policy=self._str("tracing-sampler"),
+            ratio=self._float("tracing-sample-ratio"),
+            slow_request_threshold=self._int("tracing-slow-request-threshold"),
+        )
+
+    @property
+    def metrics(self) -> MetricsConfig:
+        return MetricsConfig(
+            rpc_histograms=self._bool("metrics-rpc-histograms"),
+            datastore_query_count_buckets=self._str("metrics-datastore-query-count-buckets"),
+            dispatch_count_buckets=self._str("metrics-dispatch-count-buckets"),
+        )
+
+    @property
+    def slo(self) -> SLOConfig:
+        return SLOConfig(
+            objective=self._float("slo-latency-objective"),
+            check_latency=self._int("slo-check-latency"),
+            batch_check_latency=self._int("slo-batch-check-latency"),
+            list_objects_latency=self._int("slo-list-objects-latency"),
+            write_latency=self._int("slo-write-latency"),
+            datastore_query_latency=self._int("slo-datastore-query-latency"),
+            check_cache_hit_ratio=self._float("slo-check-cache-hit-ratio"),
+        )
+
+    @property
+    def changelog_retention(self) -> ChangelogRetentionConfig:
+        return ChangelogRetentionConfig(
+            days=self._int("changelog-retention-days"),
+            batch_size=self._int("changelog-prune-batch-size"),
+            timeout=self._int("changelog-prune-timeout"),
+        )
+
+    @property
+    def datastore_connection(self) -> DatastoreConnectionConfig:
+        return DatastoreConnectionConfig(
+            statement_timeout=self._int("datastore-statement-timeout"),
+            connect_timeout=self._int("datastore-connect-timeout"),
+            sslmode=self._str("datastore-sslmode"),
+            keepalives_idle=self._int("datastore-keepalives-idle"),
+            max_open_conns=self._int("datastore-max-open-conns"),
+            max_idle_conns=self._int("datastore-max-idle-conns"),
+        )
+
+    @property
+    def replica_lag(self) -> ReplicaLagConfig:
+        return ReplicaLagConfig(
+            max_lag=self._float("replica-max-lag"),
+            restore_lag=self._float("replica-restore-lag"),
+        )
+
+    @property
+    def store_stats(self) -> StoreStatsConfig:
+        return StoreStatsConfig(
+            interval=self._int("store-stats-interval"),
+            query_timeout=max(self._int("store-stats-query-timeout"), 1),
+        )
+
+    @property
+    def restart(self) -> RestartConfig:
+        return RestartConfig(
+            max_concurrent=self._int("max-concurrent-restarts"),
+            drain_grace_period=self._int("drain-grace-period"),
+            warmup_sample_path=self._str("warmup-sample-path"),
+            warmup_timeout=self._int("warmup-timeout"),
+        )
+
     def to_env_vars(self) -> EnvVars:
         return {
-            "OPENFGA_LOG_LEVEL": self._config["log-level"],
+            "OPENFGA_LOG_LEVEL": self._str("log-level"),
+            "OPENFGA_CHECK_QUERY_CACHE_ENABLED": str(
+                self._bool("check-query-cache-enabled")
+            ).lower(),
+            **self.metrics.to_env_vars(),
         }
@@ -12,19 +12,27 @@ WORKLOAD_SERVICE = "openfga"
 PRESHARED_TOKEN_SECRET_KEY = "token"
 PRESHARED_TOKEN_SECRET_LABEL = "token"
 SECRET_ID_KEY = "secret-id"
+CHANGELOG_PRUNE_CURSOR_KEY = "changelog-prune-cursor"
+SECONDARY_DATASTORE_KEY = "secondary-datastore"
+PROVIDER_DATA_KEY = "openfga-provider-data"
 
 # Application constants
 OPENFGA_SERVER_HTTP_PORT = 8080
 OPENFGA_METRICS_HTTP_PORT = 2112
 OPENFGA_SERVER_GRPC_PORT = 8081
+OPENFGA_GRPC_SERVICE = "openfga.v1.OpenFGAService"
+OPENFGA_MAX_TUPLES_PER_WRITE = 100
 CA_BUNDLE_FILE = Path("/etc/ssl/certs/ca-certificates.crt")
 PRIVATE_KEY_DIR = Path("/etc/ssl/private")
 LOCAL_CA_CERTS_DIR = Path("/usr/local/share/ca-certificates")
 SERVER_KEY = PRIVATE_KEY_DIR / "server.key"
 SERVER_CERT = LOCAL_CA_CERTS_DIR / "server.crt"
+BACKUP_DIR = Path("/var/lib/openfga/backups")
+TUPLES_RESOURCE = "tuples"
 
 # Integration constants
 DATABASE_INTEGRATION_NAME = "database"
+DATABASE_POOLER_INTEGRATION_NAME = "database-pooler"
 HTTP_INGRESS_INTEGRATION_NAME = "http-ingress"
 GRPC_INGRESS_INTEGRATION_NAME = "grpc-ingress"
 GRAFANA_INTEGRATION_NAME = "grafana-dashboard"
@@ -33,4 +41,7 @@ METRIC_INTEGRATION_NAME = "metrics-endpoint"
 OPENFGA_INTEGRATION_NAME = "openfga"
 CERTIFICATES_INTEGRATION_NAME = "certificates"
 CERTIFICATES_TRANSFER_INTEGRATION_NAME = "send-ca-cert"
+RECEIVE_CA_CERT_INTEGRATION_NAME = "receive-ca-cert"
 PEER_INTEGRATION_NAME = "peer"
+TRACING_INTEGRATION_NAME = "tracing"
+REMOTE_WRITE_INTEGRATION_NAME = "send-remote-write"
@@ -0,0 +1,74 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+from pathlib import Path
+from typing import Any
+
+from configs import MetricsConfig
+
+DASHBOARDS_DIR = Path(__file__).parent / "grafana_dashboards"
+RENDERED_DASHBOARDS_DIR = "rendered_dashboards"
+
+RPC_HISTOGRAM_METRIC = "grpc_server_handling_seconds"
+# The quantiles of the latency panels plotted from the request duration histogram, which the
+# server always exports, when the per-RPC histograms are disabled
+REQUEST_DURATION_QUANTILES = {
+    "Response Latency (P90)": 0.9,
+    "Response Latency (P95)": 0.95,
+}
+REQUEST_DURATION_EXPR = (
+    "histogram_quantile({quantile}, sum by(le, grpc_service, grpc_method) "
+    "(rate(openfga_request_duration_ms_bucket{{{selector}}}[5m])))"
+)
+SELECTOR = (
+    'juju_application=~"$juju_application",juju_charm="openfga-k8s",juju_model=~"$juju_model",'
+    'juju_model_uuid=~"$juju_model_uuid",juju_unit=~"$juju_unit"'
+)
+
+Panel = dict[str, Any]
+
+
+def _plots_rpc_histograms(panel: Panel) -> bool:
+    return any(
+        RPC_HISTOGRAM_METRIC in target.get("expr", "") for target in panel.get("targets", [])
+    )
+
+
+def _without_rpc_histograms(panels: list[Panel]) -> list[Panel]:
+    """Plot the latency panels from the request duration histogram, and drop the others."""
+    adapted = []
+    for panel in panels:
+        if not _plots_rpc_histograms(panel):
+            adapted.append(panel)
+        elif quantile := REQUEST_DURATION_QUANTILES.get(panel["title"]):
+            panel["fieldConfig"]["defaults"]["unit"] = "ms"
+            panel["targets"] = [
+                {
+                    **panel["targets"][0],
+                    "expr": REQUEST_DURATION_EXPR.format(quantile=quantile, selector=SELECTOR),
+                }
+            ]
+            adapted.append(panel)
+
+    return adapted
+
+
+def render_dashboards(directory: Path, metrics: MetricsConfig) -> Path:
+    """Render the Grafana dashboards of the charm into a directory, for the enabled metrics.
+
+    Files are only rewritten when their content changes.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for template in DASHBOARDS_DIR.glob("*.json.tmpl"):
+        content = template.read_text()
+        if not metrics.rpc_histograms:
+            dashboard = json.loads(content)
+            dashboard["panels"] = _without_rpc_histograms(dashboard["panels"])
+            content = json.dumps(dashboard, indent=2) + "\n"
+
+        path = directory / template.name
+        if not path.exists() or path.read_text() != content:
+            path.write_text(content)
+
+    return directory
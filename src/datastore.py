@@ -0,0 +1,376 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from opentelemetry import trace
+
+from exceptions import DatastoreError
+
+if TYPE_CHECKING:
+    import psycopg
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+# The query parameters of the datastore URIs known to libpq. The others are run-time parameters
+# of the server for the workload service, and the timeouts of the charm connections are its own.
+LIBPQ_PARAMS = ("sslmode",)
+OPENFGA_TABLES = ("tuple", "changelog", "authorization_model", "store", "assertion")
+MAINTENANCE_STATEMENTS = {
+    "analyze": "ANALYZE {}",
+    "vacuum": "VACUUM {}",
+    "vacuum-analyze": "VACUUM (ANALYZE) {}",
+}
+
+TABLE_STATS_QUERY = """
+SELECT relname,
+       pg_total_relation_size(relid),
+       pg_relation_size(relid),
+       pg_indexes_size(relid),
+       n_live_tup,
+       n_dead_tup,
+       greatest(last_vacuum, last_autovacuum),
+       greatest(last_analyze, last_autoanalyze)
+FROM pg_stat_user_tables
+WHERE relname = ANY(%s)
+ORDER BY pg_total_relation_size(relid) DESC
+"""
+STORE_IDS_QUERY = "SELECT id FROM store WHERE id >= %s ORDER BY id"
+# The changelog entries are keyed by (store, ulid, object_type), and the ULIDs sort by time
+PRUNE_CHANGELOG_QUERY = """
+DELETE FROM changelog
+WHERE (store, ulid, object_type) IN (
+    SELECT store, ulid, object_type
+    FROM changelog
+    WHERE store = %s AND ulid < %s
+    ORDER BY ulid
+    LIMIT %s
+)
+"""
+STORES_QUERY = "SELECT id, name FROM store WHERE deleted_at IS NULL ORDER BY id"
+STORE_TUPLES_QUERY = "SELECT count(*) FROM tuple WHERE store = %s"
+STORE_CHANGELOG_GROWTH_QUERY = "SELECT count(*) FROM changelog WHERE store = %s AND ulid >= %s"
+# Older servers store an authorization model as one row per type definition
+STORE_AUTHORIZATION_MODELS_QUERY = (
+    "SELECT count(DISTINCT authorization_model_id) FROM authorization_model WHERE store = %s"
+)
+# The replay delay of a replica, 0 when it replayed all the WAL it received, e.g. on an idle
+# primary, rather than the age of the last replayed transaction
+REPLICATION_LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TiB"
+
+
+def libpq_dsn(dsn: str) -> str:
+    url = urlsplit(dsn)
+    params = [(key, value) for key, value in parse_qsl(url.query) if key in LIBPQ_PARAMS]
+    return urlunsplit(url._replace(query=urlencode(params)))
+
+
+def ulid_floor(moment: datetime) -> str:
+    """Return the smallest ULID of a moment, sorting before the ULIDs of all later moments."""
+    timestamp = (moment - EPOCH) // timedelta(milliseconds=1)
+    chars = []
+    for _ in range(10):
+        timestamp, index = divmod(timestamp, 32)
+        chars.append(CROCKFORD_BASE32[index])
+    return "".join(reversed(chars)) + "0" * 16
+
+
+@dataclass(frozen=True, slots=True)
+class TableStats:
+    """The size and the dead tuples of a table, from the statistics of PostgreSQL.
+
+    The bloat is estimated as the ratio of dead tuples, which VACUUM makes reusable.
+    """
+
+    table: str
+    total_size: int
+    table_size: int
+    index_size: int
+    live_tuples: int
+    dead_tuples: int
+    last_vacuum: Optional[datetime] = None
+    last_analyze: Optional[datetime] = None
+
+    @property
+    def bloat_ratio(self) -> float:
+        tuples = self.live_tuples + self.dead_tuples
+        return self.dead_tuples / tuples if tuples else 0.0
+
+    def to_report(self) -> dict[str, Any]:
+        return {
+            "total-size": format_bytes(self.total_size),
+            "table-size": format_bytes(self.table_size),
+            "index-size": format_bytes(self.index_size),
+            "live-tuples": self.live_tuples,
+            "dead-tuples": self.dead_tuples,
+            "bloat": f"{self.bloat_ratio:.1%}",
+            "last-vacuum": self.last_vacuum.isoformat() if self.last_vacuum else "never",
+            "last-analyze": self.last_analyze.isoformat() if self.last_analyze else "never",
+        }
+
+
+class DatastoreClient:
+    """A connection to the OpenFGA datastore, for maintenance out of the request path.
+
+    Statements wait at most `lock_timeout` seconds for their locks, so that they never queue
+    the serving traffic behind them, and run at most `statement_timeout` seconds when set.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        lock_timeout: float = 5.0,
+        statement_timeout: float = 0.0,
+        connect_timeout: int = 10,
+    ) -> None:
+        self._dsn = libpq_dsn(dsn)
+        self._lock_timeout = lock_timeout
+        self._statement_timeout = statement_timeout
+        self._connect_timeout = connect_timeout
+        self._conn: Optional["psycopg.Connection"] = None
+
+    def __enter__(self) -> "DatastoreClient":
+        import psycopg
+
+        options = (
+            f"-c lock_timeout={int(self._lock_timeout * 1000)} "
+            f"-c statement_timeout={int(self._statement_timeout * 1000)}"
+        )
+        try:
+            # VACUUM cannot run in a transaction block
+            self._conn = psycopg.connect(
+                self._dsn,
+                autocommit=True,
+                connect_timeout=self._connect_timeout,
+                options=options,
+                application_name="openfga-charm",
+            )
+        except psycopg.Error as e:
+            raise DatastoreError(f"Failed to connect to the datastore: {e}") from e
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def connection(self) -> "psycopg.Connection":
+        if not self._conn:
+            raise DatastoreError("Not connected to the datastore")
+        return self._conn
+
+    def query(self, query: Any, params: Optional[Sequence[Any]] = None) -> list[tuple]:
+        import psycopg
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall() if cursor.description else []
+        except psycopg.Error as e:
+            raise DatastoreError(f"Failed to query the datastore: {e}") from e
+
+    def execute(self, query: Any, params: Optional[Sequence[Any]] = None) -> int:
+        """Execute a statement in its own transaction, and return the number of affected rows."""
+        import psycopg
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.rowcount
+        except psycopg.Error as e:
+            raise DatastoreError(f"Failed to query the datastore: {e}") from e
+
+    def count(self, query: Any, params: Optional[Sequence[Any]] = None) -> Optional[int]:
+        """Run a counting query, returning None when it hits the statement timeout."""
+        import psycopg
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                if not (row := cursor.fetchone()):
+                    raise DatastoreError(f"Count query returned no row: {query}")
+                return int(row[0])
+        except psycopg.errors.QueryCanceled:
+            logger.warning("Count query timed out: %s", query)
+            return None
+        except psycopg.Error as e:
+            raise DatastoreError(f"Failed to query the datastore: {e}") from e
+
+    @tracer.start_as_current_span("DatastoreClient.replication_lag")
+    def replication_lag(self) -> float:
+        """Return the replication lag in seconds, when connected to a replica."""
+        return float(self.query(REPLICATION_LAG_QUERY)[0][0])
+
+    def stores(self) -> list[tuple[str, str]]:
+        return [(store_id, name) for store_id, name in self.query(STORES_QUERY)]
+
+    def store_ids(self, start: str = "") -> list[str]:
+        return [row[0] for row in self.query(STORE_IDS_QUERY, [start])]
+
+    def prune_changelog(self, store_id: str, before: str, limit: int) -> int:
+        """Delete up to `limit` of the oldest changelog entries of a store before a ULID."""
+        return self.execute(PRUNE_CHANGELOG_QUERY, [store_id, before, limit])
+
+    @tracer.start_as_current_span("DatastoreClient.table_stats")
+    def table_stats(self, tables: Iterable[str] = OPENFGA_TABLES) -> list[TableStats]:
+        return [TableStats(*row) for row in self.query(TABLE_STATS_QUERY, [list(tables)])]
+
+    def maintain(self, table: str, operation: str) -> Optional[float]:
+        """Run an `analyze`, `vacuum` or `vacuum-analyze` operation on a table.
+
+        Return the duration of the operation, or None when the lock of the table could not be
+        acquired within the lock timeout.
+        """
+        import psycopg
+        from psycopg import sql
+
+        statement = sql.SQL(MAINTENANCE_STATEMENTS[operation]).format(sql.Identifier(table))
+        start = time.monotonic()
+        with tracer.start_as_current_span(f"maintain {table}"):
+            try:
+                self.connection.execute(statement)
+            except psycopg.errors.LockNotAvailable:
+                logger.warning("Skipped %s on %s: lock timeout", operation, table)
+                return None
+            except psycopg.Error as e:
+                raise DatastoreError(f"Failed to {operation} {table}: {e}") from e
+
+        return time.monotonic() - start
+
+
+@dataclass(frozen=True, slots=True)
+class PruneResult:
+    deleted: int
+    duration: float
+    cursor: str = ""
+
+    def __str__(self) -> str:
+        progress = f", resuming from store {self.cursor}" if self.cursor else ""
+        return f"{self.deleted} changelog entries deleted in {self.duration:.1f}s{progress}"
+
+
+class ChangelogPruner:
+    """Delete the changelog entries older than a retention period, store by store.
+
+    Entries are deleted in batches committed on their own, so that an interrupted run only
+    loses its current batch. A run stops between batches once its time budget is spent, and
+    returns the store to resume from, in store id order, as its cursor.
+    """
+
+    def __init__(self, client: DatastoreClient, retention_days: int, batch_size: int) -> None:
+        self._client = client
+        self._retention = timedelta(days=retention_days)
+        self._batch_size = batch_size
+
+    @tracer.start_as_current_span("ChangelogPruner.run")
+    def run(self, cursor: str = "", timeout: float = 30) -> PruneResult:
+        start = time.monotonic()
+        deadline = start + timeout
+        before = ulid_floor(datetime.now(timezone.utc) - self._retention)
+
+        deleted = 0
+        for store_id in self._client.store_ids(start=cursor):
+            while True:
+                if time.monotonic() >= deadline:
+                    return PruneResult(deleted, time.monotonic() - start, cursor=store_id)
+
+                rows = self._client.prune_changelog(store_id, before, self._batch_size)
+                deleted += rows
+                if rows < self._batch_size:
+                    break
+
+        return PruneResult(deleted, time.monotonic() - start)
+
+
+@dataclass(frozen=True, slots=True)
+class StoreStats:
+    """The size of a store, each count being None when its query timed out.
+
+    The changelog growth is the number of changelog entries written over the last hour.
+    """
+
+    store_id: str
+    name: str
+    tuples: Optional[int] = None
+    changelog_growth: Optional[int] = None
+    authorization_models: Optional[int] = None
+
+    def to_report(self) -> dict[str, Any]:
+        counts = {
+            "tuples": self.tuples,
+            "changelog-growth": self.changelog_growth,
+            "authorization-models": self.authorization_models,
+        }
+        return {
+            "name": self.name,
+            **{key: count if count is not None else "timed out" for key, count in counts.items()},
+        }
+
+
+class StoreStatsCollector:
+    """Count the tuples, the recent changelog entries and the authorization models per store.
+
+    Every count is bounded by the statement timeout of the client, so that the collection never
+    holds a connection for long, and the stores left once the time budget is spent are skipped.
+    """
+
+    def __init__(self, client: DatastoreClient) -> None:
+        self._client = client
+
+    @tracer.start_as_current_span("StoreStatsCollector.collect")
+    def collect(self, timeout: float = 30) -> list[StoreStats]:
+        deadline = time.monotonic() + timeout
+        since = ulid_floor(datetime.now(timezone.utc) - timedelta(hours=1))
+
+        stats = []
+        for store_id, name in self._client.stores():
+            if time.monotonic() >= deadline:
+                logger.warning("Store statistics collection timed out at store %s", store_id)
+                break
+
+            stats.append(
+                StoreStats(
+                    store_id,
+                    name,
+                    tuples=self._client.count(STORE_TUPLES_QUERY, [store_id]),
+                    changelog_growth=self._client.count(
+                        STORE_CHANGELOG_GROWTH_QUERY, [store_id, since]
+                    ),
+                    authorization_models=self._client.count(
+                        STORE_AUTHORIZATION_MODELS_QUERY, [store_id]
+                    ),
+                )
+            )
+
+        return stats
@@ -8,7 +8,6 @@ EnvVars: TypeAlias = Mapping[str, Union[str, bool]]
 DEFAULT_CONTAINER_ENV = {
     "OPENFGA_PLAYGROUND_ENABLED": False,
     "OPENFGA_DATASTORE_ENGINE": "postgres",
-    "OPENFGA_METRICS_ENABLE_RPC_HISTOGRAMS": "true",
     "OPENFGA_METRICS_ENABLED": "true",
     "OPENFGA_DATASTORE_METRICS_ENABLED": "true",
     "OPENFGA_HTTP_TLS_ENABLED": "false",
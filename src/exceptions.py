@@ -12,3 +12,23 @@ class PebbleServiceError(CharmError):
 
 class MigrationError(CharmError):
     """Error for migration plan."""
+
+
+class TupleFormatError(CharmError):
+    """Error for malformed relationship tuples."""
+
+
+class TupleExportError(CharmError):
+    """Error for reading relationship tuples to export."""
+
+
+class AuthorizationModelError(CharmError):
+    """Error for invalid authorization models."""
+
+
+class LoadTestError(CharmError):
+    """Error for invalid load test parameters."""
+
+
+class DatastoreError(CharmError):
+    """Error for queries to the datastore."""
@@ -3,27 +3,18 @@
 
 import json
 import logging
+import time
 from contextlib import suppress
-from dataclasses import dataclass
-from typing import Any, KeysView, Optional, Type, TypeAlias, Union
-from urllib.parse import urlparse
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, KeysView, Optional, Type, TypeAlias, Union
+from urllib.parse import urlencode, urlparse
 
-from charms.certificate_transfer_interface.v0.certificate_transfer import (
-    CertificateTransferProvides,
-)
-from charms.data_platform_libs.v0.data_interfaces import DatabaseRequires
-from charms.tempo_coordinator_k8s.v0.tracing import TracingEndpointRequirer
-from charms.tls_certificates_interface.v4.tls_certificates import (
-    CertificateRequestAttributes,
-    Mode,
-    ProviderCertificate,
-    TLSCertificatesRequiresV4,
-)
-from charms.traefik_k8s.v2.ingress import IngressPerAppRequirer
-from ops import CharmBase, Model
+from opentelemetry import trace
+from ops import CharmBase, Model, Relation
 from ops.pebble import PathError
 from typing_extensions import Self
 
+from configs import TraceSamplingConfig
 from constants import (
     CA_BUNDLE_FILE,
     CERTIFICATES_INTEGRATION_NAME,
@@ -34,12 +25,28 @@ from constants import (
     OPENFGA_SERVER_HTTP_PORT,
     PEER_INTEGRATION_NAME,
     POSTGRESQL_DSN_TEMPLATE,
+    RECEIVE_CA_CERT_INTEGRATION_NAME,
     SERVER_CERT,
     SERVER_KEY,
 )
 from env_vars import EnvVars
+from utils import integration_active
+
+if TYPE_CHECKING:
+    from charms.certificate_transfer_interface.v0.certificate_transfer import (
+        CertificateTransferProvides,
+    )
+    from charms.data_platform_libs.v0.data_interfaces import DatabaseRequires
+    from charms.tempo_coordinator_k8s.v0.tracing import TracingEndpointRequirer
+    from charms.tls_certificates_interface.v4.tls_certificates import (
+        CertificateRequestAttributes,
+        ProviderCertificate,
+        TLSCertificatesRequiresV4,
+    )
+    from charms.traefik_k8s.v2.ingress import IngressPerAppRequirer
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 JsonSerializable: TypeAlias = Union[dict[str, Any], list[Any], int, str, float, bool, Type[None]]
 
@@ -76,6 +83,72 @@ class PeerData:
         return peers.data[self._app].keys()
 
 
+class RestartLock:
+    """A lock bounding the number of units restarting their workload service at once.
+
+    Units request the lock with a timestamp in their peer unit databag. The leader grants it
+    to at most `max_concurrent` requesting units, oldest requests first, by listing them in
+    the peer app databag. A unit releases the lock by withdrawing its request.
+    """
+
+    REQUEST_KEY = "restart-requested-at"
+    GRANTS_KEY = "restart-grants"
+
+    def __init__(self, model: Model, peer_data: PeerData, max_concurrent: int = 1) -> None:
+        self._model = model
+        self._unit = model.unit
+        self._peer_data = peer_data
+        self._max_concurrent = max(max_concurrent, 1)
+
+    @property
+    def _peers(self) -> Optional[Relation]:
+        return self._model.get_relation(PEER_INTEGRATION_NAME)
+
+    @property
+    def is_requested(self) -> bool:
+        return bool(self._peers and self.REQUEST_KEY in self._peers.data[self._unit])
+
+    @property
+    def _grants(self) -> list[str]:
+        grants = self._peer_data[self.GRANTS_KEY]
+        return grants if isinstance(grants, list) else []
+
+    @property
+    def is_granted(self) -> bool:
+        return self._unit.name in self._grants
+
+    def request(self) -> None:
+        if not (peers := self._peers) or self.is_requested:
+            return
+
+        peers.data[self._unit][self.REQUEST_KEY] = str(time.time())
+
+    def release(self) -> None:
+        if peers := self._peers:
+            peers.data[self._unit].pop(self.REQUEST_KEY, None)
+
+    def grant(self) -> None:
+        """Update the grants of the lock, which only the leader unit can do."""
+        if not (peers := self._peers) or not self._unit.is_leader():
+            return
+
+        requests = {
+            unit.name: float(requested_at)
+            for unit in peers.units | {self._unit}
+            if (requested_at := peers.data[unit].get(self.REQUEST_KEY))
+        }
+        current_grants = self._grants
+        grants = [unit for unit in current_grants if unit in requests]
+        for unit in sorted(requests, key=requests.__getitem__):
+            if len(grants) >= self._max_concurrent:
+                break
+            if unit not in grants:
+                grants.append(unit)
+
+        if grants != current_grants:
+            self._peer_data[self.GRANTS_KEY] = grants
+
+
 @dataclass(frozen=True, slots=True)
 class DatabaseConfig:
     """The data source from the database integration."""
@@ -86,41 +159,54 @@ class DatabaseConfig:
     username: str = ""
     password: str = ""
     migration_version: str = ""
+    secondary_in_use: bool = True
+    params: dict[str, str] = field(default_factory=dict)
 
-    @property
-    def dsn(self) -> str:
-        return POSTGRESQL_DSN_TEMPLATE.substitute(
+    def _dsn(self, endpoint: str, params: dict[str, str]) -> str:
+        dsn = POSTGRESQL_DSN_TEMPLATE.substitute(
             username=self.username,
             password=self.password,
-            endpoint=self.endpoint,
+            endpoint=endpoint,
             database=self.database,
         )
+        return f"{dsn}?{urlencode(params)}" if params else dsn
+
+    @property
+    def dsn(self) -> str:
+        return self._dsn(self.endpoint, self.params)
 
     @property
     def read_only_dsn(self) -> str:
         if not self.read_only_endpoint:
             return ""
 
-        return POSTGRESQL_DSN_TEMPLATE.substitute(
-            username=self.username,
-            password=self.password,
-            endpoint=self.read_only_endpoint,
-            database=self.database,
-        )
+        return self._dsn(self.read_only_endpoint, self.params)
+
+    @property
+    def migration_dsn(self) -> str:
+        # Migrations may rewrite large tables, beyond the timeout of the serving statements
+        params = {key: value for key, value in self.params.items() if key != "statement_timeout"}
+        return self._dsn(self.endpoint, params)
 
     def to_env_vars(self) -> EnvVars:
         env = {
             "OPENFGA_DATASTORE_URI": self.dsn,
         }
 
-        if self.read_only_dsn:
+        if self.read_only_dsn and self.secondary_in_use:
             env["OPENFGA_DATASTORE_SECONDARY_URI"] = self.read_only_dsn
 
         return env
 
     @classmethod
-    def load(cls, requirer: DatabaseRequires) -> Self:
-        if not (database_integrations := requirer.relations):
+    @tracer.start_as_current_span("DatabaseConfig.load")
+    def load(
+        cls,
+        requirer: Optional["DatabaseRequires"],
+        secondary_in_use: bool = True,
+        params: Optional[dict[str, str]] = None,
+    ) -> Self:
+        if not requirer or not (database_integrations := requirer.relations):
             return cls()
 
         integration_id = database_integrations[0].id
@@ -133,6 +219,8 @@ class DatabaseConfig:
             username=integration_data.get("username", ""),
             password=integration_data.get("password", ""),
             migration_version=f"migration_version_{integration_id}",
+            secondary_in_use=secondary_in_use,
+            params=params or {},
         )
 
 
@@ -147,6 +235,16 @@ class CertificatesIntegration:
     def __init__(self, charm: CharmBase) -> None:
         self._charm = charm
         self._container = charm._container
+        self.csr_attributes: Optional["CertificateRequestAttributes"] = None
+        self.cert_requirer: Optional["TLSCertificatesRequiresV4"] = None
+        if not integration_active(charm, CERTIFICATES_INTEGRATION_NAME):
+            return
+
+        from charms.tls_certificates_interface.v4.tls_certificates import (
+            CertificateRequestAttributes,
+            Mode,
+            TLSCertificatesRequiresV4,
+        )
 
         k8s_svc_host = f"{charm.app.name}.{charm.model.name}.svc.cluster.local"
         self.csr_attributes = CertificateRequestAttributes(
@@ -198,6 +296,9 @@ class CertificatesIntegration:
 
     @property
     def _server_key(self) -> Optional[str]:
+        if not self.cert_requirer:
+            return None
+
         private_key = self.cert_requirer.private_key
         return str(private_key) if private_key else None
 
@@ -210,7 +311,10 @@ class CertificatesIntegration:
         return [str(chain) for chain in self._certs.chain] if self._certs else None
 
     @property
-    def _certs(self) -> Optional[ProviderCertificate]:
+    def _certs(self) -> Optional["ProviderCertificate"]:
+        if not self.cert_requirer or not self.csr_attributes:
+            return None
+
         cert, *_ = self.cert_requirer.get_assigned_certificate(self.csr_attributes)
         return cert
 
@@ -236,6 +340,9 @@ class CertificatesIntegration:
         self._push_certificates()
 
     def _certs_ready(self) -> bool:
+        if not self.cert_requirer or not self.csr_attributes:
+            return False
+
         certs, private_key = self.cert_requirer.get_assigned_certificate(self.csr_attributes)
         return all((certs, private_key))
 
@@ -253,6 +360,14 @@ class CertificatesIntegration:
 class CertificatesTransferIntegration:
     def __init__(self, charm: CharmBase):
         self._charm = charm
+        self._certs_transfer_provider: Optional["CertificateTransferProvides"] = None
+        if not integration_active(charm, CERTIFICATES_TRANSFER_INTEGRATION_NAME):
+            return
+
+        from charms.certificate_transfer_interface.v0.certificate_transfer import (
+            CertificateTransferProvides,
+        )
+
         self._certs_transfer_provider = CertificateTransferProvides(
             charm, relationship_name=CERTIFICATES_TRANSFER_INTEGRATION_NAME
         )
@@ -260,7 +375,7 @@ class CertificatesTransferIntegration:
     def transfer_certificates(
         self, /, data: CertificateData, relation_id: Optional[int] = None
     ) -> None:
-        if not (
+        if not self._certs_transfer_provider or not (
             relations := self._charm.model.relations.get(CERTIFICATES_TRANSFER_INTEGRATION_NAME)
         ):
             return
@@ -283,12 +398,33 @@ class CertificatesTransferIntegration:
             )
 
 
+class ReceiveCACertIntegration:
+    def __init__(self, charm: CharmBase) -> None:
+        self._charm = charm
+
+    @property
+    def ca_certs(self) -> Optional[str]:
+        """The CA certificates received from the units of the provider, as a PEM bundle."""
+        if not (relation := self._charm.model.get_relation(RECEIVE_CA_CERT_INTEGRATION_NAME)):
+            return None
+
+        ca_certs = {ca for unit in relation.units if (ca := relation.data[unit].get("ca"))}
+        return "\n".join(sorted(ca_certs)) or None
+
+
 @dataclass(frozen=True, slots=True)
 class TracingData:
     """The data source from the tracing integration."""
 
     is_ready: bool = False
     grpc_endpoint: str = ""
+    http_endpoint: str = ""
+    sampling: TraceSamplingConfig = TraceSamplingConfig()
+
+    @property
+    def charm_traces_url(self) -> Optional[str]:
+        """The OTLP HTTP url of the traces of the charm itself."""
+        return f"{self.http_endpoint.rstrip('/')}/v1/traces" if self.http_endpoint else None
 
     def to_env_vars(self) -> EnvVars:
         if not self.is_ready:
@@ -297,12 +433,16 @@ class TracingData:
         return {
             "OPENFGA_TRACE_ENABLED": True,
             "OPENFGA_TRACE_OTLP_ENDPOINT": self.grpc_endpoint,
-            "OPENFGA_TRACE_SAMPLE_RATIO": "0.3",
+            **self.sampling.to_env_vars(),
         }
 
     @classmethod
-    def load(cls, requirer: TracingEndpointRequirer) -> "TracingData":
-        if not (is_ready := requirer.is_ready()):
+    def load(
+        cls,
+        requirer: Optional["TracingEndpointRequirer"],
+        sampling: TraceSamplingConfig = TraceSamplingConfig(),
+    ) -> "TracingData":
+        if not requirer or not (is_ready := requirer.is_ready()):
             return cls()
 
         grpc_endpoint = urlparse(requirer.get_endpoint("otlp_grpc"))
@@ -310,6 +450,8 @@ class TracingData:
         return cls(
             is_ready=is_ready,
             grpc_endpoint=grpc_endpoint.geturl().replace(f"{grpc_endpoint.scheme}://", "", 1),  # type: ignore
+            http_endpoint=requirer.get_endpoint("otlp_http") or "",
+            sampling=sampling,
         )
 
 
@@ -317,6 +459,12 @@ class HttpIngressIntegration:
     def __init__(self, charm: CharmBase) -> None:
         self._charm = charm
         self._uri_scheme = charm._certs_integration.uri_scheme
+        self.ingress_requirer: Optional["IngressPerAppRequirer"] = None
+        if not integration_active(charm, HTTP_INGRESS_INTEGRATION_NAME):
+            return
+
+        from charms.traefik_k8s.v2.ingress import IngressPerAppRequirer
+
         self.ingress_requirer = IngressPerAppRequirer(
             self._charm,
             relation_name=HTTP_INGRESS_INTEGRATION_NAME,
@@ -330,12 +478,20 @@ class HttpIngressIntegration:
             f"{self._uri_scheme}://{self._charm.app.name}.{self._charm.model.name}.svc.cluster.local"
             f":{OPENFGA_SERVER_HTTP_PORT}"
         )
-        return self.ingress_requirer.url if self.ingress_requirer.is_ready() else k8s_svc
+        if self.ingress_requirer and self.ingress_requirer.is_ready():
+            return self.ingress_requirer.url or k8s_svc
+        return k8s_svc
 
 
 class GRPCIngressIntegration:
     def __init__(self, charm: CharmBase) -> None:
         self._charm = charm
+        self.ingress_requirer: Optional["IngressPerAppRequirer"] = None
+        if not integration_active(charm, GRPC_INGRESS_INTEGRATION_NAME):
+            return
+
+        from charms.traefik_k8s.v2.ingress import IngressPerAppRequirer
+
         self.ingress_requirer = IngressPerAppRequirer(
             self._charm,
             relation_name=GRPC_INGRESS_INTEGRATION_NAME,
@@ -347,4 +503,6 @@ class GRPCIngressIntegration:
     @property
     def url(self) -> str:
         k8s_svc = f"{self._charm.app.name}.{self._charm.model.name}.svc.cluster.local:{OPENFGA_SERVER_GRPC_PORT}"
-        return self.ingress_requirer.url if self.ingress_requirer.is_ready() else k8s_svc
+        if self.ingress_requirer and self.ingress_requirer.is_ready():
+            return self.ingress_requirer.url or k8s_svc
+        return k8s_svc
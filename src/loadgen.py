@@ -0,0 +1,214 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from clients import HTTPClient
+from exceptions import LoadTestError
+
+TupleKey = dict[str, Any]
+
+OPERATIONS = ("check", "batch-check", "list-objects")
+OPENFGA_MAX_CHECKS_PER_BATCH = 50
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Parse a request mix such as `check=80,batch-check=10,list-objects=10` into weights."""
+    weights = {}
+    for item in filter(None, (item.strip() for item in mix.split(","))):
+        operation, _, weight = item.partition("=")
+        if operation.strip() not in OPERATIONS:
+            raise LoadTestError(f"Unknown operation {operation.strip()}")
+
+        try:
+            weights[operation.strip()] = int(weight)
+        except ValueError as e:
+            raise LoadTestError(f"Invalid weight of {operation.strip()}") from e
+
+    if not weights or any(weight < 0 for weight in weights.values()) or not sum(weights.values()):
+        raise LoadTestError("The request mix needs at least one positive weight")
+
+    return weights
+
+
+@dataclass
+class LatencyHistogram:
+    """Latency counts in buckets growing by 5% from 0.1ms, up to about 80s.
+
+    The percentiles are the upper bounds of their buckets, within 5% of the exact ones, so that a
+    load test keeps a constant memory however many requests it sends.
+    """
+
+    MIN_LATENCY = 0.0001
+    GROWTH = 1.05
+    BUCKETS = 280
+
+    counts: list[int] = field(default_factory=lambda: [0] * LatencyHistogram.BUCKETS)
+    max: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, latency: float) -> None:
+        index = (
+            math.ceil(math.log(latency / self.MIN_LATENCY, self.GROWTH))
+            if latency > self.MIN_LATENCY
+            else 0
+        )
+        self.counts[min(index, self.BUCKETS - 1)] += 1
+        self.max = max(self.max, latency)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [
+            count + other_count for count, other_count in zip(self.counts, other.counts)
+        ]
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """The nearest-rank percentile, as the upper bound of its bucket."""
+        if not (total := self.count):
+            return 0.0
+
+        rank = max(1, round(p / 100 * total))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                break
+
+        return min(self.MIN_LATENCY * self.GROWTH**index, self.max)
+
+
+@dataclass
+class OperationStats:
+    latencies: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latencies.count + self.errors
+
+    def merge(self, other: "OperationStats") -> None:
+        self.latencies.merge(other.latencies)
+        self.errors += other.errors
+
+    def to_report(self, duration: float) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput": f"{self.requests / duration if duration else 0:.1f} req/s",
+            "p50": f"{self.latencies.percentile(50) * 1000:.2f}ms",
+            "p95": f"{self.latencies.percentile(95) * 1000:.2f}ms",
+            "p99": f"{self.latencies.percentile(99) * 1000:.2f}ms",
+        }
+
+
+@dataclass
+class LoadTestResult:
+    duration: float
+    operations: dict[str, OperationStats]
+
+    @property
+    def total(self) -> OperationStats:
+        total = OperationStats()
+        for stats in self.operations.values():
+            total.merge(stats)
+        return total
+
+    def to_report(self) -> dict[str, Any]:
+        report = {
+            "duration": f"{self.duration:.2f}s",
+            **self.total.to_report(self.duration),
+        }
+        for operation, stats in self.operations.items():
+            report[operation] = stats.to_report(self.duration)
+        return report
+
+
+class LoadGenerator:
+    """Drive a mix of Check, BatchCheck and ListObjects requests at a fixed concurrency.
+
+    Every worker thread sends one request at a time, picking the operation by the mix weights
+    and the tuple key round-robin, until the duration elapses. Workers are seeded, so two runs
+    with the same parameters send the same sequence of requests.
+    """
+
+    def __init__(
+        self,
+        client: HTTPClient,
+        store_id: str,
+        tuple_keys: list[TupleKey],
+        mix: dict[str, int],
+        concurrency: int = 8,
+        batch_size: int = 10,
+        seed: int = 0,
+    ) -> None:
+        self._client = client
+        self._store_id = store_id
+        self._tuple_keys = tuple_keys
+        self._operations = [op for op in mix if mix[op] > 0]
+        self._weights = [mix[op] for op in self._operations]
+        self._concurrency = concurrency
+        self._batch_size = min(batch_size, OPENFGA_MAX_CHECKS_PER_BATCH)
+        self._seed = seed
+
+    def _request(self, operation: str, i: int) -> Callable[[], Optional[Any]]:
+        tuple_key = self._tuple_keys[i % len(self._tuple_keys)]
+        if operation == "check":
+            return lambda: self._client.check(self._store_id, tuple_key)
+
+        if operation == "batch-check":
+            batch = [
+                self._tuple_keys[(i + j) % len(self._tuple_keys)] for j in range(self._batch_size)
+            ]
+            return lambda: self._client.batch_check(self._store_id, batch)
+
+        object_type = tuple_key["object"].split(":", 1)[0]
+        return lambda: self._client.list_objects(
+            self._store_id, tuple_key["user"], tuple_key["relation"], object_type
+        )
+
+    def _work(self, worker: int, deadline: float, stats: dict[str, OperationStats]) -> None:
+        rng = random.Random(self._seed + worker)
+        i = worker
+        while time.monotonic() < deadline:
+            operation = rng.choices(self._operations, self._weights)[0]
+            request = self._request(operation, i)
+            i += self._concurrency
+
+            start = time.monotonic()
+            response = request()
+            if response is None:
+                stats[operation].errors += 1
+            else:
+                stats[operation].latencies.observe(time.monotonic() - start)
+
+    def run(self, duration: float) -> LoadTestResult:
+        worker_stats = [
+            {operation: OperationStats() for operation in self._operations}
+            for _ in range(self._concurrency)
+        ]
+
+        start = time.monotonic()
+        workers = [
+            threading.Thread(target=self._work, args=(i, start + duration, worker_stats[i]))
+            for i in range(self._concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - start
+
+        operations = {operation: OperationStats() for operation in self._operations}
+        for stats in worker_stats:
+            for operation, operation_stats in stats.items():
+                operations[operation].merge(operation_stats)
+
+        return LoadTestResult(duration=elapsed, operations=operations)
@@ -0,0 +1,157 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import hashlib
+import json
+import re
+import time
+from typing import Any, Optional
+
+from ops import CharmBase, Object, StoredState
+
+CHANGELOG_PRUNE_DURATION_METRIC = "openfga_charm_changelog_prune_duration_seconds"
+CHANGELOG_PRUNED_METRIC = "openfga_charm_changelog_pruned_total"
+DRAIN_DURATION_METRIC = "openfga_charm_drain_duration_seconds"
+DRAIN_TIMEOUTS_METRIC = "openfga_charm_drain_timeouts_total"
+HOOK_DURATION_METRIC = "openfga_charm_hook_duration_seconds"
+DEFERRALS_METRIC = "openfga_charm_deferrals_total"
+MIGRATION_DURATION_METRIC = "openfga_charm_migration_duration_seconds"
+STORE_PROVISIONING_DURATION_METRIC = "openfga_charm_store_provisioning_duration_seconds"
+REPLICA_LAG_METRIC = "openfga_charm_replica_lag_seconds"
+RESTARTS_METRIC = "openfga_charm_workload_restarts_total"
+STORE_AUTHORIZATION_MODELS_METRIC = "openfga_charm_store_authorization_models"
+STORE_CHANGELOG_GROWTH_METRIC = "openfga_charm_store_changelog_growth"
+STORE_TUPLES_METRIC = "openfga_charm_store_tuples"
+
+DEFAULT_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+HOOK_DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Prometheus looks 5 minutes back for the latest sample of a series
+PUSH_INTERVAL = 300.0
+
+LABEL_REGEX = re.compile(r'(\w+)="([^"]*)"')
+
+Sample = tuple[dict[str, str], float]
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+
+
+def _parse_series(series: str) -> tuple[str, dict[str, str]]:
+    """Split a `name{label="value",...}` series key into its name and labels."""
+    name, _, labels = series.partition("{")
+    return name, dict(LABEL_REGEX.findall(labels))
+
+
+class CharmMetrics(Object):
+    """Metrics about the operations of the charm itself, persisted across hooks.
+
+    The metrics are kept per series, a metric name and its labels, and rendered as samples for
+    the remote write.
+    """
+
+    _stored: Any = StoredState()
+
+    def __init__(self, charm: CharmBase, key: str = "charm-metrics") -> None:
+        super().__init__(charm, key)
+        self._stored.set_default(counters={}, histograms={}, gauges={}, pushed={})
+
+    def inc(self, name: str, value: float = 1.0, labels: Optional[dict[str, str]] = None) -> None:
+        series = name + _format_labels(labels or {})
+        counters = dict(self._stored.counters)
+        counters[series] = counters.get(series, 0.0) + value
+        self._stored.counters = counters
+
+    def set_gauges(self, name: str, samples: list[Sample]) -> None:
+        """Replace all the series of a gauge, dropping the series without a sample."""
+        gauges = {
+            series: value
+            for series, value in self._stored.gauges.items()
+            if _parse_series(series)[0] != name
+        }
+        for labels, value in samples:
+            gauges[name + _format_labels(labels)] = value
+        self._stored.gauges = gauges
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        series = name + _format_labels(labels or {})
+        # Copy the nested buckets too, as stored state only saves plain containers
+        histograms = {
+            key: {**histogram, "buckets": dict(histogram["buckets"])}
+            for key, histogram in self._stored.histograms.items()
+        }
+        histogram: dict[str, Any] = histograms.get(series) or {
+            "buckets": {str(bound): 0 for bound in buckets},
+            "sum": 0.0,
+            "count": 0,
+        }
+
+        bucket_counts = dict(histogram["buckets"])
+        for bound in bucket_counts:
+            if value <= float(bound):
+                bucket_counts[bound] += 1
+
+        histograms[series] = {
+            "buckets": bucket_counts,
+            "sum": histogram["sum"] + value,
+            "count": histogram["count"] + 1,
+        }
+        self._stored.histograms = histograms
+
+    def _digest(self) -> str:
+        # The hook durations change on every hook, so they are left out of the digest
+        histograms = {
+            series: histogram
+            for series, histogram in self._stored.histograms.items()
+            if _parse_series(series)[0] != HOOK_DURATION_METRIC
+        }
+        state = [dict(self._stored.counters), dict(self._stored.gauges), histograms]
+        return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+    def push_due(self, interval: float = PUSH_INTERVAL) -> bool:
+        """Whether a metric changed since the last push, or the last push is `interval` old.
+
+        The hook durations alone do not make a push due, they are sent along with the next one.
+        """
+        pushed = self._stored.pushed
+        return (
+            pushed.get("digest") != self._digest()
+            or time.time() - pushed.get("at", 0.0) >= interval
+        )
+
+    def mark_pushed(self) -> None:
+        self._stored.pushed = {"digest": self._digest(), "at": time.time()}
+
+    def samples(self, labels: dict[str, str]) -> list[Sample]:
+        """Return the samples of all the series, each with its labels including `__name__`."""
+        samples: list[Sample] = []
+        for series, value in sorted(self._stored.counters.items()):
+            name, series_labels = _parse_series(series)
+            samples.append(({**labels, **series_labels, "__name__": name}, value))
+
+        for series, value in sorted(self._stored.gauges.items()):
+            name, series_labels = _parse_series(series)
+            samples.append(({**labels, **series_labels, "__name__": name}, value))
+
+        for series, histogram in sorted(self._stored.histograms.items()):
+            name, series_labels = _parse_series(series)
+            series_labels = {**labels, **series_labels}
+            for bound, count in [*histogram["buckets"].items(), ("+Inf", histogram["count"])]:
+                samples.append((
+                    {**series_labels, "__name__": f"{name}_bucket", "le": bound},
+                    count,
+                ))
+            samples += [
+                ({**series_labels, "__name__": f"{name}_sum"}, histogram["sum"]),
+                ({**series_labels, "__name__": f"{name}_count"}, histogram["count"]),
+            ]
+
+        return samples
@@ -2,14 +2,19 @@
 # See LICENSE file for licensing details.
 
 import logging
+import time
 from collections import ChainMap
+from typing import Callable, Optional
 
+from opentelemetry import trace
 from ops import Container, ModelError, Unit
-from ops.pebble import Layer, LayerDict
+from ops.pebble import CheckStatus, Layer, LayerDict
 
 from cli import CommandLine
+from configs import HealthCheckConfig
 from constants import (
     CA_BUNDLE_FILE,
+    OPENFGA_GRPC_SERVICE,
     OPENFGA_METRICS_HTTP_PORT,
     OPENFGA_SERVER_GRPC_PORT,
     OPENFGA_SERVER_HTTP_PORT,
@@ -20,6 +25,7 @@ from env_vars import DEFAULT_CONTAINER_ENV, EnvVarConvertible
 from exceptions import PebbleServiceError
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 PEBBLE_LAYER_DICT = {
     "summary": "pebble layer",
@@ -33,22 +39,40 @@ PEBBLE_LAYER_DICT = {
         }
     },
     "checks": {
+        # The health endpoint reports the server as serving only when its datastore is ready
         "http-check": {
             "override": "replace",
-            "period": "1m",
+            "level": "ready",
             "http": {"url": f"http://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}/healthz"},
         },
         "grpc-check": {
             "override": "replace",
-            "period": "1m",
             "level": "alive",
-            "exec": {
-                "command": f"grpc_health_probe -addr 127.0.0.1:{OPENFGA_SERVER_GRPC_PORT}",
+            "http": {
+                "url": f"http://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}/healthz"
+                f"?service={OPENFGA_GRPC_SERVICE}",
             },
         },
     },
 }
 
+# Kubernetes keeps routing requests to a unit failing its ready check until its readiness probe,
+# run every 10 seconds, fails and the removal of its endpoint reaches the Service proxies
+DRAIN_ROUTING_DELAY = 15.0
+
+# A ready check failing right away, so that the unit stops receiving traffic while draining
+DRAIN_LAYER_DICT = {
+    "checks": {
+        "http-check": {
+            "override": "replace",
+            "level": "ready",
+            "period": "1s",
+            "threshold": 1,
+            "http": {"url": "http://127.0.0.1:1/"},
+        },
+    },
+}
+
 
 class WorkloadService:
     """Workload service abstraction running in a Juju unit."""
@@ -87,6 +111,15 @@ class WorkloadService:
 
         return workload_service.is_running()
 
+    @property
+    def failing_checks(self) -> list[str]:
+        try:
+            checks = self._container.get_checks()
+        except ModelError:
+            return []
+
+        return sorted(name for name, check in checks.items() if check.status == CheckStatus.DOWN)
+
     def open_ports(self) -> None:
         self._unit.open_port(protocol="tcp", port=OPENFGA_SERVER_HTTP_PORT)
         self._unit.open_port(protocol="tcp", port=OPENFGA_SERVER_GRPC_PORT)
@@ -109,15 +142,74 @@ class PebbleService:
         else:
             self._container.replan()
 
-    def plan(self, layer: Layer) -> None:
+    def _planned_service(self) -> Optional[dict]:
+        service = self._container.get_plan().services.get(WORKLOAD_SERVICE)
+        return service.to_dict() if service else None
+
+    def restart_required(self, layer: Layer) -> bool:
+        """Whether applying the layer would restart the running workload service."""
+        try:
+            if not self._container.get_service(WORKLOAD_SERVICE).is_running():
+                return False
+        except ModelError:
+            return False
+
+        service = layer.services.get(WORKLOAD_SERVICE)
+        return bool(service) and service.to_dict() != self._planned_service()
+
+    def _is_ready_check_down(self) -> bool:
+        checks = self._container.get_checks("http-check")
+        return bool(checks) and checks["http-check"].status == CheckStatus.DOWN
+
+    def drain(
+        self,
+        grace_period: float,
+        in_flight_requests: Callable[[], Optional[float]],
+        interval: float = 0.5,
+        routing_delay: float = DRAIN_ROUTING_DELAY,
+    ) -> tuple[float, bool]:
+        """Fail the ready check, and wait for the in-flight requests to complete.
+
+        The in-flight requests are only counted once the unit is no longer routed new requests,
+        `routing_delay` seconds after the ready check fails. The ready check is restored by the
+        next `plan`. Return the drain duration, and whether the drain completed within the grace
+        period.
+        """
+        start = time.monotonic()
+        self._container.add_layer(WORKLOAD_SERVICE, Layer(DRAIN_LAYER_DICT), combine=True)
+        time.sleep(routing_delay)
+        deadline = time.monotonic() + grace_period
+
+        while True:
+            # Unknown in-flight requests, when the metrics cannot be read, are waited out
+            in_flight = in_flight_requests() if self._is_ready_check_down() else None
+            if in_flight is not None and in_flight <= 0:
+                return time.monotonic() - start, True
+
+            if time.monotonic() + interval > deadline:
+                return time.monotonic() - start, False
+            time.sleep(interval)
+
+    @tracer.start_as_current_span("PebbleService.plan")
+    def plan(self, layer: Layer) -> bool:
+        """Apply the layer, and return whether the workload service has been (re)started."""
+        planned_service = self._planned_service()
         self._container.add_layer(WORKLOAD_SERVICE, layer, combine=True)
 
         try:
+            started = not self._container.get_service(WORKLOAD_SERVICE).is_running()
+            restarted = started or planned_service != self._planned_service()
             self._restart_service()
         except Exception as e:
             raise PebbleServiceError(f"Pebble failed to restart the workload service. Error: {e}")
 
-    def render_pebble_layer(self, *env_var_sources: EnvVarConvertible) -> Layer:
+        return restarted
+
+    def render_pebble_layer(
+        self,
+        *env_var_sources: EnvVarConvertible,
+        health_checks: HealthCheckConfig = HealthCheckConfig(),
+    ) -> Layer:
         updated_env_vars = ChainMap(*(source.to_env_vars() for source in env_var_sources))  # type: ignore
         env_vars = {
             **DEFAULT_CONTAINER_ENV,
@@ -125,14 +217,30 @@ class PebbleService:
         }
         self._layer_dict["services"][WORKLOAD_SERVICE]["environment"] = env_vars
 
-        if env_vars.get("OPENFGA_HTTP_TLS_ENABLED") == "true":
-            self._layer_dict["checks"]["http-check"]["http"]["url"] = (
-                f"https://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}/healthz"
-            )
-
-        if env_vars.get("OPENFGA_GRPC_TLS_ENABLED") == "true":
-            self._layer_dict["checks"]["grpc-check"]["exec"]["command"] = (
-                f"grpc_health_probe -addr 127.0.0.1:{OPENFGA_SERVER_GRPC_PORT} -tls -tls-ca-cert {CA_BUNDLE_FILE}"
-            )
+        http_scheme = "https" if env_vars.get("OPENFGA_HTTP_TLS_ENABLED") == "true" else "http"
+        health_url = f"{http_scheme}://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}/healthz"
+        self._layer_dict["checks"]["http-check"]["http"]["url"] = health_url
+
+        grpc_check = self._layer_dict["checks"]["grpc-check"]
+        grpc_check.pop("exec", None)
+        grpc_check.pop("http", None)
+        if health_checks.grpc_mode == "exec":
+            command = f"grpc_health_probe -addr 127.0.0.1:{OPENFGA_SERVER_GRPC_PORT}"
+            if env_vars.get("OPENFGA_GRPC_TLS_ENABLED") == "true":
+                command += f" -tls -tls-ca-cert {CA_BUNDLE_FILE}"
+            grpc_check["exec"] = {"command": command}
+        else:
+            # The HTTP gateway serves the health of the gRPC server over its own gRPC connection
+            grpc_check["http"] = {"url": f"{health_url}?service={OPENFGA_GRPC_SERVICE}"}
+
+        for name, threshold in (
+            ("http-check", health_checks.threshold),
+            ("grpc-check", health_checks.alive_threshold),
+        ):
+            self._layer_dict["checks"][name].update({
+                "period": health_checks.pebble_period,
+                "timeout": health_checks.pebble_timeout,
+                "threshold": max(threshold, 1),
+            })
 
         return Layer(self._layer_dict)
@@ -0,0 +1,335 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import csv
+import io
+import json
+import logging
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import suppress
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
+
+from ops import Container
+from ops.pebble import PathError
+
+from clients import HTTPClient
+from constants import BACKUP_DIR, OPENFGA_MAX_TUPLES_PER_WRITE
+from exceptions import TupleExportError, TupleFormatError
+
+logger = logging.getLogger(__name__)
+
+TupleKey = dict[str, Any]
+
+TUPLE_KEY_FIELDS = ("user", "relation", "object")
+
+
+def _to_tuple_key(record: dict[str, Any], line: int) -> TupleKey:
+    # Records exported from the Read API wrap the tuple key in a `key` field
+    record = record.get("key", record)
+
+    if missing := [field for field in TUPLE_KEY_FIELDS if not record.get(field)]:
+        raise TupleFormatError(f"Line {line}: missing {', '.join(missing)}")
+
+    tuple_key = {field: record[field] for field in TUPLE_KEY_FIELDS}
+    if condition := record.get("condition"):
+        tuple_key["condition"] = condition
+
+    return tuple_key
+
+
+def _from_csv_row(row: dict[str, str]) -> dict[str, Any]:
+    record: dict[str, Any] = {field: row.get(field) for field in TUPLE_KEY_FIELDS}
+    if condition_name := row.get("condition_name"):
+        context = row.get("condition_context")
+        record["condition"] = {"name": condition_name, "context": json.loads(context or "{}")}
+
+    return record
+
+
+def read_tuples(stream: TextIO, fmt: str = "ndjson") -> Iterator[TupleKey]:
+    """Lazily parse relationship tuples from a NDJSON or CSV stream.
+
+    CSV streams must have a header row with the `user`, `relation` and `object` columns, and
+    optionally the `condition_name` and `condition_context` columns.
+    """
+    if fmt == "csv":
+        for line, row in enumerate(csv.DictReader(stream), start=2):
+            try:
+                yield _to_tuple_key(_from_csv_row(row), line)
+            except json.JSONDecodeError as e:
+                raise TupleFormatError(f"Line {line}: invalid condition context") from e
+        return
+
+    for line, content in enumerate(stream, start=1):
+        if not content.strip():
+            continue
+
+        try:
+            record = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise TupleFormatError(f"Line {line}: invalid JSON") from e
+
+        yield _to_tuple_key(record, line)
+
+
+def batched(iterable: Iterable[TupleKey], size: int) -> Iterator[list[TupleKey]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@dataclass(frozen=True, slots=True)
+class ImportResult:
+    written: int
+    offset: int
+    duration: float
+    failed: bool = False
+
+    @property
+    def throughput(self) -> float:
+        return self.written / self.duration if self.duration else 0.0
+
+
+class ImportCheckpoint:
+    """The import progress persisted next to the source file in the workload container.
+
+    The checkpoint records the size and the modification time of the source file, so that it
+    is ignored once the file is replaced. The version of a source outside the workload container,
+    such as a charm resource, is given instead.
+    """
+
+    def __init__(self, container: Container, source: str, version: Optional[str] = None) -> None:
+        self._container = container
+        self._source = source
+        self._path = f"{source}.checkpoint"
+        self._version = version
+
+    @property
+    def source_version(self) -> str:
+        if self._version is None:
+            try:
+                info = self._container.list_files(self._source)[0]
+            except (PathError, IndexError):
+                return ""
+            self._version = f"{info.size}:{info.last_modified.isoformat()}"
+
+        return self._version
+
+    def load(self, store_id: str) -> int:
+        try:
+            with self._container.pull(self._path) as f:
+                checkpoint = json.load(f)
+        except (PathError, json.JSONDecodeError):
+            return 0
+
+        if checkpoint.get("store_id") != store_id:
+            return 0
+
+        if checkpoint.get("source") != self.source_version:
+            logger.info("Ignoring the checkpoint of %s, the file changed", self._source)
+            return 0
+
+        return checkpoint.get("offset", 0)
+
+    def save(self, store_id: str, offset: int) -> None:
+        self._container.push(
+            self._path,
+            json.dumps({"store_id": store_id, "source": self.source_version, "offset": offset}),
+            make_dirs=True,
+        )
+
+    def clear(self) -> None:
+        with suppress(PathError):
+            self._container.remove_path(self._path)
+
+
+class TupleImporter:
+    """Write relationship tuples in chunks over a bounded pool of concurrent workers.
+
+    At most `concurrency` chunks are held in memory at any time. The offset handed to the
+    checkpoint callback only covers chunks that have been written along with all the chunks
+    before them, so resuming from it never skips a tuple.
+    """
+
+    def __init__(
+        self,
+        client: HTTPClient,
+        store_id: str,
+        batch_size: int = OPENFGA_MAX_TUPLES_PER_WRITE,
+        concurrency: int = 4,
+        checkpoint_interval: float = 5.0,
+    ) -> None:
+        self._client = client
+        self._store_id = store_id
+        self._batch_size = min(batch_size, OPENFGA_MAX_TUPLES_PER_WRITE)
+        self._concurrency = concurrency
+        self._checkpoint_interval = checkpoint_interval
+
+    def run(
+        self,
+        tuple_keys: Iterable[TupleKey],
+        offset: int = 0,
+        checkpoint: Optional[Callable[[int], None]] = None,
+    ) -> ImportResult:
+        start = time.monotonic()
+        self._offset, self._written, self._failed = offset, 0, False
+        self._done: dict[int, int] = {}
+        self._checkpoint = checkpoint
+        self._checkpointed_at = start
+
+        pending: dict[Future, tuple[int, int]] = {}
+        next_offset = offset
+        try:
+            with ThreadPoolExecutor(max_workers=self._concurrency) as executor:
+                try:
+                    for batch in batched(islice(tuple_keys, offset, None), self._batch_size):
+                        if len(pending) >= self._concurrency:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            self._settle(done, pending)
+
+                        if self._failed:
+                            break
+
+                        future = executor.submit(self._client.write_tuples, self._store_id, batch)
+                        pending[future] = (next_offset, len(batch))
+                        next_offset += len(batch)
+                finally:
+                    self._settle(wait(pending).done, pending)
+        finally:
+            self._save_checkpoint(force=True)
+
+        return ImportResult(
+            written=self._written,
+            offset=self._offset,
+            duration=time.monotonic() - start,
+            failed=self._failed,
+        )
+
+    def _settle(self, done: set[Future], pending: dict[Future, tuple[int, int]]) -> None:
+        for future in done:
+            batch_offset, size = pending.pop(future)
+            try:
+                written = future.result()
+            except Exception:
+                # Keep settling the other chunks, so that the checkpoint covers all of them
+                logger.exception("Failed to write %d tuples at offset %d", size, batch_offset)
+                written = False
+
+            if not written:
+                self._failed = True
+                continue
+
+            self._written += size
+            self._done[batch_offset] = size
+
+        while self._offset in self._done:
+            self._offset += self._done.pop(self._offset)
+
+        self._save_checkpoint()
+
+    def _save_checkpoint(self, force: bool = False) -> None:
+        if not self._checkpoint:
+            return
+
+        now = time.monotonic()
+        if force or now - self._checkpointed_at >= self._checkpoint_interval:
+            self._checkpoint(self._offset)
+            self._checkpointed_at = now
+
+
+class GzipNDJSONStream(io.RawIOBase):
+    """A readable stream of gzip compressed NDJSON records, encoded as it is read.
+
+    Only the compressed bytes not yet consumed by the reader are buffered, so the stream can be
+    pushed to the workload container in constant memory however many records there are.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]]) -> None:
+        self._records = iter(records)
+        self._compressor = zlib.compressobj(wbits=31)
+        self._buffer = b""
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while len(self._buffer) < len(buffer) and not self._exhausted:
+            try:
+                record = next(self._records)
+            except StopIteration:
+                self._buffer += self._compressor.flush()
+                self._exhausted = True
+                break
+
+            self._buffer += self._compressor.compress(json.dumps(record).encode() + b"\n")
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class ChangesCursor:
+    """The ReadChanges continuation token of the last export of a store."""
+
+    def __init__(self, container: Container, store_id: str) -> None:
+        self._container = container
+        self._path = BACKUP_DIR / f"{store_id}.changes-token"
+
+    def load(self) -> str:
+        try:
+            with self._container.pull(self._path) as f:
+                return f.read().strip()
+        except PathError:
+            return ""
+
+    def save(self, continuation_token: str) -> None:
+        self._container.push(self._path, continuation_token, make_dirs=True)
+
+
+class TupleExporter:
+    """Page through the tuples or the changes of a store."""
+
+    def __init__(self, client: HTTPClient, store_id: str, page_size: int = 100) -> None:
+        self._client = client
+        self._store_id = store_id
+        self._page_size = page_size
+        self.count = 0
+        self.continuation_token = ""
+
+    def tuples(self) -> Iterator[dict[str, Any]]:
+        continuation_token = ""
+        while True:
+            page = self._client.read_tuples(self._store_id, continuation_token, self._page_size)
+            if page is None:
+                raise TupleExportError(f"Failed to read tuples after {self.count} tuples")
+
+            for record in page.get("tuples", []):
+                self.count += 1
+                yield record
+
+            if not (continuation_token := page.get("continuation_token", "")):
+                return
+
+    def changes(self, continuation_token: str = "") -> Iterator[dict[str, Any]]:
+        self.continuation_token = continuation_token
+        while True:
+            page = self._client.read_changes(
+                self._store_id, self.continuation_token, self._page_size
+            )
+            if page is None:
+                raise TupleExportError(f"Failed to read changes after {self.count} changes")
+
+            if not (changes := page.get("changes")):
+                return
+
+            for record in changes:
+                self.count += 1
+                yield record
+
+            self.continuation_token = page.get("continuation_token") or self.continuation_token
@@ -1,6 +1,7 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import os
 from functools import wraps
 from typing import Any, Callable, Optional, TypeVar
 
@@ -37,5 +38,18 @@ def integration_existence(integration_name: str) -> Condition:
 peer_integration_exists = integration_existence(PEER_INTEGRATION_NAME)
 
 
+def integration_active(charm: CharmBase, integration_name: str) -> bool:
+    """Whether an integration exists, or the dispatched hook is one of its relation events.
+
+    The libraries of inactive integrations are not imported, to keep them off the hot path of
+    unrelated hooks. A relation-broken hook no longer finds its relation in the model, so the
+    dispatched relation is checked as well.
+    """
+    return (
+        integration_existence(integration_name)(charm)
+        or os.environ.get("JUJU_RELATION") == integration_name
+    )
+
+
 def container_connectivity(charm: CharmBase) -> bool:
     return charm.unit.get_container(WORKLOAD_CONTAINER).can_connect()
@@ -0,0 +1,93 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from clients import HTTPClient, MetricsClient
+
+logger = logging.getLogger(__name__)
+
+CHECK_CACHE_HIT_METRIC = "openfga_check_cache_hit_count"
+CHECK_CACHE_TOTAL_METRIC = "openfga_check_cache_total_count"
+
+WarmupSample = tuple[str, dict[str, Any]]
+
+
+def read_sample(stream: TextIO) -> Iterator[WarmupSample]:
+    """Parse a warm-up sample of one `{"store_id": ..., "tuple_key": ...}` Check per line."""
+    for line, content in enumerate(stream, start=1):
+        if not content.strip():
+            continue
+
+        try:
+            record = json.loads(content)
+            yield record["store_id"], record["tuple_key"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Skipping malformed warm-up sample at line %d", line)
+
+
+def dump_sample(samples: Iterable[WarmupSample]) -> str:
+    return "".join(
+        json.dumps({"store_id": store_id, "tuple_key": tuple_key}) + "\n"
+        for store_id, tuple_key in samples
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class WarmupResult:
+    checks: int
+    errors: int
+    skipped: int
+    duration: float
+    hit_ratio: Optional[float] = None
+
+    def __str__(self) -> str:
+        hit_ratio = f"{self.hit_ratio:.0%}" if self.hit_ratio is not None else "n/a"
+        return f"{self.checks} checks in {self.duration:.1f}s, cache hit ratio {hit_ratio}"
+
+
+class CheckCacheWarmer:
+    """Replay a sample of Check requests to fill the caches of a freshly started server.
+
+    The hit ratio is computed from the check cache counters of the server over the replay, and
+    is not available when the check query cache is disabled.
+    """
+
+    def __init__(
+        self, client: HTTPClient, metrics_client: MetricsClient, concurrency: int = 4
+    ) -> None:
+        self._client = client
+        self._metrics_client = metrics_client
+        self._concurrency = concurrency
+
+    def _cache_counters(self) -> tuple[float, float]:
+        metrics = self._metrics_client.get_metrics()
+        return metrics.get(CHECK_CACHE_HIT_METRIC, 0.0), metrics.get(CHECK_CACHE_TOTAL_METRIC, 0.0)
+
+    def run(self, samples: Iterable[WarmupSample], timeout: float) -> WarmupResult:
+        start = time.monotonic()
+        deadline = start + timeout
+        hits_before, total_before = self._cache_counters()
+
+        def replay(sample: WarmupSample) -> Optional[bool]:
+            if time.monotonic() >= deadline:
+                return None
+            return self._client.check(*sample) is not None
+
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor:
+            outcomes = list(executor.map(replay, samples))
+
+        hits_after, total_after = self._cache_counters()
+        lookups = total_after - total_before
+        return WarmupResult(
+            checks=outcomes.count(True),
+            errors=outcomes.count(False),
+            skipped=outcomes.count(None),
+            duration=time.monotonic() - start,
+            hit_ratio=(hits_after - hits_before) / lookups if lookups > 0 else None,
+        )
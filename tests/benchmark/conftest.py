@@ -0,0 +1,155 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import inspect
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import ops
+import pytest
+from ops import testing
+from pytest_mock import MockerFixture
+
+# The public classes of ops through which the charm calls Juju and Pebble
+JUJU_CLASSES = (ops.Model, ops.Application, ops.Unit, ops.Relation, ops.Secret)
+PEBBLE_CLASSES = (ops.Container,)
+SECRET_READS = ("get_secret", "get_content", "peek_content", "get_info")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--hook-budget-json",
+        default="benchmark-results.json",
+        help="The file to write the hook budget results to",
+    )
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request: pytest.FixtureRequest) -> Iterator[list[dict[str, Any]]]:
+    results: list[dict[str, Any]] = []
+    yield results
+
+    Path(request.config.getoption("--hook-budget-json")).write_text(
+        json.dumps({"timestamp": time.time(), "results": results}, indent=2)
+    )
+
+
+@pytest.fixture(autouse=True)
+def mocked_k8s_resource_patch(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "charms.observability_libs.v0.kubernetes_compute_resources_patch.ResourcePatcher",
+        autospec=True,
+    )
+    mocker.patch.multiple(
+        "charms.observability_libs.v0.kubernetes_compute_resources_patch.KubernetesComputeResourcesPatch",
+        _namespace="testing",
+        _patch=lambda *a, **kw: None,
+        is_ready=lambda *a, **kw: True,
+    )
+
+
+@pytest.fixture(autouse=True)
+def mocked_workload(mocker: MockerFixture) -> None:
+    """Stand in for the OpenFGA server, which is not running in the benchmarks."""
+    mocker.patch("charm.WorkloadService.is_running", new=True)
+    mocker.patch("charm.WorkloadService.version", new="1.0.0")
+    mocker.patch("charm.WorkloadService.failing_checks", new=[])
+    mocker.patch("charm.CommandLine.migrate")
+    # Pebble checks do not run in ops.testing, fail the ready check as soon as the drain starts
+    mocker.patch("services.PebbleService._is_ready_check_down", return_value=True)
+    mocker.patch("charm.HTTPClient", autospec=True)
+    metrics_client = mocker.patch("charm.MetricsClient", autospec=True)
+    metrics_client.return_value.in_flight_requests.return_value = 0.0
+    mocker.patch(
+        "charm.OpenFGAStore.create_many",
+        side_effect=lambda names: {name: f"store-{name}" for name in names},
+    )
+
+
+class CallCounter:
+    """Count the calls of the charm to the public Juju and Pebble APIs of ops.
+
+    Calls are counted within the context of the counter only. When ops calls into its own public
+    methods, only the outermost call is counted.
+    """
+
+    def __init__(self) -> None:
+        self.juju: Counter[str] = Counter()
+        self.pebble: Counter[str] = Counter()
+        self._counting = False
+        self._in_call: set[int] = set()
+
+    def __enter__(self) -> "CallCounter":
+        self.juju.clear()
+        self.pebble.clear()
+        self._counting = True
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._counting = False
+
+    @property
+    def secret_reads(self) -> int:
+        return sum(self.juju[name] for name in SECRET_READS)
+
+    def wrap(self, mocker: MockerFixture, cls: type, counter: Counter[str]) -> None:
+        for name, method in vars(cls).items():
+            if not name.startswith("_") and inspect.isfunction(method):
+                mocker.patch.object(cls, name, new=self._counted(method, name, counter))
+
+    def _counted(self, method: Callable, name: str, counter: Counter[str]) -> Callable:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not self._counting or id(counter) in self._in_call:
+                return method(*args, **kwargs)
+
+            counter[name] += 1
+            self._in_call.add(id(counter))
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._in_call.discard(id(counter))
+
+        return wrapper
+
+
+@pytest.fixture
+def call_counter(mocker: MockerFixture) -> CallCounter:
+    counter = CallCounter()
+    for cls in JUJU_CLASSES:
+        counter.wrap(mocker, cls, counter.juju)
+    for cls in PEBBLE_CLASSES:
+        counter.wrap(mocker, cls, counter.pebble)
+    return counter
+
+
+@pytest.fixture
+def peer_integration() -> testing.PeerRelation:
+    return testing.PeerRelation(endpoint="peer", interface="openfga-peer")
+
+
+@pytest.fixture
+def database_integration() -> testing.Relation:
+    return testing.Relation(
+        endpoint="database",
+        interface="postgresql_client",
+        remote_app_name="postgresql-k8s",
+        remote_app_data={
+            "data": '{"database": "openfga", "extra-user-roles": "SUPERUSER"}',
+            "database": "database",
+            "endpoints": "endpoints",
+            "username": "username",
+            "password": "password",
+        },
+    )
+
+
+@pytest.fixture
+def certificates_integration() -> testing.Relation:
+    return testing.Relation(
+        endpoint="certificates",
+        interface="tls-certificates",
+        remote_app_name="self-signed-certificates",
+    )
@@ -0,0 +1,216 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import dataclasses
+import json
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable
+
+import pytest
+from charms.tls_certificates_interface.v4.tls_certificates import (
+    CertificateSigningRequest,
+    generate_ca,
+    generate_certificate,
+    generate_private_key,
+)
+from conftest import CallCounter
+from ops import testing
+
+from charm import OpenFGAOperatorCharm
+from constants import (
+    PRESHARED_TOKEN_SECRET_KEY,
+    PRESHARED_TOKEN_SECRET_LABEL,
+    SECRET_ID_KEY,
+    WORKLOAD_CONTAINER,
+)
+
+RELATION_COUNTS = (1, 50, 500)
+
+
+@dataclass(frozen=True)
+class HookBudget:
+    """The maximum number of calls of a hook to Juju and Pebble, whatever its integrations.
+
+    The wall time of the hooks is reported, but not budgeted, as it depends on the machine.
+    """
+
+    juju: int
+    pebble: int
+    secret_reads: int
+
+
+BUDGETS = {
+    "update-status": HookBudget(
+        juju=65,
+        pebble=20,
+        secret_reads=25,
+    ),
+    "config-changed": HookBudget(
+        juju=55,
+        pebble=20,
+        secret_reads=25,
+    ),
+    "pebble-ready": HookBudget(
+        juju=60,
+        pebble=21,
+        secret_reads=25,
+    ),
+    "database-created": HookBudget(
+        juju=80,
+        pebble=21,
+        secret_reads=29,
+    ),
+    "store-requested": HookBudget(
+        juju=35,
+        pebble=5,
+        secret_reads=12,
+    ),
+    "cert-available": HookBudget(
+        juju=260,
+        pebble=30,
+        secret_reads=216,
+    ),
+}
+
+
+def openfga_integrations(count: int) -> list[testing.Relation]:
+    return [
+        testing.Relation(
+            endpoint="openfga",
+            interface="openfga",
+            remote_app_name=f"openfga-client-{i}",
+            remote_app_data={"store_name": f"store-{i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def event(ctx: testing.Context, name: str, state: testing.State) -> Any:
+    relation = {relation.endpoint: relation for relation in state.relations}
+    events: dict[str, Callable[[], Any]] = {
+        "update-status": ctx.on.update_status,
+        "config-changed": ctx.on.config_changed,
+        "pebble-ready": lambda: ctx.on.pebble_ready(state.get_container(WORKLOAD_CONTAINER)),
+        "database-created": lambda: ctx.on.relation_changed(relation["database"]),
+        "store-requested": lambda: ctx.on.relation_changed(relation["openfga"]),
+        "cert-available": lambda: ctx.on.relation_changed(relation["certificates"]),
+    }
+    return events[name]()
+
+
+def issue_certificate(state: testing.State) -> testing.State:
+    """Sign the certificate signing request of the unit, as the certificates provider does."""
+    relation = next(r for r in state.relations if r.endpoint == "certificates")
+    csr = json.loads(relation.local_unit_data["certificate_signing_requests"])[0]
+    ca_key = generate_private_key()
+    ca = generate_ca(ca_key, timedelta(days=1), "benchmark-ca")
+    certificate = generate_certificate(
+        CertificateSigningRequest.from_string(csr["certificate_signing_request"]),
+        ca,
+        ca_key,
+        timedelta(days=1),
+    )
+
+    issued = dataclasses.replace(
+        relation,
+        remote_app_data={
+            "certificates": json.dumps([
+                {
+                    "ca": str(ca),
+                    "certificate_signing_request": csr["certificate_signing_request"],
+                    "certificate": str(certificate),
+                    "chain": [str(certificate), str(ca)],
+                }
+            ])
+        },
+    )
+    relations = [issued if r is relation else r for r in state.relations]
+    return dataclasses.replace(state, relations=relations)
+
+
+@pytest.fixture
+def steady_state(
+    request: pytest.FixtureRequest,
+    peer_integration: testing.PeerRelation,
+    database_integration: testing.Relation,
+    certificates_integration: testing.Relation,
+) -> testing.State:
+    """The state of a leader unit with a running workload and a pending certificate request.
+
+    The store statistics are freshly collected, as they are between two collections.
+    """
+    peer_integration = testing.PeerRelation(
+        endpoint=peer_integration.endpoint,
+        interface=peer_integration.interface,
+        local_app_data={
+            f"migration_version_{database_integration.id}": json.dumps("1.0.0"),
+        },
+    )
+    secret = testing.Secret(
+        tracked_content={PRESHARED_TOKEN_SECRET_KEY: "token", SECRET_ID_KEY: "secret-id"},
+        label=PRESHARED_TOKEN_SECRET_LABEL,
+        owner="app",
+    )
+    state_in = testing.State(
+        containers={testing.Container(WORKLOAD_CONTAINER, can_connect=True)},
+        relations=[
+            peer_integration,
+            database_integration,
+            certificates_integration,
+            *openfga_integrations(request.param),
+        ],
+        secrets=[secret],
+        stored_states={
+            testing.StoredState(
+                owner_path="OpenFGAOperatorCharm",
+                content={"store_stats": {"collected-at": time.time(), "stores": []}},
+            )
+        },
+        leader=True,
+    )
+
+    ctx = testing.Context(OpenFGAOperatorCharm)
+    state = ctx.run(ctx.on.config_changed(), state_in)
+    # Let the certificates library generate the private key and the certificate signing request
+    return ctx.run(ctx.on.relation_changed(certificates_integration), state)
+
+
+@pytest.mark.parametrize("steady_state", RELATION_COUNTS, indirect=True, ids=lambda n: f"{n}")
+@pytest.mark.parametrize("hook", list(BUDGETS))
+def test_hook_budget(
+    hook: str,
+    steady_state: testing.State,
+    call_counter: CallCounter,
+    benchmark_results: list[dict[str, Any]],
+) -> None:
+    relations = len([r for r in steady_state.relations if r.endpoint == "openfga"])
+    if hook == "cert-available":
+        steady_state = issue_certificate(steady_state)
+    ctx = testing.Context(OpenFGAOperatorCharm)
+
+    with call_counter:
+        start = time.perf_counter()
+        ctx.run(event(ctx, hook, steady_state), steady_state)
+        wall_time = time.perf_counter() - start
+
+    result = {
+        "hook": hook,
+        "relations": relations,
+        "wall_time": round(wall_time, 4),
+        "juju": sum(call_counter.juju.values()),
+        "pebble": sum(call_counter.pebble.values()),
+        "secret_reads": call_counter.secret_reads,
+        "juju_calls": dict(call_counter.juju),
+        "pebble_calls": dict(call_counter.pebble),
+    }
+    benchmark_results.append(result)
+
+    budget = BUDGETS[hook]
+    over_budget = {
+        metric: (result[metric], getattr(budget, metric))
+        for metric in ("juju", "pebble", "secret_reads")
+        if result[metric] > getattr(budget, metric)
+    }
+    assert not over_budget, f"{hook} exceeds its budget (actual, budget): {over_budget}"
@@ -48,6 +48,12 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=False,
         help='Skip tests marked with "teardown".',
     )
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help='Run the tests marked with "benchmark".',
+    )
 
 
 def pytest_configure(config: pytest.Config) -> None:
@@ -56,17 +62,21 @@ def pytest_configure(config: pytest.Config) -> None:
         "markers", "teardown: tests that tear down some parts of the environment."
     )
     config.addinivalue_line("markers", "upgrade:  charm upgrade related test cases.")
+    config.addinivalue_line("markers", "benchmark: throughput benchmarks of the workload.")
 
 
 def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
     skip_setup = pytest.mark.skip(reason="--no-setup provided.")
     skip_teardown = pytest.mark.skip(reason="--no-teardown provided.")
+    skip_benchmark = pytest.mark.skip(reason="--run-benchmarks not provided.")
 
     for item in items:
         if config.getoption("--no-setup") and "setup" in item.keywords:
             item.add_marker(skip_setup)
         if config.getoption("--no-teardown") and "teardown" in item.keywords:
             item.add_marker(skip_teardown)
+        if not config.getoption("--run-benchmarks") and "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+import logging
+from pathlib import Path
+
+import jubilant
+import pytest
+
+from tests.integration.util import DB_CHARM, METADATA, all_active, any_error
+
+logger = logging.getLogger(__name__)
+
+OTEL_COLLECTOR_CHARM = "opentelemetry-collector-k8s"
+STORE_NAME = "test-openfga-store"
+MODEL_PATH = "/tmp/model.json"
+AUTHORIZATION_MODEL = {
+    "schema_version": "1.1",
+    "type_definitions": [
+        {"type": "user"},
+        {
+            "type": "document",
+            "relations": {"viewer": {"this": {}}},
+            "metadata": {
+                "relations": {"viewer": {"directly_related_user_types": [{"type": "user"}]}}
+            },
+        },
+    ],
+}
+LOAD_TEST_PARAMS = {
+    "store-name": STORE_NAME,
+    "user": "user:anne",
+    "relation": "viewer",
+    "object": "document:roadmap",
+    "concurrency": 16,
+    "duration": 60,
+}
+# The tolerated drop of the throughput with every request sampled, against tracing off. The
+# throughput of a shared CI runner varies too much for this to hold on every run, so the
+# benchmarks only run with `--run-benchmarks`, and report the overhead as a test property.
+MAX_TRACING_OVERHEAD = 0.25
+
+
+def run_load_test(juju: jubilant.Juju, unit: str) -> float:
+    task = juju.run(unit=unit, action="load-test", params=LOAD_TEST_PARAMS, wait=5 * 60)
+    return float(task.results["throughput"].split()[0])
+
+
+@pytest.mark.benchmark
+class TestTracingOverhead:
+    openfga_app_name = "openfga-tracing"
+    openfga_client_app_name = "openfga-tester-tracing"
+    postgresql_app_name = "postgresql-tracing"
+    collector_app_name = "otel-collector-tracing"
+    throughput: dict[str, float] = {}
+
+    @property
+    def openfga_unit(self) -> str:
+        return f"{self.openfga_app_name}/0"
+
+    @pytest.mark.setup
+    def test_deploy(
+        self, juju: jubilant.Juju, openfga_charm: Path, openfga_tester_charm: Path
+    ) -> None:
+        juju.deploy(
+            charm=DB_CHARM,
+            app=self.postgresql_app_name,
+            channel="14/stable",
+            trust=True,
+        )
+        juju.deploy(
+            charm=openfga_charm,
+            app=self.openfga_app_name,
+            resources={"oci-image": METADATA["resources"]["oci-image"]["upstream-source"]},
+            trust=True,
+        )
+        juju.deploy(
+            charm=openfga_tester_charm,
+            app=self.openfga_client_app_name,
+            trust=True,
+        )
+        juju.deploy(
+            charm=OTEL_COLLECTOR_CHARM,
+            app=self.collector_app_name,
+            channel="2/edge",
+            trust=True,
+        )
+
+        juju.integrate(
+            f"{self.openfga_app_name}:openfga", f"{self.openfga_client_app_name}:openfga"
+        )
+        juju.integrate(self.openfga_app_name, f"{self.postgresql_app_name}:database")
+
+        juju.wait(
+            ready=all_active(
+                self.postgresql_app_name,
+                self.openfga_app_name,
+                self.openfga_client_app_name,
+            ),
+            error=any_error(
+                self.postgresql_app_name,
+                self.openfga_app_name,
+                self.openfga_client_app_name,
+            ),
+        )
+
+    def test_write_authorization_model(self, juju: jubilant.Juju, tmp_path: Path) -> None:
+        model = tmp_path / "model.json"
+        model.write_text(json.dumps(AUTHORIZATION_MODEL))
+        juju.cli("scp", "--container", "openfga", str(model), f"{self.openfga_unit}:{MODEL_PATH}")
+
+        juju.run(
+            unit=self.openfga_unit,
+            action="write-authorization-model",
+            params={"store-name": STORE_NAME, "path": MODEL_PATH},
+        )
+
+    def test_throughput_with_tracing_off(
+        self, juju: jubilant.Juju, record_property: pytest.RecordProperty
+    ) -> None:
+        self.throughput["off"] = run_load_test(juju, self.openfga_unit)
+        record_property("throughput_tracing_off", self.throughput["off"])
+
+    def test_integrate_tracing(self, juju: jubilant.Juju) -> None:
+        juju.integrate(
+            f"{self.openfga_app_name}:tracing", f"{self.collector_app_name}:receive-traces"
+        )
+
+    # The `tail` sampler samples every request as the `ratio` sampler does at 1.0
+    @pytest.mark.parametrize("sampler, ratio", [("ratio", 1.0), ("ratio", 0.3)])
+    def test_throughput_with_tracing_on(
+        self,
+        juju: jubilant.Juju,
+        record_property: pytest.RecordProperty,
+        sampler: str,
+        ratio: float,
+    ) -> None:
+        juju.config(
+            self.openfga_app_name,
+            {"tracing-sampler": sampler, "tracing-sample-ratio": ratio},
+        )
+        juju.wait(
+            ready=all_active(self.openfga_app_name),
+            error=any_error(self.openfga_app_name),
+        )
+
+        throughput = run_load_test(juju, self.openfga_unit)
+        overhead = 1 - throughput / self.throughput["off"]
+        record_property(f"throughput_tracing_{sampler}_{ratio}", throughput)
+        record_property(f"overhead_tracing_{sampler}_{ratio}", round(overhead, 3))
+        logger.info(
+            "Throughput with the %s sampler at %s: %.1f req/s, %.1f req/s with tracing off, "
+            "%.1f%% overhead",
+            sampler,
+            ratio,
+            throughput,
+            self.throughput["off"],
+            overhead * 100,
+        )
+
+        assert overhead <= MAX_TRACING_OVERHEAD
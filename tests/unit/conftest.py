@@ -15,7 +15,7 @@ def mocked_k8s_resource_patch(mocker: MockerFixture) -> None:
         autospec=True,
     )
     mocker.patch.multiple(
-        "charm.KubernetesComputeResourcesPatch",
+        "charms.observability_libs.v0.kubernetes_compute_resources_patch.KubernetesComputeResourcesPatch",
         _namespace="testing",
         _patch=lambda *a, **kw: None,
         is_ready=lambda *a, **kw: True,
@@ -55,7 +55,10 @@ def mocked_workload_service_running(mocker: MockerFixture) -> MagicMock:
 
 @pytest.fixture
 def mocked_database_resource_created(mocker: MockerFixture) -> MagicMock:
-    return mocker.patch("charm.DatabaseRequires.is_resource_created", return_value=True)
+    return mocker.patch(
+        "charms.data_platform_libs.v0.data_interfaces.DatabaseRequires.is_resource_created",
+        return_value=True,
+    )
 
 
 @pytest.fixture
@@ -142,3 +145,24 @@ def tracing_integration() -> testing.Relation:
         interface="tracing",
         remote_app_name="tempo-coordinator-k8s",
     )
+
+
+@pytest.fixture
+def remote_write_integration() -> testing.Relation:
+    return testing.Relation(
+        endpoint="send-remote-write",
+        interface="prometheus_remote_write",
+        remote_app_name="prometheus-k8s",
+        remote_units_data={
+            0: {"remote_write": '{"url": "http://prometheus-k8s-0:9090/api/v1/write"}'}
+        },
+    )
+
+
+@pytest.fixture
+def metrics_endpoint_integration() -> testing.Relation:
+    return testing.Relation(
+        endpoint="metrics-endpoint",
+        interface="prometheus_scrape",
+        remote_app_name="prometheus-k8s",
+    )
@@ -1,16 +1,25 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-from unittest.mock import MagicMock, patch
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
-from ops import testing
+from ops import ModelError, testing
 from pytest_mock import MockerFixture
 
 from charm import OpenFGAOperatorCharm
-from constants import WORKLOAD_CONTAINER
-from exceptions import MigrationError
+from constants import (
+    BACKUP_DIR,
+    PRESHARED_TOKEN_SECRET_KEY,
+    WORKLOAD_CONTAINER,
+)
+from datastore import StoreStats, TableStats
+from exceptions import DatastoreError, MigrationError
 from integrations import DatabaseConfig
+from loadgen import LoadTestResult, OperationStats
 
 
 class TestSchemaUpgradeAction:
@@ -101,7 +110,7 @@ class TestSchemaUpgradeAction:
         with pytest.raises(testing.ActionFailed, match="Database migration failed"):
             ctx.run(ctx.on.action(name="schema-upgrade"), state_in)
 
-        mocked_cli.assert_called_once_with(mocked_database_config.dsn, timeout=120)
+        mocked_cli.assert_called_once_with(mocked_database_config.migration_dsn, timeout=120)
         mocked_charm_holistic_handler.assert_not_called()
 
     @patch("charm.CommandLine.migrate")
@@ -124,5 +133,766 @@ class TestSchemaUpgradeAction:
 
         assert "Successfully migrated the database" in ctx.action_logs
         assert "Successfully updated migration version" in ctx.action_logs
-        mocked_cli.assert_called_once_with(mocked_database_config.dsn, timeout=120)
+        mocked_cli.assert_called_once_with(mocked_database_config.migration_dsn, timeout=120)
         mocked_charm_holistic_handler.assert_called_once()
+
+
+class TestImportTuplesAction:
+    DEFAULT_PARAMS = {"batch-size": 100, "concurrency": 4, "resume": True, "from-resource": False}
+
+    @pytest.fixture(autouse=True)
+    def mocked_secrets(self, mocker: MockerFixture) -> MagicMock:
+        mocked = mocker.patch("charm.Secrets", autospec=True).return_value
+        mocked.is_ready = True
+        mocked.__getitem__ = MagicMock(return_value={PRESHARED_TOKEN_SECRET_KEY: "api_token"})
+        return mocked
+
+    @pytest.fixture
+    def tuples_file(self, tmp_path: Path) -> Path:
+        path = tmp_path / "tuples.ndjson"
+        path.write_text(
+            "\n".join(
+                json.dumps({"user": f"user:{i}", "relation": "viewer", "object": "doc:1"})
+                for i in range(250)
+            )
+        )
+        return path
+
+    @pytest.fixture
+    def container(self, tuples_file: Path) -> testing.Container:
+        return testing.Container(
+            WORKLOAD_CONTAINER,
+            can_connect=True,
+            mounts={"tuples": testing.Mount(location="/tmp", source=tuples_file.parent)},
+        )
+
+    def test_when_workload_service_not_running(self, container: testing.Container) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with (
+            patch(
+                "charm.WorkloadService.is_running", new_callable=PropertyMock, return_value=False
+            ),
+            pytest.raises(testing.ActionFailed, match="OpenFGA server is not running"),
+        ):
+            ctx.run(
+                ctx.on.action(
+                    "import-tuples",
+                    params={**self.DEFAULT_PARAMS, "store-id": "store", "path": "/tmp/x"},
+                ),
+                state_in,
+            )
+
+    def test_when_store_not_found(
+        self,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with (
+            patch("charm.OpenFGAStore.get_id", return_value=""),
+            pytest.raises(testing.ActionFailed, match="Store missing not found"),
+        ):
+            ctx.run(
+                ctx.on.action(
+                    "import-tuples",
+                    params={**self.DEFAULT_PARAMS, "store-name": "missing", "path": "/tmp/x"},
+                ),
+                state_in,
+            )
+
+    def test_when_file_not_found(
+        self,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with pytest.raises(testing.ActionFailed, match="not found in the workload container"):
+            ctx.run(
+                ctx.on.action(
+                    "import-tuples",
+                    params={**self.DEFAULT_PARAMS, "store-id": "store", "path": "/tmp/missing"},
+                ),
+                state_in,
+            )
+
+    @patch("charm.HTTPClient.write_tuples", return_value=True)
+    def test_when_action_succeeds(
+        self,
+        mocked_write_tuples: MagicMock,
+        container: testing.Container,
+        tuples_file: Path,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        ctx.run(
+            ctx.on.action(
+                "import-tuples",
+                params={
+                    **self.DEFAULT_PARAMS,
+                    "store-id": "store",
+                    "path": "/tmp/tuples.ndjson",
+                },
+            ),
+            state_in,
+        )
+
+        assert ctx.action_results["imported"] == 250
+        assert mocked_write_tuples.call_count == 3
+        assert not (tuples_file.parent / "tuples.ndjson.checkpoint").exists()
+
+    def test_without_source(
+        self,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with pytest.raises(testing.ActionFailed, match="Either path or from-resource"):
+            ctx.run(
+                ctx.on.action(
+                    "import-tuples", params={**self.DEFAULT_PARAMS, "store-id": "store"}
+                ),
+                state_in,
+            )
+
+    def test_when_resource_not_attached(
+        self,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with (
+            patch("ops.model.Resources.fetch", side_effect=ModelError("not attached")),
+            pytest.raises(testing.ActionFailed, match="No tuples resource attached"),
+        ):
+            ctx.run(
+                ctx.on.action(
+                    "import-tuples",
+                    params={**self.DEFAULT_PARAMS, "store-id": "store", "from-resource": True},
+                ),
+                state_in,
+            )
+
+    @patch("charm.HTTPClient.write_tuples", return_value=True)
+    def test_when_importing_resource(
+        self,
+        mocked_write_tuples: MagicMock,
+        tmp_path: Path,
+        tuples_file: Path,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        backups = tmp_path / "backups"
+        backups.mkdir()
+        container = testing.Container(
+            WORKLOAD_CONTAINER,
+            can_connect=True,
+            mounts={"backups": testing.Mount(location=str(BACKUP_DIR), source=backups)},
+        )
+        state_in = testing.State(
+            containers={container},
+            resources={testing.Resource(name="tuples", path=tuples_file)},
+        )
+
+        ctx.run(
+            ctx.on.action(
+                "import-tuples",
+                params={**self.DEFAULT_PARAMS, "store-id": "store", "from-resource": True},
+            ),
+            state_in,
+        )
+
+        assert ctx.action_results["imported"] == 250
+        assert mocked_write_tuples.call_count == 3
+
+    @patch("charm.HTTPClient.write_tuples", return_value=False)
+    def test_when_write_failed(
+        self,
+        mocked_write_tuples: MagicMock,
+        container: testing.Container,
+        tuples_file: Path,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with pytest.raises(testing.ActionFailed, match="Failed to write tuples after 0 tuples"):
+            ctx.run(
+                ctx.on.action(
+                    "import-tuples",
+                    params={
+                        **self.DEFAULT_PARAMS,
+                        "store-id": "store",
+                        "path": "/tmp/tuples.ndjson",
+                    },
+                ),
+                state_in,
+            )
+
+        checkpoint = json.loads((tuples_file.parent / "tuples.ndjson.checkpoint").read_text())
+        assert checkpoint["store_id"] == "store"
+        assert checkpoint["offset"] == 0
+
+
+class TestExportTuplesAction:
+    DEFAULT_PARAMS = {"mode": "tuples", "page-size": 100}
+
+    @pytest.fixture(autouse=True)
+    def mocked_secrets(self, mocker: MockerFixture) -> MagicMock:
+        mocked = mocker.patch("charm.Secrets", autospec=True).return_value
+        mocked.is_ready = True
+        mocked.__getitem__ = MagicMock(return_value={PRESHARED_TOKEN_SECRET_KEY: "api_token"})
+        return mocked
+
+    @pytest.fixture
+    def container(self, tmp_path: Path) -> testing.Container:
+        return testing.Container(
+            WORKLOAD_CONTAINER,
+            can_connect=True,
+            mounts={"backups": testing.Mount(location=str(BACKUP_DIR), source=tmp_path)},
+        )
+
+    @patch(
+        "charm.HTTPClient.read_tuples",
+        return_value={"tuples": [{"key": {"user": "user:1"}}], "continuation_token": ""},
+    )
+    def test_when_exporting_tuples(
+        self,
+        mocked_read_tuples: MagicMock,
+        container: testing.Container,
+        tmp_path: Path,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        ctx.run(
+            ctx.on.action(
+                "export-tuples",
+                params={
+                    **self.DEFAULT_PARAMS,
+                    "store-id": "store",
+                    "path": str(BACKUP_DIR / "store.ndjson.gz"),
+                },
+            ),
+            state_in,
+        )
+
+        assert ctx.action_results["exported"] == 1
+        content = gzip.decompress((tmp_path / "store.ndjson.gz").read_bytes())
+        assert json.loads(content) == {"key": {"user": "user:1"}}
+
+    @patch("charm.HTTPClient.read_changes")
+    def test_when_exporting_changes_incrementally(
+        self,
+        mocked_read_changes: MagicMock,
+        container: testing.Container,
+        tmp_path: Path,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        (tmp_path / "store.changes-token").write_text("token-1")
+        mocked_read_changes.side_effect = [
+            {"changes": [{"tuple_key": {"user": "user:1"}}], "continuation_token": "token-2"},
+            {"changes": [], "continuation_token": "token-2"},
+        ]
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        ctx.run(
+            ctx.on.action(
+                "export-tuples",
+                params={**self.DEFAULT_PARAMS, "store-id": "store", "mode": "changes"},
+            ),
+            state_in,
+        )
+
+        assert ctx.action_results["exported"] == 1
+        assert ctx.action_results["continuation-token"] == "token-2"
+        assert (tmp_path / "store.changes-token").read_text() == "token-2"
+        mocked_read_changes.assert_any_call("store", "token-1", 100)
+
+    @patch("charm.HTTPClient.read_tuples", return_value=None)
+    def test_when_read_failed(
+        self,
+        mocked_read_tuples: MagicMock,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with pytest.raises(testing.ActionFailed, match="Failed to read tuples after 0 tuples"):
+            ctx.run(
+                ctx.on.action(
+                    "export-tuples", params={**self.DEFAULT_PARAMS, "store-id": "store"}
+                ),
+                state_in,
+            )
+
+
+class TestWriteAuthorizationModelAction:
+    DEFAULT_PARAMS = {"path": "/tmp/model.fga", "dry-run": False, "force": False}
+
+    @pytest.fixture(autouse=True)
+    def mocked_secrets(self, mocker: MockerFixture) -> MagicMock:
+        mocked = mocker.patch("charm.Secrets", autospec=True).return_value
+        mocked.is_ready = True
+        mocked.__getitem__ = MagicMock(return_value={PRESHARED_TOKEN_SECRET_KEY: "api_token"})
+        return mocked
+
+    @pytest.fixture
+    def container(self, tmp_path: Path) -> testing.Container:
+        (tmp_path / "model.fga").write_text(
+            "model\n"
+            "  schema 1.1\n"
+            "type user\n"
+            "type group\n"
+            "  relations\n"
+            "    define member: [user, group#member]\n"
+        )
+        return testing.Container(
+            WORKLOAD_CONTAINER,
+            can_connect=True,
+            mounts={"models": testing.Mount(location="/tmp", source=tmp_path)},
+        )
+
+    @patch("charm.HTTPClient.write_authorization_model", return_value="model-id")
+    def test_when_action_succeeds(
+        self,
+        mocked_write_model: MagicMock,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        ctx.run(
+            ctx.on.action(
+                "write-authorization-model", params={**self.DEFAULT_PARAMS, "store-id": "store"}
+            ),
+            state_in,
+        )
+
+        assert ctx.action_results["authorization-model-id"] == "model-id"
+        assert ctx.action_results["cycles"] == "group#member"
+        store_id, model = mocked_write_model.call_args.args
+        assert store_id == "store"
+        assert model["schema_version"] == "1.1"
+
+    @patch("charm.HTTPClient.write_authorization_model")
+    def test_when_thresholds_exceeded(
+        self,
+        mocked_write_model: MagicMock,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container}, config={"model-allow-cycles": False})
+
+        with pytest.raises(testing.ActionFailed, match="exceeds the configured thresholds"):
+            ctx.run(
+                ctx.on.action(
+                    "write-authorization-model",
+                    params={**self.DEFAULT_PARAMS, "store-id": "store"},
+                ),
+                state_in,
+            )
+
+        assert "recursive relation" in ctx.action_results["violations"]
+        mocked_write_model.assert_not_called()
+
+    @patch("charm.HTTPClient.write_authorization_model")
+    def test_when_dry_run(
+        self,
+        mocked_write_model: MagicMock,
+        container: testing.Container,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        ctx.run(
+            ctx.on.action(
+                "write-authorization-model", params={**self.DEFAULT_PARAMS, "dry-run": True}
+            ),
+            state_in,
+        )
+
+        assert ctx.action_results["max-depth"] == 1
+        mocked_write_model.assert_not_called()
+
+    def test_when_model_invalid(self, container: testing.Container, tmp_path: Path) -> None:
+        (tmp_path / "model.fga").write_text("model\n  schema 1.0\n")
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with pytest.raises(testing.ActionFailed, match="Invalid authorization model"):
+            ctx.run(
+                ctx.on.action("write-authorization-model", params=self.DEFAULT_PARAMS), state_in
+            )
+
+
+class TestLoadTestAction:
+    DEFAULT_PARAMS = {
+        "mix": "check=80,batch-check=10,list-objects=10",
+        "concurrency": 8,
+        "duration": 30,
+        "batch-size": 10,
+    }
+
+    @pytest.fixture(autouse=True)
+    def mocked_secrets(self, mocker: MockerFixture) -> MagicMock:
+        mocked = mocker.patch("charm.Secrets", autospec=True).return_value
+        mocked.is_ready = True
+        mocked.__getitem__ = MagicMock(return_value={PRESHARED_TOKEN_SECRET_KEY: "api_token"})
+        return mocked
+
+    @pytest.fixture
+    def container(self) -> testing.Container:
+        return testing.Container(WORKLOAD_CONTAINER, can_connect=True)
+
+    def test_when_action_succeeds(
+        self,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        stats = OperationStats()
+        for _ in range(300):
+            stats.latencies.observe(0.001)
+
+        with patch("charm.LoadGenerator", autospec=True) as mocked_generator:
+            mocked_generator.return_value.run.return_value = LoadTestResult(
+                duration=30.0, operations={"check": stats}
+            )
+            ctx.run(
+                ctx.on.action(
+                    "load-test",
+                    params={
+                        **self.DEFAULT_PARAMS,
+                        "store-id": "store",
+                        "user": "user:anne",
+                        "relation": "viewer",
+                        "object": "document:1",
+                    },
+                ),
+                state_in,
+            )
+
+        assert ctx.action_results["requests"] == 300
+        assert ctx.action_results["throughput"] == "10.0 req/s"
+        assert ctx.action_results["p99"] == "1.00ms"
+        _, store_id, tuple_keys, mix = mocked_generator.call_args.args
+        assert store_id == "store"
+        assert tuple_keys == [{"user": "user:anne", "relation": "viewer", "object": "document:1"}]
+        assert mix == {"check": 80, "batch-check": 10, "list-objects": 10}
+        mocked_generator.return_value.run.assert_called_once_with(30)
+
+    def test_when_mix_invalid(
+        self,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with pytest.raises(testing.ActionFailed, match="Unknown operation read"):
+            ctx.run(
+                ctx.on.action(
+                    "load-test", params={**self.DEFAULT_PARAMS, "mix": "read=1", "store-id": "s"}
+                ),
+                state_in,
+            )
+
+    def test_when_queries_missing(
+        self,
+        container: testing.Container,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        with pytest.raises(testing.ActionFailed, match="Either path or user, relation and object"):
+            ctx.run(
+                ctx.on.action("load-test", params={**self.DEFAULT_PARAMS, "store-id": "store"}),
+                state_in,
+            )
+
+
+class TestCaptureWarmupSampleAction:
+    DEFAULT_PARAMS = {"size": 1000, "path": "/var/lib/openfga/warmup-sample.ndjson"}
+
+    @pytest.fixture(autouse=True)
+    def mocked_secrets(self, mocker: MockerFixture) -> MagicMock:
+        mocked = mocker.patch("charm.Secrets", autospec=True).return_value
+        mocked.is_ready = True
+        mocked.__getitem__ = MagicMock(return_value={PRESHARED_TOKEN_SECRET_KEY: "api_token"})
+        return mocked
+
+    @pytest.fixture
+    def container(self, tmp_path: Path) -> testing.Container:
+        return testing.Container(
+            WORKLOAD_CONTAINER,
+            can_connect=True,
+            mounts={"data": testing.Mount(location="/var/lib/openfga", source=tmp_path)},
+        )
+
+    @patch("charm.HTTPClient.list_stores", return_value=[{"id": "store-1"}, {"id": "store-2"}])
+    @patch("charm.HTTPClient.read_tuples")
+    def test_when_action_succeeds(
+        self,
+        mocked_read_tuples: MagicMock,
+        mocked_list_stores: MagicMock,
+        container: testing.Container,
+        tmp_path: Path,
+        mocked_workload_service_running: MagicMock,
+    ) -> None:
+        tuple_key = {"user": "user:1", "relation": "viewer", "object": "document:1"}
+        mocked_read_tuples.return_value = {
+            "tuples": [{"key": {**tuple_key, "condition": {"name": "c"}}}] * 3,
+            "continuation_token": "",
+        }
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={container})
+
+        ctx.run(
+            ctx.on.action("capture-warmup-sample", params={**self.DEFAULT_PARAMS, "size": 2}),
+            state_in,
+        )
+
+        assert ctx.action_results["stores"] == 2
+        assert ctx.action_results["checks"] == 4
+        lines = (tmp_path / "warmup-sample.ndjson").read_text().splitlines()
+        assert json.loads(lines[-1]) == {"store_id": "store-2", "tuple_key": tuple_key}
+
+
+class TestDatabaseMaintenanceAction:
+    DEFAULT_PARAMS = {"operation": "report", "lock-timeout": 5}
+    CONTAINER = testing.Container(WORKLOAD_CONTAINER, can_connect=True)
+
+    @pytest.fixture
+    def mocked_datastore_client(self, mocker: MockerFixture) -> MagicMock:
+        mocked = mocker.patch("charm.DatastoreClient", autospec=True)
+        client = mocked.return_value.__enter__.return_value
+        client.table_stats.return_value = [
+            TableStats("tuple", 8192 * 1024, 4096 * 1024, 4096 * 1024, 900, 100),
+            TableStats("changelog", 1024, 1024, 0, 10, 0),
+        ]
+        return mocked
+
+    def test_when_not_leader_unit(
+        self,
+        database_integration: testing.Relation,
+        mocked_datastore_client: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(
+            containers={self.CONTAINER}, relations=[database_integration], leader=False
+        )
+
+        with pytest.raises(
+            testing.ActionFailed,
+            match="Only the leader unit can run the database-maintenance action",
+        ):
+            ctx.run(ctx.on.action("database-maintenance", params=self.DEFAULT_PARAMS), state_in)
+
+        mocked_datastore_client.assert_not_called()
+
+    def test_when_database_integration_missing(self, mocked_datastore_client: MagicMock) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={self.CONTAINER}, leader=True)
+
+        with pytest.raises(testing.ActionFailed, match="Missing required database integration"):
+            ctx.run(ctx.on.action("database-maintenance", params=self.DEFAULT_PARAMS), state_in)
+
+        mocked_datastore_client.assert_not_called()
+
+    def test_when_reporting(
+        self,
+        database_integration: testing.Relation,
+        mocked_database_resource_created: MagicMock,
+        mocked_datastore_client: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(
+            containers={self.CONTAINER}, relations=[database_integration], leader=True
+        )
+
+        ctx.run(ctx.on.action("database-maintenance", params=self.DEFAULT_PARAMS), state_in)
+
+        client = mocked_datastore_client.return_value.__enter__.return_value
+        client.maintain.assert_not_called()
+        assert ctx.action_results["tuple"]["total-size"] == "8.0MiB"
+        assert ctx.action_results["tuple"]["bloat"] == "10.0%"
+        assert ctx.action_results["changelog"]["last-vacuum"] == "never"
+
+    def test_when_running_operation(
+        self,
+        database_integration: testing.Relation,
+        mocked_database_resource_created: MagicMock,
+        mocked_datastore_client: MagicMock,
+    ) -> None:
+        client = mocked_datastore_client.return_value.__enter__.return_value
+        client.maintain.side_effect = [1.5, None]
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(
+            containers={self.CONTAINER}, relations=[database_integration], leader=True
+        )
+
+        ctx.run(
+            ctx.on.action(
+                "database-maintenance",
+                params={"operation": "vacuum", "tables": "tuple, changelog", "lock-timeout": 2},
+            ),
+            state_in,
+        )
+
+        assert mocked_datastore_client.call_args.kwargs["lock_timeout"] == 2
+        assert client.maintain.call_args_list == [
+            (("tuple", "vacuum"),),
+            (("changelog", "vacuum"),),
+        ]
+        assert ctx.action_results["tuple"]["vacuum"] == "1.50s"
+        assert ctx.action_results["changelog"]["vacuum"] == "skipped: lock timeout"
+
+    def test_when_table_unknown(
+        self,
+        database_integration: testing.Relation,
+        mocked_database_resource_created: MagicMock,
+        mocked_datastore_client: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(
+            containers={self.CONTAINER}, relations=[database_integration], leader=True
+        )
+
+        with pytest.raises(testing.ActionFailed, match="Unknown tables: users"):
+            ctx.run(
+                ctx.on.action(
+                    "database-maintenance", params={**self.DEFAULT_PARAMS, "tables": "users"}
+                ),
+                state_in,
+            )
+
+        mocked_datastore_client.assert_not_called()
+
+    def test_when_datastore_failed(
+        self,
+        database_integration: testing.Relation,
+        mocked_database_resource_created: MagicMock,
+        mocked_datastore_client: MagicMock,
+    ) -> None:
+        mocked_datastore_client.return_value.__enter__.side_effect = DatastoreError(
+            "connection refused"
+        )
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(
+            containers={self.CONTAINER}, relations=[database_integration], leader=True
+        )
+
+        with pytest.raises(testing.ActionFailed, match="connection refused"):
+            ctx.run(ctx.on.action("database-maintenance", params=self.DEFAULT_PARAMS), state_in)
+
+
+class TestStoreStatsAction:
+    CONTAINER = testing.Container(WORKLOAD_CONTAINER, can_connect=True)
+    CACHED = {
+        "collected-at": 1767225600.0,
+        "stores": [
+            {
+                "store_id": "01JQ0000000000000000000000",
+                "name": "alpha",
+                "tuples": 100,
+                "changelog_growth": 7,
+                "authorization_models": None,
+            }
+        ],
+    }
+
+    @pytest.fixture
+    def mocked_collector(self, mocker: MockerFixture) -> MagicMock:
+        mocker.patch("charm.DatastoreClient", autospec=True)
+        mocked = mocker.patch("charm.StoreStatsCollector", autospec=True)
+        mocked.return_value.collect.return_value = [
+            StoreStats("01JQ0000000000000000000001", "beta", 5, 1, 1)
+        ]
+        return mocked
+
+    def test_when_cached(self, mocked_collector: MagicMock) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        stored = testing.StoredState(
+            owner_path="OpenFGAOperatorCharm", content={"store_stats": self.CACHED}
+        )
+        state_in = testing.State(containers={self.CONTAINER}, stored_states={stored}, leader=True)
+
+        ctx.run(ctx.on.action("store-stats", params={"refresh": False}), state_in)
+
+        mocked_collector.assert_not_called()
+        assert ctx.action_results["collected-at"] == "2026-01-01T00:00:00+00:00"
+        assert ctx.action_results["stores"]["01jq0000000000000000000000"] == {
+            "name": "alpha",
+            "tuples": 100,
+            "changelog-growth": 7,
+            "authorization-models": "timed out",
+        }
+
+    def test_when_not_collected(self, mocked_collector: MagicMock) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={self.CONTAINER}, leader=True)
+
+        with pytest.raises(testing.ActionFailed, match="No store statistics collected yet"):
+            ctx.run(ctx.on.action("store-stats", params={"refresh": False}), state_in)
+
+    def test_when_cache_incomplete(self, mocked_collector: MagicMock) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        stored = testing.StoredState(
+            owner_path="OpenFGAOperatorCharm", content={"store_stats": {"stores": []}}
+        )
+        state_in = testing.State(containers={self.CONTAINER}, stored_states={stored}, leader=True)
+
+        with pytest.raises(testing.ActionFailed, match="No store statistics collected yet"):
+            ctx.run(ctx.on.action("store-stats", params={"refresh": False}), state_in)
+
+    def test_when_non_leader_unit(self, mocked_collector: MagicMock) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(containers={self.CONTAINER}, leader=False)
+
+        with pytest.raises(
+            testing.ActionFailed, match="Only the leader unit can run the store-stats action"
+        ):
+            ctx.run(ctx.on.action("store-stats", params={"refresh": True}), state_in)
+
+        mocked_collector.assert_not_called()
+
+    def test_when_refreshing(
+        self,
+        peer_integration: testing.PeerRelation,
+        database_integration: testing.Relation,
+        mocked_database_resource_created: MagicMock,
+        mocked_collector: MagicMock,
+    ) -> None:
+        ctx = testing.Context(OpenFGAOperatorCharm)
+        state_in = testing.State(
+            containers={self.CONTAINER},
+            relations=[peer_integration, database_integration],
+            leader=True,
+        )
+
+        state_out = ctx.run(ctx.on.action("store-stats", params={"refresh": True}), state_in)
+
+        assert ctx.action_results["stores"]["01jq0000000000000000000001"]["tuples"] == 5
+        stored = state_out.get_stored_state("_stored", owner_path="OpenFGAOperatorCharm")
+        assert stored.content["store_stats"]["stores"][0]["name"] == "beta"
+        assert "store-stats" not in state_out.get_relation(peer_integration.id).local_app_data
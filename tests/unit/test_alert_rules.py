@@ -0,0 +1,111 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from alert_rules import (
+    SLO_ALERT_RULES_FILE,
+    datastore_rules,
+    latency_burn_rate_rules,
+    le_matcher,
+    render_alert_rules,
+    slo_recording_rules,
+)
+from configs import SLOConfig
+
+
+@pytest.mark.parametrize(
+    "latency, expected",
+    [
+        (250, "0.25"),
+        (200, "0.25"),
+        (1000, "1|1.0"),
+        (3, "0.005"),
+        (60000, "10|10.0"),
+    ],
+)
+def test_le_matcher(latency: int, expected: str) -> None:
+    assert le_matcher(latency) == expected
+
+
+class TestLatencyBurnRateRules:
+    def test_rules_per_method_and_window(self) -> None:
+        rules = latency_burn_rate_rules(SLOConfig())
+
+        assert len(rules) == 16
+        assert {rule["alert"] for rule in rules} == {
+            "OpenFGACheckLatencyBudgetBurn",
+            "OpenFGABatchCheckLatencyBudgetBurn",
+            "OpenFGAListObjectsLatencyBudgetBurn",
+            "OpenFGAWriteLatencyBudgetBurn",
+        }
+
+    def test_thresholds_templated(self) -> None:
+        rules = latency_burn_rate_rules(SLOConfig(objective=0.999, check_latency=100))
+
+        rule = rules[0]
+        assert rule["alert"] == "OpenFGACheckLatencyBudgetBurn"
+        assert rule["labels"] == {"severity": "error", "window": "1h"}
+        assert rule["expr"] == (
+            'app_method:grpc_server_slow_requests:ratio_rate1h{grpc_method="Check"} > 0.0144'
+            ' and app_method:grpc_server_slow_requests:ratio_rate5m{grpc_method="Check"} > 0.0144'
+        )
+
+
+class TestSLORecordingRules:
+    def test_slow_request_ratios(self) -> None:
+        rules = slo_recording_rules(SLOConfig(check_latency=100))
+
+        ratios = [rule for rule in rules if rule["record"].endswith("ratio_rate5m")]
+        assert len(ratios) == 4
+        assert 'grpc_method="Check", le=~"0.1"}' in ratios[0]["expr"]
+
+    def test_long_windows_averaged(self) -> None:
+        rules = {rule["record"]: rule["expr"] for rule in slo_recording_rules(SLOConfig())}
+
+        assert rules["app_method:grpc_server_slow_requests:ratio_rate3d"] == (
+            "avg_over_time(app_method:grpc_server_slow_requests:ratio_rate5m[3d])"
+        )
+        assert len(rules) == 7
+
+
+def test_datastore_rules() -> None:
+    rules = datastore_rules(SLOConfig(datastore_query_latency=50, check_cache_hit_ratio=0.8))
+
+    assert rules[0]["expr"].startswith("histogram_quantile(0.99, ")
+    assert rules[0]["expr"].endswith("> 50")
+    assert rules[1]["expr"].endswith("< 0.8")
+
+
+class TestRenderAlertRules:
+    def test_render(self, tmp_path: Path) -> None:
+        directory = render_alert_rules(tmp_path / "rules", SLOConfig())
+
+        assert (directory / "openfga_unavailable.rule").exists()
+        assert (directory / "openfga_recording.rule").exists()
+        rules = yaml.safe_load((directory / SLO_ALERT_RULES_FILE).read_text())
+        assert [group["name"] for group in rules["groups"]] == [
+            "OpenFGALatencySLORecording",
+            "OpenFGALatencySLO",
+            "OpenFGADatastore",
+        ]
+
+    def test_without_rpc_histograms(self, tmp_path: Path) -> None:
+        render_alert_rules(tmp_path, SLOConfig(), rpc_histograms=False)
+
+        rules = yaml.safe_load((tmp_path / SLO_ALERT_RULES_FILE).read_text())
+        assert [group["name"] for group in rules["groups"]] == ["OpenFGADatastore"]
+
+    def test_unchanged_rules_not_rewritten(self, tmp_path: Path) -> None:
+        render_alert_rules(tmp_path, SLOConfig())
+        rules_file = tmp_path / SLO_ALERT_RULES_FILE
+        mtime = rules_file.stat().st_mtime_ns
+
+        render_alert_rules(tmp_path, SLOConfig())
+        assert rules_file.stat().st_mtime_ns == mtime
+
+        render_alert_rules(tmp_path, SLOConfig(check_latency=100))
+        assert 'le=~"0.1"' in rules_file.read_text()
@@ -0,0 +1,144 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+
+import pytest
+
+from authorization_models import ModelAnalyzer, ModelThresholds, load_model, parse_dsl
+from exceptions import AuthorizationModelError
+
+DSL_MODEL = """
+model
+  schema 1.1
+
+# Users and nested groups
+type user
+
+type group
+  relations
+    define member: [user, group#member]
+
+type folder
+  relations
+    define owner: [user]
+    define viewer: [user, user:*, group#member with non_expired] or owner
+
+type document
+  relations
+    define parent: [folder]
+    define owner: [user]
+    define blocked: [user]
+    define editor: [user] or owner
+    define viewer: ([user] or editor or viewer from parent) but not blocked
+
+condition non_expired(current_time: timestamp, grants: list<string>) {
+  current_time < timestamp("2030-01-01T00:00:00Z")
+}
+"""
+
+
+class TestParseDSL:
+    def test_parse_dsl(self) -> None:
+        model = parse_dsl(DSL_MODEL)
+
+        assert model["schema_version"] == "1.1"
+        assert [t["type"] for t in model["type_definitions"]] == [
+            "user",
+            "group",
+            "folder",
+            "document",
+        ]
+
+        folder = model["type_definitions"][2]
+        assert folder["relations"]["viewer"] == {
+            "union": {
+                "child": [
+                    {"this": {}},
+                    {"computedUserset": {"object": "", "relation": "owner"}},
+                ]
+            }
+        }
+        assert folder["metadata"]["relations"]["viewer"]["directly_related_user_types"] == [
+            {"type": "user"},
+            {"type": "user", "wildcard": {}},
+            {"type": "group", "relation": "member", "condition": "non_expired"},
+        ]
+
+        document = model["type_definitions"][3]
+        viewer = document["relations"]["viewer"]["difference"]
+        assert viewer["subtract"] == {"computedUserset": {"object": "", "relation": "blocked"}}
+        assert viewer["base"]["union"]["child"][2] == {
+            "tupleToUserset": {
+                "tupleset": {"object": "", "relation": "parent"},
+                "computedUserset": {"object": "", "relation": "viewer"},
+            }
+        }
+
+        assert model["conditions"]["non_expired"] == {
+            "name": "non_expired",
+            "expression": 'current_time < timestamp("2030-01-01T00:00:00Z")',
+            "parameters": {
+                "current_time": {"type_name": "TYPE_NAME_TIMESTAMP"},
+                "grants": {
+                    "type_name": "TYPE_NAME_LIST",
+                    "generic_types": [{"type_name": "TYPE_NAME_STRING"}],
+                },
+            },
+        }
+
+    @pytest.mark.parametrize(
+        "dsl",
+        [
+            "model\n  schema 1.0\ntype user\n",
+            "model\n  schema 1.1\ntype doc\n  relations\n    define a: [user] or b and c\n",
+            "model\n  schema 1.1\ntype doc\n  relations\n    define a: [user\n",
+            "model\n  schema 1.1\ncondition c(x: float) {\n  x > 1\n}\n",
+            "model\n  schema 1.1\nmodule doc\n",
+            "module doc\nmodel\n  schema 1.1\n",
+            "model\n  schema 1.1\ntype user\nextend type user\n",
+        ],
+    )
+    def test_parse_invalid_dsl(self, dsl: str) -> None:
+        with pytest.raises(AuthorizationModelError):
+            parse_dsl(dsl)
+
+    def test_parse_unsupported_dsl(self) -> None:
+        with pytest.raises(AuthorizationModelError, match="fga model transform"):
+            parse_dsl("model\n  schema 1.1\ntype user\nextend type user\n")
+
+
+def test_load_json_model() -> None:
+    model = parse_dsl(DSL_MODEL)
+
+    assert load_model(json.dumps(model)) == model
+
+
+class TestModelAnalyzer:
+    def test_analyze(self) -> None:
+        analysis = ModelAnalyzer(parse_dsl(DSL_MODEL)).analyze()
+
+        assert analysis.cycles == [["group#member"]]
+        assert analysis.max_depth == 3
+        assert analysis.deepest_relation == "document#viewer"
+        assert analysis.fanout["document#viewer"] == 3
+        assert analysis.conditions == 1
+        assert analysis.conditional_references == 1
+        assert analysis.estimated_cost > analysis.max_depth
+
+    def test_violations(self) -> None:
+        analysis = ModelAnalyzer(parse_dsl(DSL_MODEL)).analyze()
+        thresholds = ModelThresholds(
+            max_depth=2, max_fanout=2, max_conditions=1, allow_cycles=False
+        )
+
+        violations = analysis.violations(thresholds)
+
+        assert len(violations) == 4
+        assert "document#viewer" in violations[0]
+
+    def test_without_violations(self) -> None:
+        analysis = ModelAnalyzer(parse_dsl(DSL_MODEL)).analyze()
+        thresholds = ModelThresholds(max_depth=25, max_fanout=10, max_conditions=20)
+
+        assert not analysis.violations(thresholds)
@@ -0,0 +1,96 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+import urllib.error
+from unittest.mock import MagicMock
+
+import pytest
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pytest_mock import MockerFixture
+
+from charm_tracing import OTLPJSONSpanExporter, encode_spans, setup_charm_tracing
+
+
+@pytest.fixture
+def spans() -> tuple[ReadableSpan, ...]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(resource=Resource.create({"service.name": "openfga-k8s"}))
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("charm")
+
+    with tracer.start_as_current_span("start: OpenFGAOperatorCharm"):
+        with tracer.start_as_current_span("holistic_handler") as span:
+            span.set_attribute("attempts", 2)
+
+    return exporter.get_finished_spans()
+
+
+class TestEncodeSpans:
+    def test_encode_spans(self, spans: tuple[ReadableSpan, ...]) -> None:
+        request = json.loads(encode_spans(spans))
+
+        resource_spans = request["resourceSpans"][0]
+        assert {"key": "service.name", "value": {"stringValue": "openfga-k8s"}} in (
+            resource_spans["resource"]["attributes"]
+        )
+        scope_spans = resource_spans["scopeSpans"][0]
+        assert scope_spans["scope"] == {"name": "charm"}
+        child, parent = scope_spans["spans"]
+        assert child["name"] == "holistic_handler"
+        assert child["parentSpanId"] == parent["spanId"]
+        assert child["traceId"] == parent["traceId"]
+        assert child["attributes"] == [{"key": "attempts", "value": {"intValue": "2"}}]
+        assert child["kind"] == 1
+        assert "parentSpanId" not in parent
+
+
+class TestOTLPJSONSpanExporter:
+    def test_export(self, mocker: MockerFixture, spans: tuple[ReadableSpan, ...]) -> None:
+        mocked_urlopen = mocker.patch("charm_tracing.urllib.request.urlopen")
+        exporter = OTLPJSONSpanExporter("http://tempo:4318/v1/traces")
+
+        assert exporter.export(spans) == SpanExportResult.SUCCESS
+
+        request = mocked_urlopen.call_args.args[0]
+        assert request.full_url == "http://tempo:4318/v1/traces"
+        assert request.get_header("Content-type") == "application/json"
+        assert request.data == encode_spans(spans)
+        assert mocked_urlopen.call_args.kwargs["timeout"] == 2.0
+
+    def test_export_failed(self, mocker: MockerFixture, spans: tuple[ReadableSpan, ...]) -> None:
+        mocker.patch(
+            "charm_tracing.urllib.request.urlopen", side_effect=urllib.error.URLError("refused")
+        )
+        exporter = OTLPJSONSpanExporter("http://tempo:4318/v1/traces")
+
+        assert exporter.export(spans) == SpanExportResult.FAILURE
+
+
+class TestSetupCharmTracing:
+    def test_hook_traced_at_exit(self, mocker: MockerFixture) -> None:
+        mocked_set_tracer_provider = mocker.patch("charm_tracing.trace.set_tracer_provider")
+        mocked_register = mocker.patch("charm_tracing.atexit.register")
+        mocked_urlopen = mocker.patch("charm_tracing.urllib.request.urlopen")
+        mocker.patch("charm_tracing.context.attach")
+
+        setup_charm_tracing(
+            resource={"service.name": "openfga-k8s"},
+            hook="start: OpenFGAOperatorCharm",
+            url="http://tempo:4318/v1/traces",
+            ca=None,
+        )
+        mocked_urlopen.assert_not_called()
+
+        provider: TracerProvider = mocked_set_tracer_provider.call_args.args[0]
+        shutdown: MagicMock = mocked_register.call_args.args[0]
+        shutdown()
+
+        mocked_urlopen.assert_called_once()
+        request = json.loads(mocked_urlopen.call_args.args[0].data)
+        spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [span["name"] for span in spans] == ["start: OpenFGAOperatorCharm"]
+        assert provider.resource.attributes["service.name"] == "openfga-k8s"
@@ -1,11 +1,47 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-from unittest.mock import MagicMock
+from typing import Any
+from unittest.mock import MagicMock, patch
 
+import cramjam
 import pytest
+import requests
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
 
-from clients import OpenFGAStore
+from clients import (
+    HTTPClient,
+    MetricsClient,
+    OpenFGAStore,
+    RemoteWriteClient,
+    encode_write_request,
+    snappy_block,
+)
+
+
+def write_request_class() -> Any:
+    """Build the Prometheus remote write `WriteRequest` message class from its schema."""
+    field = descriptor_pb2.FieldDescriptorProto
+    file = descriptor_pb2.FileDescriptorProto(name="remote.proto", package="prometheus")
+    for message, fields in {
+        "Label": [("name", 1, field.TYPE_STRING, ""), ("value", 2, field.TYPE_STRING, "")],
+        "Sample": [("value", 1, field.TYPE_DOUBLE, ""), ("timestamp", 2, field.TYPE_INT64, "")],
+        "TimeSeries": [
+            ("labels", 1, field.TYPE_MESSAGE, ".prometheus.Label"),
+            ("samples", 2, field.TYPE_MESSAGE, ".prometheus.Sample"),
+        ],
+        "WriteRequest": [("timeseries", 1, field.TYPE_MESSAGE, ".prometheus.TimeSeries")],
+    }.items():
+        descriptor = file.message_type.add(name=message)
+        for name, number, type_, type_name in fields:
+            label = field.LABEL_REPEATED if type_name else field.LABEL_OPTIONAL
+            descriptor.field.add(name=name, number=number, type=type_, label=label)
+            if type_name:
+                descriptor.field[-1].type_name = type_name
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file)
+    return message_factory.GetMessageClass(pool.FindMessageTypeByName("prometheus.WriteRequest"))
 
 
 class TestOpenFGAStore:
@@ -38,3 +74,149 @@ class TestOpenFGAStore:
         assert store_id == "2"
         mocked_client.list_stores.assert_called_once()
         mocked_client.create_store.assert_called_once_with("store-2")
+
+    def test_create_many_stores(self, mocked_client: MagicMock) -> None:
+        mocked_client.list_stores.return_value = [
+            {"id": "1", "name": "store-1"},
+        ]
+        mocked_client.create_store.side_effect = ["2", ""]
+
+        store = OpenFGAStore(client=mocked_client)
+        store_ids = store.create_many(["store-1", "store-2", "store-3", "store-2"])
+
+        assert store_ids == {"store-1": "1", "store-2": "2"}
+        mocked_client.list_stores.assert_called_once()
+        assert mocked_client.create_store.call_count == 2
+
+
+class TestMetricsClient:
+    def test_get_metrics(self) -> None:
+        text = (
+            "# HELP openfga_check_cache_hit_count The total number of cache hits.\n"
+            "# TYPE openfga_check_cache_hit_count counter\n"
+            "openfga_check_cache_hit_count 4\n"
+            'grpc_server_handled_total{grpc_code="OK",grpc_method="Check"} 10\n'
+            'grpc_server_handled_total{grpc_code="Unknown",grpc_method="with space"} 2\n'
+        )
+        with patch("clients.requests.get") as mocked_get:
+            mocked_get.return_value.text = text
+            metrics = MetricsClient("http://127.0.0.1:2112").get_metrics()
+
+        assert metrics == {"openfga_check_cache_hit_count": 4.0, "grpc_server_handled_total": 12.0}
+
+    def test_in_flight_requests(self) -> None:
+        client = MetricsClient("http://127.0.0.1:2112")
+        metrics = {"grpc_server_started_total": 12.0, "grpc_server_handled_total": 10.0}
+
+        with patch.object(client, "get_metrics", return_value=metrics):
+            assert client.in_flight_requests() == 2.0
+
+    def test_get_metrics_with_error(self) -> None:
+        with patch("clients.requests.get", side_effect=requests.exceptions.ConnectionError):
+            assert MetricsClient("http://127.0.0.1:2112").get_metrics() == {}
+
+
+class TestRemoteWriteClient:
+    def test_encode_write_request(self) -> None:
+        actual = encode_write_request([({"__name__": "a"}, 1.0)], timestamp_ms=1)
+
+        # WriteRequest{timeseries: [{labels: [{name: "__name__", value: "a"}],
+        #                            samples: [{value: 1.0, timestamp: 1}]}]}
+        assert actual.hex() == "0a1c0a0d0a085f5f6e616d655f5f120161120b09000000000000f03f1001"
+
+    def test_encode_write_request_sorts_labels(self) -> None:
+        unsorted = encode_write_request([({"b": "2", "__name__": "a", "a": "1"}, 1.0)], 1)
+        ordered = encode_write_request([({"__name__": "a", "a": "1", "b": "2"}, 1.0)], 1)
+
+        assert unsorted == ordered
+
+    @pytest.mark.parametrize(
+        "data, expected",
+        [
+            (b"abc", "03f40200616263"),
+            (b"", "00"),
+        ],
+    )
+    def test_snappy_block(self, data: bytes, expected: str) -> None:
+        assert snappy_block(data).hex() == expected
+
+    def test_snappy_block_with_large_payload(self) -> None:
+        data = bytes(range(256)) * 512
+
+        block = snappy_block(data)
+
+        # The uncompressed length, then two literals of 64KiB with a 3 byte tag each
+        assert block[:3] == bytes([0x80, 0x80, 0x08])
+        assert len(block) == 3 + 2 * (3 + (1 << 16))
+
+    def test_round_trip(self) -> None:
+        samples = [
+            ({"__name__": "a_total", "juju_unit": "openfga-k8s/0"}, 3.0),
+            ({"__name__": "b_bucket", "le": "+Inf", "hook": "update-status"}, 0.25),
+        ]
+        # Large enough to span several snappy literals
+        samples += [({"__name__": "c", "index": str(i) * 50}, float(i)) for i in range(2000)]
+
+        block = snappy_block(encode_write_request(samples, timestamp_ms=1700000000000))
+        request = write_request_class().FromString(bytes(cramjam.snappy.decompress_raw(block)))
+
+        assert len(request.timeseries) == len(samples)
+        for series, (labels, value) in zip(request.timeseries, samples, strict=True):
+            assert [(label.name, label.value) for label in series.labels] == sorted(labels.items())
+            assert [(s.value, s.timestamp) for s in series.samples] == [(value, 1700000000000)]
+
+    def test_push(self) -> None:
+        with patch("clients.requests.post") as mocked_post:
+            pushed = RemoteWriteClient("http://prometheus/api/v1/write").push([
+                ({"__name__": "a"}, 1.0)
+            ])
+
+        assert pushed is True
+        assert mocked_post.call_args.kwargs["headers"]["Content-Encoding"] == "snappy"
+
+    def test_push_with_error(self) -> None:
+        with patch("clients.requests.post", side_effect=requests.exceptions.ConnectionError):
+            assert RemoteWriteClient("http://prometheus/api/v1/write").push([]) is False
+
+
+class TestHTTPClient:
+    @pytest.mark.parametrize(
+        "statuses, expected", [(["NOT_SERVING", "SERVING"], True), (["NOT_SERVING"] * 3, False)]
+    )
+    def test_wait_until_healthy(self, statuses: list[str], expected: bool) -> None:
+        client = HTTPClient("http://127.0.0.1:8080", "token")
+
+        with patch.object(client._session, "get") as mocked_get:
+            mocked_get.return_value.json.side_effect = [{"status": status} for status in statuses]
+            assert client.wait_until_healthy(timeout=0.05, interval=0.02) is expected
+
+        assert 0 < mocked_get.call_args.kwargs["timeout"] <= 0.1
+
+    def test_wait_until_healthy_with_unresponsive_server(self) -> None:
+        client = HTTPClient("http://127.0.0.1:8080", "token")
+
+        with patch.object(client._session, "get", side_effect=requests.exceptions.ReadTimeout):
+            assert client.wait_until_healthy(timeout=0.05, interval=0.02) is False
+
+    @pytest.mark.parametrize(
+        "method, args",
+        [
+            ("read_tuples", ("store",)),
+            ("read_changes", ("store",)),
+            ("write_tuples", ("store", [{"user": "user:anne"}])),
+            ("check", ("store", {"user": "user:anne"})),
+            ("batch_check", ("store", [{"user": "user:anne"}])),
+            ("list_objects", ("store", "user:anne", "viewer", "document")),
+        ],
+    )
+    def test_requests_bounded_by_timeout(self, method: str, args: tuple) -> None:
+        client = HTTPClient("http://127.0.0.1:8080", "token", timeout=3.0)
+
+        with (
+            patch.object(client._session, "get") as mocked_get,
+            patch.object(client._session, "post") as mocked_post,
+        ):
+            getattr(client, method)(*args)
+
+        (mocked_call,) = [mocked for mocked in (mocked_get, mocked_post) if mocked.called]
+        assert mocked_call.call_args.kwargs["timeout"] == 3.0
@@ -3,15 +3,274 @@
 
 from unittest.mock import MagicMock, patch
 
-from configs import CharmConfig
+import pytest
+
+from authorization_models import ModelThresholds
+from configs import (
+    ChangelogRetentionConfig,
+    CharmConfig,
+    DatastoreConnectionConfig,
+    HealthCheckConfig,
+    MetricsConfig,
+    ReplicaLagConfig,
+    RestartConfig,
+    SLOConfig,
+    StoreStatsConfig,
+    TraceSamplingConfig,
+)
 
 
 class TestCharmConfig:
     @patch("ops.model.ConfigData", autospec=True)
     def test_to_env_vars(self, mocked_class: MagicMock) -> None:
         mocked_config = mocked_class.return_value
-        mocked_config.__getitem__.side_effect = lambda key: {"log-level": "debug"}[key]
+        mocked_config.__getitem__.side_effect = lambda key: {
+            "log-level": "debug",
+            "check-query-cache-enabled": True,
+            "metrics-rpc-histograms": False,
+            "metrics-datastore-query-count-buckets": "50,200",
+            "metrics-dispatch-count-buckets": "10,50,200",
+        }[key]
         charm_config = CharmConfig(mocked_config)
 
         result = charm_config.to_env_vars()
-        assert result == {"OPENFGA_LOG_LEVEL": "debug"}
+        assert result == {
+            "OPENFGA_LOG_LEVEL": "debug",
+            "OPENFGA_CHECK_QUERY_CACHE_ENABLED": "true",
+            "OPENFGA_METRICS_ENABLE_RPC_HISTOGRAMS": "false",
+            "OPENFGA_REQUEST_DURATION_DATASTORE_QUERY_COUNT_BUCKETS": "50,200",
+            "OPENFGA_REQUEST_DURATION_DISPATCH_COUNT_BUCKETS": "10,50,200",
+        }
+
+    @patch("ops.model.ConfigData", autospec=True)
+    def test_model_thresholds(self, mocked_class: MagicMock) -> None:
+        mocked_config = mocked_class.return_value
+        mocked_config.__getitem__.side_effect = lambda key: {
+            "model-max-depth": 25,
+            "model-max-fanout": 10,
+            "model-max-conditions": 20,
+            "model-allow-cycles": False,
+        }[key]
+        charm_config = CharmConfig(mocked_config)
+
+        assert charm_config.model_thresholds == ModelThresholds(
+            max_depth=25, max_fanout=10, max_conditions=20, allow_cycles=False
+        )
+
+    @patch("ops.model.ConfigData", autospec=True)
+    def test_health_checks(self, mocked_class: MagicMock) -> None:
+        mocked_config = mocked_class.return_value
+        mocked_config.__getitem__.side_effect = lambda key: {
+            "health-check-period": 10,
+            "health-check-timeout": 2,
+            "health-check-threshold": 3,
+            "startup-timeout": 120,
+            "grpc-health-check": "exec",
+        }[key]
+        charm_config = CharmConfig(mocked_config)
+
+        assert charm_config.health_checks == HealthCheckConfig(
+            period=10, timeout=2, threshold=3, startup_timeout=120, grpc_mode="exec"
+        )
+
+    @patch("ops.model.ConfigData", autospec=True)
+    def test_trace_sampling(self, mocked_class: MagicMock) -> None:
+        mocked_config = mocked_class.return_value
+        mocked_config.__getitem__.side_effect = lambda key: {
+            "tracing-sampler": "tail",
+            "tracing-sample-ratio": 0.05,
+            "tracing-slow-request-threshold": 500,
+        }[key]
+        charm_config = CharmConfig(mocked_config)
+
+        assert charm_config.trace_sampling == TraceSamplingConfig(
+            policy="tail", ratio=0.05, slow_request_threshold=500
+        )
+
+    @patch("ops.model.ConfigData", autospec=True)
+    def test_slo(self, mocked_class: MagicMock) -> None:
+        mocked_config = mocked_class.return_value
+        mocked_config.__getitem__.side_effect = lambda key: {
+            "slo-latency-objective": 0.999,
+            "slo-check-latency": 100,
+            "slo-batch-check-latency": 500,
+            "slo-list-objects-latency": 2500,
+            "slo-write-latency": 250,
+            "slo-datastore-query-latency": 50,
+            "slo-check-cache-hit-ratio": 0.7,
+        }[key]
+        charm_config = CharmConfig(mocked_config)
+
+        assert charm_config.slo == SLOConfig(
+            objective=0.999,
+            check_latency=100,
+            batch_check_latency=500,
+            list_objects_latency=2500,
+            write_latency=250,
+            datastore_query_latency=50,
+            check_cache_hit_ratio=0.7,
+        )
+        assert charm_config.slo.error_budget == pytest.approx(0.001)
+
+    @patch("ops.model.ConfigData", autospec=True)
+    def test_restart(self, mocked_class: MagicMock) -> None:
+        mocked_config = mocked_class.return_value
+        mocked_config.__getitem__.side_effect = lambda key: {
+            "max-concurrent-restarts": 2,
+            "drain-grace-period": 30,
+            "warmup-sample-path": "/var/lib/openfga/warmup.jsonl",
+            "warmup-timeout": 120,
+        }[key]
+        charm_config = CharmConfig(mocked_config)
+
+        assert charm_config.restart == RestartConfig(
+            max_concurrent=2,
+            drain_grace_period=30,
+            warmup_sample_path="/var/lib/openfga/warmup.jsonl",
+            warmup_timeout=120,
+        )
+
+
+class TestChangelogRetentionConfig:
+    @pytest.mark.parametrize("days, expected", [(0, False), (-1, False), (30, True)])
+    def test_enabled(self, days: int, expected: bool) -> None:
+        assert ChangelogRetentionConfig(days=days).enabled is expected
+
+    @pytest.mark.parametrize("batch_size, expected", [(500, 500), (0, 1), (10**7, 100000)])
+    def test_batch_limit(self, batch_size: int, expected: int) -> None:
+        assert ChangelogRetentionConfig(batch_size=batch_size).batch_limit == expected
+
+
+class TestDatastoreConnectionConfig:
+    def test_query_params(self) -> None:
+        config = DatastoreConnectionConfig(
+            statement_timeout=5000, connect_timeout=10, sslmode="require", keepalives_idle=60
+        )
+
+        assert config.query_params("openfga-k8s/0") == {
+            "application_name": "openfga-k8s-0",
+            "sslmode": "require",
+            "connect_timeout": "10",
+            "statement_timeout": "5000",
+            "tcp_keepalives_idle": "60",
+        }
+
+    def test_query_params_with_defaults(self) -> None:
+        config = DatastoreConnectionConfig(connect_timeout=0, sslmode="bogus")
+
+        assert config.query_params("openfga-k8s/1") == {
+            "application_name": "openfga-k8s-1",
+            "sslmode": "prefer",
+        }
+
+    def test_query_params_when_pooled(self) -> None:
+        config = DatastoreConnectionConfig(statement_timeout=5000, keepalives_idle=60, pooled=True)
+
+        assert config.query_params("openfga-k8s/0") == {
+            "application_name": "openfga-k8s-0",
+            "sslmode": "prefer",
+            "default_query_exec_mode": "exec",
+            "connect_timeout": "10",
+        }
+
+    @pytest.mark.parametrize(
+        "max_open_conns, max_idle_conns, pooled, expected",
+        [
+            (30, 10, False, ("30", "10")),
+            (5, 10, False, ("5", "5")),
+            (0, -1, False, ("1", "0")),
+            (30, 10, True, ("30", "30")),
+        ],
+    )
+    def test_to_env_vars(
+        self, max_open_conns: int, max_idle_conns: int, pooled: bool, expected: tuple[str, str]
+    ) -> None:
+        config = DatastoreConnectionConfig(
+            max_open_conns=max_open_conns, max_idle_conns=max_idle_conns, pooled=pooled
+        )
+
+        assert config.to_env_vars() == {
+            "OPENFGA_DATASTORE_MAX_OPEN_CONNS": expected[0],
+            "OPENFGA_DATASTORE_MAX_IDLE_CONNS": expected[1],
+        }
+
+
+class TestReplicaLagConfig:
+    @pytest.mark.parametrize(
+        "lag, in_use, expected",
+        [
+            (5.0, True, True),
+            (20.0, True, True),
+            (31.0, True, False),
+            (None, True, False),
+            (20.0, False, False),
+            (10.0, False, True),
+            (None, False, False),
+        ],
+    )
+    def test_secondary_in_use(self, lag: float, in_use: bool, expected: bool) -> None:
+        config = ReplicaLagConfig(max_lag=30.0, restore_lag=10.0)
+
+        assert config.secondary_in_use(lag, in_use) is expected
+
+    def test_secondary_in_use_when_disabled(self) -> None:
+        assert ReplicaLagConfig(max_lag=0).secondary_in_use(None, in_use=False)
+
+    def test_restore_lag_above_max_lag(self) -> None:
+        config = ReplicaLagConfig(max_lag=10.0, restore_lag=60.0)
+
+        assert not config.secondary_in_use(20.0, in_use=False)
+        assert config.secondary_in_use(10.0, in_use=False)
+
+
+class TestStoreStatsConfig:
+    def test_due(self) -> None:
+        config = StoreStatsConfig(interval=60)
+
+        assert config.enabled
+        assert not config.due(collected_at=1000.0, now=1000.0 + 59 * 60)
+        assert config.due(collected_at=1000.0, now=1000.0 + 60 * 60)
+        assert not StoreStatsConfig(interval=0).enabled
+
+
+class TestMetricsConfig:
+    @pytest.mark.parametrize(
+        "buckets, expected",
+        [("50,200", "50,200"), ("200, 50,50", "50,200"), ("0,x,-1", "50,200"), ("", "50,200")],
+    )
+    def test_buckets(self, buckets: str, expected: str) -> None:
+        env_vars = MetricsConfig(dispatch_count_buckets=buckets).to_env_vars()
+
+        assert env_vars["OPENFGA_REQUEST_DURATION_DISPATCH_COUNT_BUCKETS"] == expected
+
+
+class TestHealthCheckConfig:
+    @pytest.mark.parametrize(
+        "period, timeout, expected", [(5, 3, "3s"), (5, 5, "4.5s"), (1, 3, "0.9s"), (0, 0, "0.9s")]
+    )
+    def test_pebble_timeout(self, period: int, timeout: int, expected: str) -> None:
+        assert HealthCheckConfig(period=period, timeout=timeout).pebble_timeout == expected
+
+    def test_alive_threshold(self) -> None:
+        assert HealthCheckConfig(period=5, threshold=3, startup_timeout=60).alive_threshold == 12
+        assert HealthCheckConfig(period=5, threshold=3, startup_timeout=5).alive_threshold == 3
+
+
+class TestTraceSamplingConfig:
+    @pytest.mark.parametrize(
+        "sampling, expected",
+        [
+            (TraceSamplingConfig(), {"OPENFGA_TRACE_SAMPLE_RATIO": "0.3"}),
+            (TraceSamplingConfig(ratio=1.5), {"OPENFGA_TRACE_SAMPLE_RATIO": "1"}),
+            (
+                TraceSamplingConfig(policy="tail", ratio=0.05, slow_request_threshold=500),
+                {
+                    "OPENFGA_TRACE_SAMPLE_RATIO": "1",
+                    "OPENFGA_TRACE_RESOURCE_ATTRIBUTES": "sampling.policy=tail,"
+                    "sampling.ratio=0.05,sampling.latency_threshold_ms=500",
+                },
+            ),
+        ],
+    )
+    def test_to_env_vars(self, sampling: TraceSamplingConfig, expected: dict) -> None:
+        assert sampling.to_env_vars() == expected
@@ -0,0 +1,48 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+from pathlib import Path
+
+from configs import MetricsConfig
+from dashboards import DASHBOARDS_DIR, render_dashboards
+
+DASHBOARD = "openfga.json.tmpl"
+
+
+def panels(directory: Path) -> dict[str, dict]:
+    dashboard = json.loads((directory / DASHBOARD).read_text())
+    return {panel["title"]: panel for panel in dashboard["panels"]}
+
+
+class TestRenderDashboards:
+    def test_with_rpc_histograms(self, tmp_path: Path) -> None:
+        render_dashboards(tmp_path, MetricsConfig(rpc_histograms=True))
+
+        assert (tmp_path / DASHBOARD).read_text() == (DASHBOARDS_DIR / DASHBOARD).read_text()
+
+    def test_without_rpc_histograms(self, tmp_path: Path) -> None:
+        render_dashboards(tmp_path, MetricsConfig(rpc_histograms=False))
+
+        rendered = panels(tmp_path)
+        assert "Error Response Latency (P95)" not in rendered
+        latency = rendered["Response Latency (P95)"]
+        assert latency["fieldConfig"]["defaults"]["unit"] == "ms"
+        assert latency["targets"][0]["expr"].startswith(
+            "histogram_quantile(0.95, sum by(le, grpc_service, grpc_method) "
+            "(rate(openfga_request_duration_ms_bucket{"
+        )
+        assert "Total QPS" in rendered
+        assert not any(
+            "grpc_server_handling_seconds" in target["expr"]
+            for panel in rendered.values()
+            for target in panel.get("targets", [])
+        )
+
+    def test_unchanged_dashboards_not_rewritten(self, tmp_path: Path) -> None:
+        render_dashboards(tmp_path, MetricsConfig())
+        mtime = (tmp_path / DASHBOARD).stat().st_mtime_ns
+
+        render_dashboards(tmp_path, MetricsConfig())
+
+        assert (tmp_path / DASHBOARD).stat().st_mtime_ns == mtime
@@ -1,18 +1,23 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import dataclasses
+import json
+from typing import Optional
 from unittest.mock import MagicMock, create_autospec
 
 import pytest
 from charms.data_platform_libs.v0.data_interfaces import DatabaseRequires
 from charms.tempo_coordinator_k8s.v0.tracing import TracingEndpointRequirer
 
+from configs import TraceSamplingConfig
 from constants import OPENFGA_SERVER_GRPC_PORT, OPENFGA_SERVER_HTTP_PORT, POSTGRESQL_DSN_TEMPLATE
 from integrations import (
     DatabaseConfig,
     GRPCIngressIntegration,
     HttpIngressIntegration,
     PeerData,
+    RestartLock,
     TracingData,
 )
 
@@ -103,6 +108,77 @@ class TestPeerData:
         assert not peer_data.keys()
 
 
+class TestRestartLock:
+    @pytest.fixture
+    def units(self) -> list[MagicMock]:
+        units = [MagicMock() for _ in range(3)]
+        for i, unit in enumerate(units):
+            unit.name = f"openfga-k8s/{i}"
+        return units
+
+    @pytest.fixture
+    def mocked_model(self, units: list[MagicMock]) -> MagicMock:
+        model = MagicMock()
+        model.unit = units[0]
+        model.unit.is_leader.return_value = True
+        peers = MagicMock()
+        peers.units = set(units[1:])
+        peers.data = {model.app: {}, **{unit: {} for unit in units}}
+        model.get_relation.return_value = peers
+        return model
+
+    @pytest.fixture
+    def peers_data(self, mocked_model: MagicMock) -> dict:
+        return mocked_model.get_relation.return_value.data
+
+    def test_request_and_release(self, mocked_model: MagicMock, peers_data: dict) -> None:
+        lock = RestartLock(mocked_model, PeerData(mocked_model))
+
+        lock.request()
+        requested_at = peers_data[mocked_model.unit][RestartLock.REQUEST_KEY]
+        lock.request()
+
+        assert lock.is_requested
+        assert peers_data[mocked_model.unit][RestartLock.REQUEST_KEY] == requested_at
+
+        lock.release()
+        assert not lock.is_requested
+
+    def test_grant(
+        self, mocked_model: MagicMock, peers_data: dict, units: list[MagicMock]
+    ) -> None:
+        peers_data[units[2]][RestartLock.REQUEST_KEY] = "1.0"
+        peers_data[units[1]][RestartLock.REQUEST_KEY] = "2.0"
+        peers_data[units[0]][RestartLock.REQUEST_KEY] = "3.0"
+        lock = RestartLock(mocked_model, PeerData(mocked_model), max_concurrent=2)
+
+        lock.grant()
+
+        assert json.loads(peers_data[mocked_model.app][RestartLock.GRANTS_KEY]) == [
+            "openfga-k8s/2",
+            "openfga-k8s/1",
+        ]
+        assert not lock.is_granted
+
+        peers_data[units[2]].pop(RestartLock.REQUEST_KEY)
+        lock.grant()
+
+        assert json.loads(peers_data[mocked_model.app][RestartLock.GRANTS_KEY]) == [
+            "openfga-k8s/1",
+            "openfga-k8s/0",
+        ]
+        assert lock.is_granted
+
+    def test_grant_when_not_leader(self, mocked_model: MagicMock, peers_data: dict) -> None:
+        mocked_model.unit.is_leader.return_value = False
+        lock = RestartLock(mocked_model, PeerData(mocked_model))
+
+        lock.request()
+        lock.grant()
+
+        assert RestartLock.GRANTS_KEY not in peers_data[mocked_model.app]
+
+
 class TestDatabaseConfig:
     @pytest.fixture
     def database_config(self) -> DatabaseConfig:
@@ -129,10 +205,36 @@ class TestDatabaseConfig:
         actual = database_config.dsn
         assert actual == expected
 
+    def test_dsn_with_params(self, database_config: DatabaseConfig) -> None:
+        database_config = dataclasses.replace(
+            database_config,
+            read_only_endpoint="replica",
+            params={"application_name": "openfga-k8s-0", "statement_timeout": "5000"},
+        )
+
+        assert database_config.dsn.endswith(
+            "@endpoint/database?application_name=openfga-k8s-0&statement_timeout=5000"
+        )
+        assert database_config.read_only_dsn.endswith(
+            "@replica/database?application_name=openfga-k8s-0&statement_timeout=5000"
+        )
+        assert database_config.migration_dsn.endswith(
+            "@endpoint/database?application_name=openfga-k8s-0"
+        )
+
     def test_to_service_configs(self, database_config: DatabaseConfig) -> None:
         env_vars = database_config.to_env_vars()
         assert env_vars["OPENFGA_DATASTORE_URI"] == database_config.dsn
 
+    def test_to_env_vars_with_read_only_endpoint(self, database_config: DatabaseConfig) -> None:
+        database_config = dataclasses.replace(database_config, read_only_endpoint="replica")
+
+        env_vars = database_config.to_env_vars()
+        assert env_vars["OPENFGA_DATASTORE_SECONDARY_URI"] == database_config.read_only_dsn
+
+        env_vars = dataclasses.replace(database_config, secondary_in_use=False).to_env_vars()
+        assert "OPENFGA_DATASTORE_SECONDARY_URI" not in env_vars
+
     def test_load_with_integration(self, mocked_requirer: MagicMock) -> None:
         integration_id = 1
         mocked_requirer.relations = [MagicMock(id=integration_id)]
@@ -179,6 +281,20 @@ class TestTracingData:
                     "OPENFGA_TRACE_SAMPLE_RATIO": "0.3",
                 },
             ),
+            (
+                TracingData(
+                    is_ready=True,
+                    grpc_endpoint="grpc_endpoint",
+                    sampling=TraceSamplingConfig(policy="tail"),
+                ),
+                {
+                    "OPENFGA_TRACE_ENABLED": True,
+                    "OPENFGA_TRACE_OTLP_ENDPOINT": "grpc_endpoint",
+                    "OPENFGA_TRACE_SAMPLE_RATIO": "1",
+                    "OPENFGA_TRACE_RESOURCE_ATTRIBUTES": "sampling.policy=tail,"
+                    "sampling.ratio=0.3,sampling.latency_threshold_ms=1000",
+                },
+            ),
         ],
     )
     def test_to_env_vars(self, data: TracingData, expected: dict) -> None:
@@ -187,10 +303,19 @@ class TestTracingData:
 
     def test_load_with_integration_ready(self, mocked_requirer: MagicMock) -> None:
         mocked_requirer.is_ready.return_value = True
-        mocked_requirer.get_endpoint.return_value = "http://grpc_endpoint"
-
-        actual = TracingData.load(mocked_requirer)
-        assert actual == TracingData(is_ready=True, grpc_endpoint="grpc_endpoint")
+        mocked_requirer.get_endpoint.side_effect = {
+            "otlp_grpc": "http://grpc_endpoint",
+            "otlp_http": "http://http_endpoint:4318",
+        }.get
+
+        sampling = TraceSamplingConfig(ratio=0.05)
+        actual = TracingData.load(mocked_requirer, sampling)
+        assert actual == TracingData(
+            is_ready=True,
+            grpc_endpoint="grpc_endpoint",
+            http_endpoint="http://http_endpoint:4318",
+            sampling=sampling,
+        )
 
     def test_load_without_integration_ready(self, mocked_requirer: MagicMock) -> None:
         mocked_requirer.is_ready.return_value = False
@@ -198,6 +323,18 @@ class TestTracingData:
         actual = TracingData.load(mocked_requirer)
         assert actual == TracingData()
 
+    @pytest.mark.parametrize(
+        "http_endpoint, expected",
+        [
+            ("", None),
+            ("http://http_endpoint:4318", "http://http_endpoint:4318/v1/traces"),
+            ("http://http_endpoint:4318/", "http://http_endpoint:4318/v1/traces"),
+        ],
+    )
+    def test_charm_traces_url(self, http_endpoint: str, expected: Optional[str]) -> None:
+        data = TracingData(is_ready=True, http_endpoint=http_endpoint)
+        assert data.charm_traces_url == expected
+
 
 class TestHttpIngressIntegration:
     @pytest.fixture
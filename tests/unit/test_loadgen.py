@@ -0,0 +1,119 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from clients import HTTPClient
+from exceptions import LoadTestError
+from loadgen import LatencyHistogram, LoadGenerator, parse_mix
+
+RESPONSES = {
+    "/stores/store/check": {"allowed": True},
+    "/stores/store/batch-check": {"result": {"0": {"allowed": True}}},
+    "/stores/store/list-objects": {"objects": ["document:1"]},
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path not in RESPONSES or self.headers["Authorization"] != "Bearer token":
+            self.send_error(404)
+            return
+
+        body = json.dumps(RESPONSES[self.path]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture
+def stand_in_server() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_mix() -> None:
+    assert parse_mix("check=80, batch-check=20") == {"check": 80, "batch-check": 20}
+
+
+@pytest.mark.parametrize("mix", ["", "read=1", "check=x", "check=0", "check=-1,list-objects=2"])
+def test_parse_invalid_mix(mix: str) -> None:
+    with pytest.raises(LoadTestError):
+        parse_mix(mix)
+
+
+def test_latency_histogram() -> None:
+    histogram = LatencyHistogram()
+    for i in range(1, 101):
+        histogram.observe(i / 1000)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.05)
+    assert histogram.percentile(99) == pytest.approx(0.099, rel=0.05)
+    assert histogram.percentile(100) == 0.100
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_latency_histogram_bounds() -> None:
+    histogram = LatencyHistogram()
+    histogram.observe(0.0)
+    histogram.observe(3600.0)
+
+    assert histogram.counts[0] == histogram.counts[-1] == 1
+    assert histogram.percentile(50) == LatencyHistogram.MIN_LATENCY
+
+
+def test_latency_histogram_merge() -> None:
+    histogram, other = LatencyHistogram(), LatencyHistogram()
+    histogram.observe(0.001)
+    other.observe(0.002)
+
+    histogram.merge(other)
+
+    assert histogram.count == 2
+    assert histogram.max == 0.002
+
+
+def test_load_generator(stand_in_server: str) -> None:
+    tuple_keys = [{"user": "user:1", "relation": "viewer", "object": "document:1"}]
+
+    with HTTPClient(stand_in_server, "token", pool_size=4) as client:
+        generator = LoadGenerator(
+            client,
+            "store",
+            tuple_keys,
+            {"check": 2, "batch-check": 1, "list-objects": 1},
+            concurrency=4,
+        )
+        result = generator.run(duration=0.5)
+
+    report = result.to_report()
+    assert report["requests"] > 0
+    assert report["errors"] == 0
+    assert set(result.operations) == {"check", "batch-check", "list-objects"}
+    assert all(stats.requests for stats in result.operations.values())
+
+
+def test_load_generator_counts_errors(stand_in_server: str) -> None:
+    tuple_keys = [{"user": "user:1", "relation": "viewer", "object": "document:1"}]
+
+    with HTTPClient(stand_in_server, "token") as client:
+        generator = LoadGenerator(client, "missing", tuple_keys, {"check": 1}, concurrency=2)
+        result = generator.run(duration=0.2)
+
+    assert result.total.errors == result.total.requests > 0
@@ -0,0 +1,112 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from typing import Any
+
+from ops import CharmBase, testing
+
+from metrics import HOOK_DURATION_METRIC, CharmMetrics
+
+
+class MetricsCharm(CharmBase):
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.metrics = CharmMetrics(self)
+        self.framework.observe(self.on.update_status, self._on_update_status)
+
+    def _on_update_status(self, _: Any) -> None:
+        self.metrics.inc("drains_total")
+        self.metrics.observe("drain_seconds", 1.5, buckets=(1.0, 2.0))
+        self.metrics.observe("hook_seconds", 0.5, buckets=(1.0,), labels={"hook": "update-status"})
+
+
+class TestCharmMetrics:
+    def test_metrics_persisted_across_hooks(self) -> None:
+        ctx = testing.Context(MetricsCharm, meta={"name": "test"})
+
+        state_out = ctx.run(ctx.on.update_status(), testing.State())
+        with ctx(ctx.on.update_status(), state_out) as manager:
+            manager.run()
+            samples = manager.charm.metrics.samples({"juju_unit": "test/0"})
+
+        unit = {"juju_unit": "test/0"}
+        assert ({**unit, "__name__": "drains_total"}, 2.0) in samples
+        assert ({**unit, "__name__": "drain_seconds_bucket", "le": "1.0"}, 0) in samples
+        assert ({**unit, "__name__": "drain_seconds_bucket", "le": "2.0"}, 2) in samples
+        assert ({**unit, "__name__": "drain_seconds_bucket", "le": "+Inf"}, 2) in samples
+        assert ({**unit, "__name__": "drain_seconds_sum"}, 3.0) in samples
+
+    def test_without_metrics(self) -> None:
+        ctx = testing.Context(MetricsCharm, meta={"name": "test"})
+
+        with ctx(ctx.on.start(), testing.State()) as manager:
+            assert manager.charm.metrics.samples({}) == []
+
+    def test_labelled_series(self) -> None:
+        ctx = testing.Context(MetricsCharm, meta={"name": "test"})
+
+        state_out = ctx.run(ctx.on.update_status(), testing.State())
+        with ctx(ctx.on.start(), state_out) as manager:
+            manager.charm.metrics.inc("deferrals_total", labels={"event": "start"})
+            samples = manager.charm.metrics.samples({"juju_unit": "test/0"})
+
+        assert (
+            {"__name__": "deferrals_total", "event": "start", "juju_unit": "test/0"},
+            1.0,
+        ) in samples
+        assert (
+            {
+                "__name__": "hook_seconds_bucket",
+                "hook": "update-status",
+                "juju_unit": "test/0",
+                "le": "+Inf",
+            },
+            1,
+        ) in samples
+
+    def test_several_histograms_persisted(self) -> None:
+        ctx = testing.Context(MetricsCharm, meta={"name": "test"})
+
+        state_out = ctx.run(ctx.on.update_status(), testing.State())
+        with ctx(ctx.on.start(), state_out) as manager:
+            manager.charm.metrics.observe("restart_seconds", 0.5, buckets=(1.0,))
+            state_out = manager.run()
+        with ctx(ctx.on.update_status(), state_out) as manager:
+            manager.run()
+            samples = manager.charm.metrics.samples({})
+
+        assert ({"__name__": "restart_seconds_count"}, 1) in samples
+        assert ({"__name__": "drain_seconds_count"}, 2) in samples
+
+    def test_gauges(self) -> None:
+        ctx = testing.Context(MetricsCharm, meta={"name": "test"})
+
+        state_out = ctx.run(ctx.on.start(), testing.State())
+        with ctx(ctx.on.start(), state_out) as manager:
+            metrics = manager.charm.metrics
+            metrics.set_gauges("tuples", [({"store": "a"}, 3.0), ({"store": "b"}, 5.0)])
+            metrics.set_gauges("models", [({"store": "a"}, 1.0)])
+            metrics.set_gauges("tuples", [({"store": "b"}, 8.0)])
+            samples = metrics.samples({})
+
+        assert sorted(samples, key=lambda sample: sorted(sample[0].items())) == [
+            ({"__name__": "models", "store": "a"}, 1.0),
+            ({"__name__": "tuples", "store": "b"}, 8.0),
+        ]
+
+    def test_push_due(self) -> None:
+        ctx = testing.Context(MetricsCharm, meta={"name": "test"})
+
+        with ctx(ctx.on.start(), testing.State()) as manager:
+            metrics = manager.charm.metrics
+            assert metrics.push_due()
+
+            metrics.mark_pushed()
+            assert not metrics.push_due()
+
+            metrics.observe(HOOK_DURATION_METRIC, 0.5, labels={"hook": "start"})
+            assert not metrics.push_due()
+            assert metrics.push_due(interval=0)
+
+            metrics.inc("drains_total")
+            assert metrics.push_due()
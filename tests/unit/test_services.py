@@ -1,14 +1,18 @@
 # Copyright 2025 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import time
 from typing import Optional
 from unittest.mock import MagicMock, patch
 
 import pytest
 from ops import ModelError
+from ops.pebble import CheckLevel, CheckStatus
 
+from configs import HealthCheckConfig
 from constants import (
     CA_BUNDLE_FILE,
+    OPENFGA_GRPC_SERVICE,
     OPENFGA_METRICS_HTTP_PORT,
     OPENFGA_SERVER_GRPC_PORT,
     OPENFGA_SERVER_HTTP_PORT,
@@ -79,6 +83,16 @@ class TestWorkloadService:
 
         assert is_running is False
 
+    def test_failing_checks(
+        self, mocked_container: MagicMock, workload_service: WorkloadService
+    ) -> None:
+        mocked_container.get_checks.return_value = {
+            "grpc-check": MagicMock(status=CheckStatus.UP),
+            "http-check": MagicMock(status=CheckStatus.DOWN),
+        }
+
+        assert workload_service.failing_checks == ["http-check"]
+
     def test_open_ports(self, mocked_unit: MagicMock, workload_service: WorkloadService) -> None:
         workload_service.open_ports()
 
@@ -107,6 +121,117 @@ class TestPebbleService:
         )
         mocked_container.replan.assert_called_once()
 
+    @pytest.mark.parametrize(
+        "running, plan_changed, expected",
+        [(False, False, True), (True, True, True), (True, False, False)],
+    )
+    @patch("ops.pebble.Layer")
+    def test_plan_restarted(
+        self,
+        mocked_layer: MagicMock,
+        mocked_container: MagicMock,
+        pebble_service: PebbleService,
+        running: bool,
+        plan_changed: bool,
+        expected: bool,
+    ) -> None:
+        mocked_container.get_service.return_value.is_running.return_value = running
+        services = mocked_container.get_plan.return_value.services.get.return_value
+        services.to_dict.side_effect = [
+            {"command": "a"},
+            {"command": "b" if plan_changed else "a"},
+        ]
+
+        assert pebble_service.plan(mocked_layer) is expected
+
+    @pytest.mark.parametrize(
+        "running, planned_command, expected",
+        [(False, "other", False), (True, "other", True), (True, "openfga run", False)],
+    )
+    def test_restart_required(
+        self,
+        mocked_container: MagicMock,
+        pebble_service: PebbleService,
+        running: bool,
+        planned_command: str,
+        expected: bool,
+    ) -> None:
+        layer = pebble_service.render_pebble_layer()
+        planned_service = layer.services[WORKLOAD_SERVICE].to_dict()
+        mocked_container.get_service.return_value.is_running.return_value = running
+        mocked_container.get_plan.return_value.services.get.return_value.to_dict.return_value = {
+            **planned_service,
+            "command": planned_command,
+        }
+
+        assert pebble_service.restart_required(layer) is expected
+
+    def test_drain(self, mocked_container: MagicMock, pebble_service: PebbleService) -> None:
+        mocked_container.get_checks.side_effect = [
+            {"http-check": MagicMock(status=CheckStatus.UP)},
+            {"http-check": MagicMock(status=CheckStatus.DOWN)},
+            {"http-check": MagicMock(status=CheckStatus.DOWN)},
+        ]
+        in_flight_requests = MagicMock(side_effect=[2.0, 0.0])
+
+        duration, completed = pebble_service.drain(
+            1, in_flight_requests, interval=0.01, routing_delay=0
+        )
+
+        assert completed
+        assert duration < 1
+        layer = mocked_container.add_layer.call_args.args[1]
+        assert layer.checks["http-check"].level == CheckLevel.READY
+
+    def test_drain_after_grace_period(
+        self, mocked_container: MagicMock, pebble_service: PebbleService
+    ) -> None:
+        mocked_container.get_checks.return_value = {
+            "http-check": MagicMock(status=CheckStatus.DOWN)
+        }
+
+        duration, completed = pebble_service.drain(
+            0.05, lambda: 1.0, interval=0.01, routing_delay=0
+        )
+
+        assert not completed
+
+    def test_drain_with_unknown_in_flight_requests(
+        self, mocked_container: MagicMock, pebble_service: PebbleService
+    ) -> None:
+        mocked_container.get_checks.return_value = {
+            "http-check": MagicMock(status=CheckStatus.DOWN)
+        }
+
+        duration, completed = pebble_service.drain(
+            0.05, lambda: None, interval=0.01, routing_delay=0
+        )
+
+        assert not completed
+        assert duration >= 0.04
+
+    def test_drain_while_still_routed(
+        self, mocked_container: MagicMock, pebble_service: PebbleService
+    ) -> None:
+        mocked_container.get_checks.return_value = {
+            "http-check": MagicMock(status=CheckStatus.DOWN)
+        }
+        counted_at = []
+
+        def in_flight_requests() -> float:
+            counted_at.append(time.monotonic())
+            return 0.0
+
+        start = time.monotonic()
+        duration, completed = pebble_service.drain(
+            1, in_flight_requests, interval=0.01, routing_delay=0.1
+        )
+
+        # No in-flight request while the check is down, but the unit may still be routed some
+        assert completed
+        assert duration >= 0.1
+        assert counted_at[0] - start >= 0.1
+
     @patch("ops.pebble.Layer")
     def test_plan_failure(
         self,
@@ -174,9 +299,46 @@ class TestPebbleService:
             data_source.to_env_vars.return_value = env_vars
             data_sources.append(data_source)
 
-        layer = pebble_service.render_pebble_layer(*data_sources)
+        layer = pebble_service.render_pebble_layer(
+            *data_sources, health_checks=HealthCheckConfig(grpc_mode="exec")
+        )
         layer_dict = layer.to_dict()
 
         assert layer_dict["services"][WORKLOAD_SERVICE]["environment"] == expected_env
         assert layer_dict["checks"]["http-check"]["http"]["url"] == expected_http_url
         assert layer_dict["checks"]["grpc-check"]["exec"]["command"] == expected_grpc_cmd
+
+    def test_render_pebble_layer_health_checks(self, pebble_service: PebbleService) -> None:
+        health_checks = HealthCheckConfig(period=5, timeout=3, threshold=2, startup_timeout=60)
+
+        layer = pebble_service.render_pebble_layer(health_checks=health_checks)
+        checks = layer.to_dict()["checks"]
+
+        assert checks["http-check"]["level"] == "ready"
+        assert checks["grpc-check"]["level"] == "alive"
+        assert checks["http-check"]["period"] == checks["grpc-check"]["period"] == "5s"
+        assert checks["http-check"]["timeout"] == "3s"
+        assert checks["http-check"]["threshold"] == 2
+        assert checks["grpc-check"]["threshold"] == 12
+
+    @pytest.mark.parametrize(
+        "env_vars, expected_url",
+        [
+            ({}, f"http://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}/healthz"),
+            (
+                {"OPENFGA_HTTP_TLS_ENABLED": "true", "OPENFGA_GRPC_TLS_ENABLED": "true"},
+                f"https://127.0.0.1:{OPENFGA_SERVER_HTTP_PORT}/healthz",
+            ),
+        ],
+    )
+    def test_render_pebble_layer_grpc_http_check(
+        self, pebble_service: PebbleService, env_vars: dict[str, str], expected_url: str
+    ) -> None:
+        data_source = MagicMock(spec=EnvVarConvertible)
+        data_source.to_env_vars.return_value = env_vars
+
+        layer = pebble_service.render_pebble_layer(data_source)
+        grpc_check = layer.to_dict()["checks"]["grpc-check"]
+
+        assert "exec" not in grpc_check
+        assert grpc_check["http"]["url"] == f"{expected_url}?service={OPENFGA_GRPC_SERVICE}"
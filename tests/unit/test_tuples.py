@@ -0,0 +1,259 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import gzip
+import io
+import json
+import threading
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from ops.pebble import PathError
+
+from exceptions import TupleExportError, TupleFormatError
+from tuples import (
+    GzipNDJSONStream,
+    ImportCheckpoint,
+    TupleExporter,
+    TupleImporter,
+    batched,
+    read_tuples,
+)
+
+
+def _tuple(i: int) -> dict:
+    return {"user": f"user:{i}", "relation": "viewer", "object": "document:1"}
+
+
+class TestReadTuples:
+    def test_read_ndjson(self) -> None:
+        stream = io.StringIO(
+            json.dumps(_tuple(1))
+            + "\n\n"
+            + json.dumps({"key": _tuple(2), "timestamp": "2025-01-01T00:00:00Z"})
+            + "\n"
+        )
+
+        assert list(read_tuples(stream)) == [_tuple(1), _tuple(2)]
+
+    def test_read_csv(self) -> None:
+        stream = io.StringIO(
+            "user,relation,object,condition_name,condition_context\n"
+            "user:1,viewer,document:1,,\n"
+            'user:2,viewer,document:1,in_range,"{""x"": 1}"\n'
+        )
+
+        assert list(read_tuples(stream, "csv")) == [
+            _tuple(1),
+            {**_tuple(2), "condition": {"name": "in_range", "context": {"x": 1}}},
+        ]
+
+    @pytest.mark.parametrize(
+        "content, fmt",
+        [
+            ("not-json\n", "ndjson"),
+            ('{"user": "user:1", "relation": "viewer"}\n', "ndjson"),
+            ("user,relation\nuser:1,viewer\n", "csv"),
+        ],
+    )
+    def test_read_malformed_tuples(self, content: str, fmt: str) -> None:
+        with pytest.raises(TupleFormatError):
+            list(read_tuples(io.StringIO(content), fmt))
+
+
+def test_batched() -> None:
+    batches = list(batched((_tuple(i) for i in range(5)), 2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+class TestImportCheckpoint:
+    SOURCE = "1024:2025-01-01T00:00:00+00:00"
+
+    @pytest.fixture(autouse=True)
+    def source_file(self, mocked_container: MagicMock) -> None:
+        mocked_container.list_files.return_value = [
+            MagicMock(size=1024, last_modified=datetime(2025, 1, 1, tzinfo=timezone.utc))
+        ]
+
+    def _checkpoint(self, store_id: str = "store", source: str = SOURCE) -> io.StringIO:
+        return io.StringIO(json.dumps({"store_id": store_id, "source": source, "offset": 42}))
+
+    def test_load(self, mocked_container: MagicMock) -> None:
+        mocked_container.pull.return_value = self._checkpoint()
+        checkpoint = ImportCheckpoint(mocked_container, "/tmp/tuples.ndjson")
+
+        assert checkpoint.load("store") == 42
+        mocked_container.pull.assert_called_once_with("/tmp/tuples.ndjson.checkpoint")
+
+    def test_load_for_another_store(self, mocked_container: MagicMock) -> None:
+        mocked_container.pull.return_value = self._checkpoint(store_id="other")
+        checkpoint = ImportCheckpoint(mocked_container, "/tmp/tuples.ndjson")
+
+        assert checkpoint.load("store") == 0
+
+    def test_load_for_replaced_file(self, mocked_container: MagicMock) -> None:
+        mocked_container.pull.return_value = self._checkpoint(
+            source="2048:2025-01-01T00:00:00+00:00"
+        )
+        checkpoint = ImportCheckpoint(mocked_container, "/tmp/tuples.ndjson")
+
+        assert checkpoint.load("store") == 0
+
+    def test_save(self, mocked_container: MagicMock) -> None:
+        checkpoint = ImportCheckpoint(mocked_container, "/tmp/tuples.ndjson")
+
+        checkpoint.save("store", 42)
+
+        mocked_container.push.assert_called_once_with(
+            "/tmp/tuples.ndjson.checkpoint",
+            json.dumps({"store_id": "store", "source": self.SOURCE, "offset": 42}),
+            make_dirs=True,
+        )
+
+    def test_load_with_given_version(self, mocked_container: MagicMock) -> None:
+        mocked_container.pull.return_value = self._checkpoint(source="10:1.5")
+        checkpoint = ImportCheckpoint(mocked_container, "/tmp/tuples", version="10:1.5")
+
+        assert checkpoint.load("store") == 42
+        mocked_container.list_files.assert_not_called()
+
+    def test_load_without_checkpoint(self, mocked_container: MagicMock) -> None:
+        mocked_container.pull.side_effect = PathError("not-found", "not found")
+        checkpoint = ImportCheckpoint(mocked_container, "/tmp/tuples.ndjson")
+
+        assert checkpoint.load("store") == 0
+
+
+class TestTupleImporter:
+    @pytest.fixture
+    def mocked_client(self) -> MagicMock:
+        client = MagicMock()
+        client.write_tuples.return_value = True
+        return client
+
+    def test_run(self, mocked_client: MagicMock) -> None:
+        checkpoints = []
+        importer = TupleImporter(mocked_client, "store", batch_size=10, concurrency=3)
+
+        result = importer.run((_tuple(i) for i in range(95)), checkpoint=checkpoints.append)
+
+        assert result.written == 95
+        assert result.offset == 95
+        assert not result.failed
+        assert mocked_client.write_tuples.call_count == 10
+        assert checkpoints[-1] == 95
+
+    def test_run_with_offset(self, mocked_client: MagicMock) -> None:
+        importer = TupleImporter(mocked_client, "store", batch_size=10)
+
+        result = importer.run((_tuple(i) for i in range(25)), offset=20)
+
+        assert result.written == 5
+        assert result.offset == 25
+        mocked_client.write_tuples.assert_called_once_with(
+            "store", [_tuple(i) for i in (20, 21, 22, 23, 24)]
+        )
+
+    def test_run_caps_batch_size(self, mocked_client: MagicMock) -> None:
+        importer = TupleImporter(mocked_client, "store", batch_size=1000)
+
+        importer.run(_tuple(i) for i in range(150))
+
+        assert [len(c.args[1]) for c in mocked_client.write_tuples.call_args_list] == [100, 50]
+
+    def test_run_with_failed_batch(self, mocked_client: MagicMock) -> None:
+        mocked_client.write_tuples.side_effect = lambda _, batch: batch[0] != _tuple(20)
+        importer = TupleImporter(mocked_client, "store", batch_size=10, concurrency=1)
+
+        result = importer.run(_tuple(i) for i in range(100))
+
+        assert result.failed
+        assert result.offset == 20
+        assert result.written == 20
+
+    def test_run_with_unexpected_error(self, mocked_client: MagicMock) -> None:
+        def write_tuples(_: str, batch: list[dict]) -> bool:
+            if batch[0] == _tuple(20):
+                raise ValueError("unexpected")
+            return True
+
+        checkpoints: list[int] = []
+        mocked_client.write_tuples.side_effect = write_tuples
+        importer = TupleImporter(mocked_client, "store", batch_size=10, concurrency=1)
+
+        result = importer.run((_tuple(i) for i in range(100)), checkpoint=checkpoints.append)
+
+        assert result.failed
+        assert result.offset == 20
+        assert checkpoints[-1] == 20
+
+    def test_run_bounds_in_flight_batches(self, mocked_client: MagicMock) -> None:
+        lock, in_flight, peak = threading.Lock(), [0], [0]
+
+        def write_tuples(*_: object) -> bool:
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            with lock:
+                in_flight[0] -= 1
+            return True
+
+        mocked_client.write_tuples.side_effect = write_tuples
+        importer = TupleImporter(mocked_client, "store", batch_size=10, concurrency=2)
+
+        result = importer.run(_tuple(i) for i in range(1000))
+
+        assert result.written == 1000
+        assert peak[0] <= 2
+
+
+def test_gzip_ndjson_stream() -> None:
+    records = [_tuple(i) for i in range(1000)]
+    stream = GzipNDJSONStream(iter(records))
+
+    chunks = []
+    while chunk := stream.read(512):
+        assert len(chunk) <= 512
+        chunks.append(chunk)
+
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+
+class TestTupleExporter:
+    @pytest.fixture
+    def mocked_client(self) -> MagicMock:
+        return MagicMock()
+
+    def test_tuples(self, mocked_client: MagicMock) -> None:
+        mocked_client.read_tuples.side_effect = [
+            {"tuples": [{"key": _tuple(1)}], "continuation_token": "next"},
+            {"tuples": [{"key": _tuple(2)}], "continuation_token": ""},
+        ]
+        exporter = TupleExporter(mocked_client, "store", page_size=1)
+
+        assert list(exporter.tuples()) == [{"key": _tuple(1)}, {"key": _tuple(2)}]
+        assert exporter.count == 2
+        mocked_client.read_tuples.assert_called_with("store", "next", 1)
+
+    def test_tuples_with_failed_read(self, mocked_client: MagicMock) -> None:
+        mocked_client.read_tuples.return_value = None
+        exporter = TupleExporter(mocked_client, "store")
+
+        with pytest.raises(TupleExportError):
+            list(exporter.tuples())
+
+    def test_changes(self, mocked_client: MagicMock) -> None:
+        mocked_client.read_changes.side_effect = [
+            {"changes": [{"tuple_key": _tuple(1)}], "continuation_token": "token-1"},
+            {"changes": [{"tuple_key": _tuple(2)}], "continuation_token": "token-2"},
+            {"changes": [], "continuation_token": "token-2"},
+        ]
+        exporter = TupleExporter(mocked_client, "store")
+
+        changes = list(exporter.changes("token-0"))
+
+        assert len(changes) == 2
+        assert exporter.continuation_token == "token-2"
+        mocked_client.read_changes.assert_any_call("store", "token-0", 100)
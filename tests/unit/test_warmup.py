@@ -0,0 +1,71 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import io
+from unittest.mock import MagicMock
+
+import pytest
+
+from warmup import (
+    CHECK_CACHE_HIT_METRIC,
+    CHECK_CACHE_TOTAL_METRIC,
+    CheckCacheWarmer,
+    dump_sample,
+    read_sample,
+)
+
+TUPLE_KEY = {"user": "user:1", "relation": "viewer", "object": "document:1"}
+
+
+def test_read_sample() -> None:
+    stream = io.StringIO(dump_sample([("store", TUPLE_KEY)]) + "\nnot-json\n{}\n")
+
+    assert list(read_sample(stream)) == [("store", TUPLE_KEY)]
+
+
+class TestCheckCacheWarmer:
+    @pytest.fixture
+    def mocked_client(self) -> MagicMock:
+        client = MagicMock()
+        client.is_healthy.return_value = True
+        client.check.return_value = True
+        return client
+
+    @pytest.fixture
+    def mocked_metrics_client(self) -> MagicMock:
+        client = MagicMock()
+        client.get_metrics.side_effect = [
+            {CHECK_CACHE_HIT_METRIC: 10.0, CHECK_CACHE_TOTAL_METRIC: 20.0},
+            {CHECK_CACHE_HIT_METRIC: 40.0, CHECK_CACHE_TOTAL_METRIC: 120.0},
+        ]
+        return client
+
+    def test_run(self, mocked_client: MagicMock, mocked_metrics_client: MagicMock) -> None:
+        mocked_client.check.side_effect = [True, False, None]
+        warmer = CheckCacheWarmer(mocked_client, mocked_metrics_client, concurrency=1)
+
+        result = warmer.run([("store", TUPLE_KEY)] * 3, timeout=10)
+
+        assert result.checks == 2
+        assert result.errors == 1
+        assert result.skipped == 0
+        assert result.hit_ratio == pytest.approx(0.3)
+        mocked_client.check.assert_called_with("store", TUPLE_KEY)
+
+    def test_run_after_timeout(
+        self, mocked_client: MagicMock, mocked_metrics_client: MagicMock
+    ) -> None:
+        warmer = CheckCacheWarmer(mocked_client, mocked_metrics_client)
+
+        result = warmer.run([("store", TUPLE_KEY)] * 3, timeout=0)
+
+        assert result.skipped == 3
+        mocked_client.check.assert_not_called()
+
+    def test_run_without_check_cache(self, mocked_client: MagicMock) -> None:
+        warmer = CheckCacheWarmer(mocked_client, MagicMock(**{"get_metrics.return_value": {}}))
+
+        result = warmer.run([("store", TUPLE_KEY)], timeout=10)
+
+        assert result.hit_ratio is None
+        assert "cache hit ratio n/a" in str(result)